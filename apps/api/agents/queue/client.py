@@ -1,28 +1,172 @@
-from typing import Dict, Any
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+import os
 import httpx
 from datetime import date
 
-QUEUE_AGENT_URL = "http://localhost:8000/agents/queue/intake"
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from agents.queue.schemas import QueueIntakeRequest
+from observability import span
+from services.queue_service import QueueService
 
-async def handoff_to_queue_agent(payload: Dict[str, Any]) -> Dict[str, Any]:
+# ------------------------------------------------------------------
+# Configuration
+# ------------------------------------------------------------------
+
+# "inprocess" (default): call QueueService directly on the caller's session.
+# "http": POST to a Queue Agent running in a separate deployment.
+QUEUE_HANDOFF_MODE = os.getenv("QUEUE_HANDOFF_MODE", "inprocess").lower()
+
+QUEUE_AGENT_URL = os.getenv(
+    "QUEUE_AGENT_URL",
+    "http://localhost:8000/agents/queue/intake",
+)
+QUEUE_AGENT_TIMEOUT_SECONDS = float(os.getenv("QUEUE_AGENT_TIMEOUT_SECONDS", "5.0"))
+QUEUE_AGENT_MAX_CONNECTIONS = int(os.getenv("QUEUE_AGENT_MAX_CONNECTIONS", "50"))
+
+
+def _build_intake_request(payload: Dict[str, Any]) -> QueueIntakeRequest:
+    return QueueIntakeRequest(
+        visit_id=payload["visit_id"],
+        patient_id=payload["patient_id"],
+        doctor_id=payload["doctor_id"],
+        queue_date=payload["queue_date"]
+        if isinstance(payload["queue_date"], date)
+        else date.fromisoformat(payload["queue_date"]),
+    )
+
+
+# ------------------------------------------------------------------
+# Transports
+# ------------------------------------------------------------------
+
+class QueueHandoffTransport(ABC):
     """
-    Sends visit to Queue Agent for intake.
+    Delivers a visit to the Queue Agent.
     No business logic here.
     """
 
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        response = await client.post(
-            QUEUE_AGENT_URL,
-            json={
-                "visit_id": str(payload["visit_id"]),
-                "patient_id": str(payload["patient_id"]),
-                "doctor_id": str(payload["doctor_id"]),
-                "queue_date": payload["queue_date"].isoformat()
-                if isinstance(payload["queue_date"], date)
-                else payload["queue_date"],
-            },
+    # True when the intake joins the caller's transaction
+    shares_session = False
+
+    @abstractmethod
+    async def send(
+        self,
+        db: Optional[AsyncSession],
+        request: QueueIntakeRequest,
+    ) -> Dict[str, Any]:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class InProcessQueueTransport(QueueHandoffTransport):
+    """
+    Calls QueueService.intake on the caller's session.
+    No socket, no second pooled connection, no extra request cycle.
+    """
+
+    shares_session = True
+
+    async def send(
+        self,
+        db: Optional[AsyncSession],
+        request: QueueIntakeRequest,
+    ) -> Dict[str, Any]:
+        if db is None:
+            raise ValueError("In-process queue handoff requires a DB session")
+
+        result = await QueueService.intake(db, request)
+        # Same shape the HTTP endpoint returns
+        return result.model_dump(mode="json")
+
+
+class HttpQueueTransport(QueueHandoffTransport):
+    """
+    POSTs to a remote Queue Agent (split deployments).
+    One pooled client is shared by every handoff.
+    """
+
+    def __init__(self, url: str = QUEUE_AGENT_URL):
+        self.url = url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=QUEUE_AGENT_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=QUEUE_AGENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=QUEUE_AGENT_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def send(
+        self,
+        db: Optional[AsyncSession],
+        request: QueueIntakeRequest,
+    ) -> Dict[str, Any]:
+        response = await self._get_client().post(
+            self.url,
+            json=request.model_dump(mode="json"),
         )
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_TRANSPORTS = {
+    "inprocess": InProcessQueueTransport,
+    "http": HttpQueueTransport,
+}
+
+_transport: Optional[QueueHandoffTransport] = None
+
+
+def get_queue_transport() -> QueueHandoffTransport:
+    global _transport
+
+    if _transport is None:
+        transport_cls = _TRANSPORTS.get(QUEUE_HANDOFF_MODE)
+        if transport_cls is None:
+            raise RuntimeError(
+                f"Unknown QUEUE_HANDOFF_MODE '{QUEUE_HANDOFF_MODE}'"
+            )
+        _transport = transport_cls()
+
+    return _transport
+
 
-    response.raise_for_status()
-    return response.json()
+def set_queue_transport(transport: QueueHandoffTransport) -> None:
+    """
+    Swap the active transport (benchmarks, split deployments).
+    """
+    global _transport
+    _transport = transport
+
+
+async def close_queue_transport() -> None:
+    global _transport
+
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
+
+
+async def handoff_to_queue_agent(
+    payload: Dict[str, Any],
+    db: Optional[AsyncSession] = None,
+) -> Dict[str, Any]:
+    """
+    Sends visit to Queue Agent for intake.
+    No business logic here.
+    """
+    with span("queue.handoff", "handoff", mode=QUEUE_HANDOFF_MODE):
+        return await get_queue_transport().send(db, _build_intake_request(payload))
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import csv
+import io
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from uuid import UUID
 
-from db.session import get_db_session
+from db.session import get_db_session, get_read_db_session, is_replica_session, read_session_factory
 from services.queue_service import QueueService
-from agents.queue.schemas import QueueIntakeRequest, QueueIntakeResponse,CallNextRequest,CallNextResponse,EndConsultationRequest,EndConsultationResponse, CheckInRequest,CheckInResponse,SkipRequest,SkipResponse,StartConsultationRequest,StartConsultationResponse,QueueStatusRequest
+from services.queue_events import Subscription, queue_event_broker
+from services.patient_lookup_cache import PATIENT_LOOKUP_PRELOAD, patient_lookup_cache
+from agents.queue.schemas import QueueIntakeRequest, QueueIntakeResponse,CallNextRequest,CallNextResponse,EndConsultationRequest,EndConsultationResponse, CheckInRequest,CheckInResponse,SkipRequest,SkipResponse,StartConsultationRequest,StartConsultationResponse,QueueStatusRequest,QueueBulkIntakeRequest,QueueBulkIntakeResponse
 
 router = APIRouter(prefix="/agents/queue", tags=["Queue Agent"])
 
+QUEUE_BULK_MAX_ITEMS = int(os.getenv("QUEUE_BULK_MAX_ITEMS", "5000"))
+
 
 @router.post("/intake", response_model=QueueIntakeResponse)
 async def queue_intake(
@@ -21,6 +32,47 @@ async def queue_intake(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/intake/bulk", response_model=QueueBulkIntakeResponse)
+async def queue_bulk_intake(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Batch import of pre-booked visits. Accepts JSON {"items": [...]} or
+    text/csv with a header row: visit_id,patient_id,doctor_id,queue_date
+    """
+    try:
+        body = await request.body()
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+            payload = QueueBulkIntakeRequest.model_validate({"items": rows})
+        else:
+            payload = QueueBulkIntakeRequest.model_validate_json(body)
+    except (ValueError, UnicodeDecodeError) as e:
+        # pydantic ValidationError is a ValueError
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if len(payload.items) > QUEUE_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {QUEUE_BULK_MAX_ITEMS} items per request",
+        )
+
+    try:
+        response = await QueueService.bulk_intake(db, payload.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Imported patients will call in: make their phone lookups cache hits
+    if PATIENT_LOOKUP_PRELOAD and response.accepted:
+        await patient_lookup_cache.preload(db, patient_ids=[
+            item.patient_id
+            for item, result in zip(payload.items, response.results)
+            if result.accepted
+        ])
+
+    return response
+
 @router.post("/call-next", response_model=CallNextResponse)
 async def call_next_patient(
     request: CallNextRequest,
@@ -75,9 +127,122 @@ async def start_consultation(
 @router.get("/status")
 async def queue_status(
     request: QueueStatusRequest = Depends(),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     try:
         return await QueueService.get_status(db, request)
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------------------------------------------------------
+# Push status (replaces polling GET /status)
+# ------------------------------------------------------------------
+
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+async def _initial_snapshot(request: QueueStatusRequest, subscription: Subscription) -> str:
+    """
+    Taken after subscribing, so no transition falls between the snapshot
+    and the first pushed event. Events queued before the read starts were
+    committed before it and are dropped; on a replica (which may lag)
+    they are kept, a repeated state being harmless.
+    """
+    # Short-lived session: streams must not pin a pooled connection
+    session_factory = await read_session_factory()
+    async with session_factory() as db:
+        if not is_replica_session(db):
+            queue_event_broker.discard_pending(subscription)
+        status = await QueueService.get_status(db, request)
+    return json.dumps(
+        {"event": "SNAPSHOT", "status": status.model_dump(mode="json")}
+    )
+
+
+@router.get("/stream")
+async def queue_status_stream(
+    http_request: Request,
+    request: QueueStatusRequest = Depends(),
+):
+    """
+    Server-Sent Events: one SNAPSHOT, then one message per queue transition
+    (VISIT_ADDED, CHECK_IN, CALL_NEXT, CONSULTATION_STARTED, SKIP,
+    CONSULTATION_ENDED) rendered for the caller's role.
+    """
+    subscription = queue_event_broker.subscribe(
+        request.doctor_id,
+        request.queue_date,
+        request.role,
+        request.visit_id,
+    )
+    try:
+        snapshot = await _initial_snapshot(request, subscription)
+    except ValueError as e:
+        queue_event_broker.unsubscribe(subscription)
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        queue_event_broker.unsubscribe(subscription)
+        raise
+
+    async def events():
+        try:
+            yield f"data: {snapshot}\n\n"
+            while not await http_request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.messages.get(),
+                        timeout=STREAM_HEARTBEAT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            queue_event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def queue_status_socket(
+    websocket: WebSocket,
+    request: QueueStatusRequest = Depends(),
+):
+    """
+    WebSocket variant of /stream with the same messages.
+    """
+    await websocket.accept()
+
+    subscription = queue_event_broker.subscribe(
+        request.doctor_id,
+        request.queue_date,
+        request.role,
+        request.visit_id,
+    )
+
+    try:
+        try:
+            snapshot = await _initial_snapshot(request, subscription)
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+        await websocket.send_text(snapshot)
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.messages.get(),
+                    timeout=STREAM_HEARTBEAT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                # Also surfaces dead sockets that never sent a close frame
+                message = json.dumps({"event": "HEARTBEAT"})
+            await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        queue_event_broker.unsubscribe(subscription)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import date
-from typing import Optional,List
+from typing import Dict, Optional, List
 
 
 class QueueIntakeRequest(BaseModel):
@@ -19,6 +19,35 @@ class QueueIntakeResponse(BaseModel):
     reason: str | None = None
 
 
+class QueueBulkIntakeRequest(BaseModel):
+    items: List[QueueIntakeRequest]
+
+
+class QueueBulkIntakeItemResult(BaseModel):
+    visit_id: UUID
+    doctor_id: UUID
+    queue_date: date
+    accepted: bool
+    token_number: int | None = None
+    position: int | None = None
+    estimated_wait_minutes: int | None = None
+    reason: str | None = None
+
+
+class QueueBulkIntakeResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[QueueBulkIntakeItemResult]  # same order as the request
+
+
+class QueueCounterDrift(BaseModel):
+    queue_id: UUID
+    doctor_id: UUID
+    queue_date: date
+    stored: Dict[str, int]  # counters on doctor_queues
+    actual: Dict[str, int]  # recounted from queue_entries
+
+
 class CallNextRequest(BaseModel):
     doctor_id: UUID
     queue_date: date
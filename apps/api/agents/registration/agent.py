@@ -1,7 +1,7 @@
 from typing import Any, Dict,Optional,List
 from uuid import UUID,uuid4
 from datetime import datetime
-from agents.queue.client import handoff_to_queue_agent
+from agents.queue.client import handoff_to_queue_agent, get_queue_transport
 
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,67 +13,28 @@ from agents.registration.state import (
 )
 
 import re
-from dotenv import load_dotenv
-from groq import Groq
-import os
 import random
 
-load_dotenv()
-
 from agents.doctor_assistance.agent import DoctorAssistanceAgent
 from agents.doctor_assistance.state import DoctorAssistanceState
 
 from services.patient_service import PatientService
-from services.department_service import DepartmentService
-from services.doctor_service import DoctorService
 from services.visit_service import VisitService
 
 from services.llm.symptom_summarizer import SymptomSummarizerService
-from services.llm.department_resolver import DepartmentResolverService
-
-
-CONFIDENCE_THRESHOLD = 0.75
-
-
-
-def classify_department_with_llm(symptoms: str, departments: Dict[str, str],age:int) -> Optional[str]:
-    """
-    Uses Groq LLM ONLY as a fallback classifier.
-    """
-
-
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-    department_list = ", ".join(departments.keys())
-
-    prompt = f"""
-        You are a medical department classifier based on the given symptoms of the patient.
-        IMPORTANT: If patient age below 18, suggest Pediatrics.
-        Choose ONLY ONE department from the list below.
-        Do NOT explain.
-        Do NOT add extra text.
-
-        Departments:
-        {department_list}
-
-        Symptoms:
-        {symptoms}
-
-        Patient Age: {age}
-        """
-
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "system", "content": "You classify symptoms into hospital departments."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0,
-    )
-
-    result = response.choices[0].message.content.strip()
-
-    return result if result in departments else None
+from services.llm.department_resolver import DepartmentResolverService, CONFIDENCE_THRESHOLD
+from services.llm.circuit_breaker import LLMUnavailableError
+from services.llm.triage import TriageService, TRIAGE_MODE
+from services.department_classifier import DepartmentClassifierService
+from services.reference_cache import reference_cache
+from observability import registry, span
+
+
+STEP_DURATION = registry.histogram(
+    "registration_step_duration_seconds",
+    "Registration agent step latency (includes auto-advanced steps)",
+    ("step",),
+)
 
 
 
@@ -111,9 +72,25 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
         ],
     }
 
-    def __init__(self, state: RegistrationAgentState, db: AsyncSession):
+    def __init__(
+        self,
+        state: RegistrationAgentState,
+        db: AsyncSession,
+        autocommit: bool = True,
+        read_db: Optional[AsyncSession] = None,
+    ):
+        """
+        autocommit=False: services only flush; the caller commits the whole
+        message as one unit of work.
+        read_db: session for read-only lookups (may be a replica).
+        """
         super().__init__(state)
         self.db = db
+        self.read_db = read_db or db
+        self.autocommit = autocommit
+        # Set once an LLM call fails in this message: later steps skip the
+        # LLM instead of waiting out another deadline
+        self.llm_unavailable = False
 
     # ------------------------------------------------------------------
     # Main entrypoint
@@ -125,6 +102,16 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
         """
         step = self.state.step
 
+        # Inclusive of auto-advanced steps, which nest as child spans
+        with span(
+            f"registration.{step.value}",
+            "step",
+            histogram=STEP_DURATION,
+            labels={"step": step.value},
+        ):
+            return await self._dispatch(step, input_data)
+
+    async def _dispatch(self, step: RegistrationStep, input_data: Dict[str, Any]) -> Dict[str, Any]:
         if step == RegistrationStep.COLLECT_PHONE:
             return await self._handle_collect_phone(input_data)
 
@@ -170,8 +157,8 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
     # ------------------------------------------------------------------
 
     async def _handle_patient_lookup(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        patient = await PatientService.get_by_phone(
-            self.db,
+        patient = await PatientService.lookup_by_phone(
+            self.read_db,
             self.state.phone_number,
         )
 
@@ -203,6 +190,7 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
             full_name=full_name,
             age=age,
             contact_number=self.state.phone_number,
+            commit=self.autocommit,
         )
 
         self.update_state(
@@ -220,7 +208,41 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
         if not raw or len(raw.strip()) < 5:
             return {"message": "Please describe your symptoms clearly."}
 
-        summary = await SymptomSummarizerService.summarize(raw)
+        summary = None
+        is_pediatric = self.state.age is not None and self.state.age < 18
+
+        # Fused mode: one LLM call yields summary + department suggestion,
+        # unless the local classifier already settles the department
+        if TRIAGE_MODE == "fused" and not is_pediatric:
+            directory = await reference_cache.departments(self.read_db)
+            dept_names = directory.names
+
+            result = await DepartmentClassifierService.classify(
+                self.read_db, raw, dept_names, CONFIDENCE_THRESHOLD
+            )
+            if not result:
+                try:
+                    result = await TriageService.triage(raw, self.state.age, dept_names)
+                except LLMUnavailableError:
+                    self.llm_unavailable = True
+
+            if result:
+                summary = result.get("summary")
+                self.update_state(
+                    department_suggested=result["department"],
+                    department_confidence=result["confidence"],
+                    department_reasoning=result["reasoning"],
+                )
+
+        # Two-stage mode, local classifier hit, or fused call failed validation.
+        # Degraded (LLM unavailable): the raw symptoms stand in for the summary
+        if summary is None:
+            summary = raw
+            if not self.llm_unavailable:
+                try:
+                    summary = await SymptomSummarizerService.summarize(raw)
+                except LLMUnavailableError:
+                    self.llm_unavailable = True
 
         self.update_state(
             symptoms_raw=raw,
@@ -232,15 +254,10 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
 
     async def _handle_resolve_department(self, input_data: Dict[str, Any]):
 
-        # 0️⃣ Load departments ONCE
-        departments = await DepartmentService.list_all(self.db)
-        dept_names = [d.name for d in departments]
-
-        def _find_department_id(name: str):
-            return next(
-                (d.id for d in departments if d.name.lower() == name.lower()),
-                None,
-            )
+        # 0️⃣ Departments from the reference cache (name → id index)
+        directory = await reference_cache.departments(self.read_db)
+        dept_names = directory.names
+        _find_department_id = directory.id_for
 
         # 1️⃣ User CONFIRMS suggested department ✅ (FIX)
         if input_data.get("confirm") is True and self.state.department_suggested:
@@ -277,13 +294,34 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
             self.transition_to(RegistrationStep.SELECT_DOCTOR)
             return await self.handle({})
 
-        # 4️⃣ LLM-based resolution
-        result = await DepartmentResolverService.resolve(
-            symptom_summary=self.state.symptoms_summary,
-            age=self.state.age,
-            allowed_departments=dept_names,
-        )
+        # 4️⃣ Reuse a suggestion from fused triage
+        if self.state.department_suggested in dept_names:
+            result = {
+                "department": self.state.department_suggested,
+                "confidence": self.state.department_confidence,
+                "reasoning": self.state.department_reasoning,
+            }
+        else:
+            # 5️⃣ Local classifier answers obvious cases in microseconds
+            result = await DepartmentClassifierService.classify(
+                self.read_db,
+                self.state.symptoms_summary or self.state.symptoms_raw,
+                dept_names,
+                CONFIDENCE_THRESHOLD,
+            )
 
+            # 6️⃣ LLM-based resolution for everything ambiguous
+            if not result and not self.llm_unavailable:
+                try:
+                    result = await DepartmentResolverService.resolve(
+                        symptom_summary=self.state.symptoms_summary,
+                        age=self.state.age,
+                        allowed_departments=dept_names,
+                    )
+                except LLMUnavailableError:
+                    self.llm_unavailable = True
+
+        # No suggestion (LLM unavailable or invalid output): department picker
         if not result:
             return {
                 "message": "Please select a department.",
@@ -317,8 +355,8 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
 
 
     async def _handle_select_doctor(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        doctors = await DoctorService.list_available_by_department(
-            self.db,
+        doctors = await reference_cache.doctors(
+            self.read_db,
             self.state.department_id,
         )
 
@@ -360,6 +398,7 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
             patient_id=self.state.patient_id,
             doctor_id=self.state.doctor_id,
             symptoms_summary=self.state.symptoms_summary,
+            commit=self.autocommit,
         )
 
         self.update_state(
@@ -390,7 +429,11 @@ class RegistrationAgent(BaseAgent[RegistrationAgentState]):
             "queue_date": datetime.utcnow().date(),
         }
 
-        result = await handoff_to_queue_agent(payload)
+        # A remote Queue Agent cannot see our open transaction
+        if not self.autocommit and not get_queue_transport().shares_session:
+            await self.db.commit()
+
+        result = await handoff_to_queue_agent(payload, self.db)
         
         # Mark handoff as processed
         self.update_state(handoff_processed=True)
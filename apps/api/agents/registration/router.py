@@ -1,3 +1,5 @@
+import os
+
 from fastapi import APIRouter,Depends
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -5,21 +7,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from agents.registration.agent import RegistrationAgent
 from agents.registration.state import RegistrationAgentState, RegistrationStep
 from schemas.agent import AgentRequest, AgentResponse
-from db.session import get_db_session
-from services.agent_session_service import AgentSessionService
+from db.session import get_db_session, get_read_db_session
+from services.session_store import session_store
 
 router = APIRouter(prefix="/agents/registration", tags=["Registration Agent"])
 
+# One transaction (one commit) per message instead of one per service call
+REGISTRATION_UNIT_OF_WORK = os.getenv("REGISTRATION_UNIT_OF_WORK", "true").lower() in ("1", "true", "yes")
+
 
 @router.post("/message", response_model=AgentResponse)
-async def handle_registration_message(payload: AgentRequest, db: AsyncSession = Depends(get_db_session),):
+async def handle_registration_message(
+    payload: AgentRequest,
+    db: AsyncSession = Depends(get_db_session),
+    read_db: AsyncSession = Depends(get_read_db_session),
+):
 
     # -------------------------------------------------
     # 1️⃣ Load or create session
     # -------------------------------------------------
 
     if payload.session_id:
-        state_data = await AgentSessionService.get(
+        state_data = await session_store.get(
             db,
             payload.session_id,
         )
@@ -32,25 +41,39 @@ async def handle_registration_message(payload: AgentRequest, db: AsyncSession =
         state = RegistrationAgentState(
             step=RegistrationStep.COLLECT_PHONE
         )
-        session_id = await AgentSessionService.create(
-            db,
+        state_data = state.model_dump(mode="json")
+        session_id = await session_store.create(
             agent_name=state.agent_name,
-            state=state.model_dump(),
+            state=state_data,
+            db=db,
         )
     
     # -------------------------------------------------
     # 2️⃣ Run agent
     # -------------------------------------------------
-    agent = RegistrationAgent(state=state, db=db)
+    agent = RegistrationAgent(
+        state=state,
+        db=db,
+        autocommit=not REGISTRATION_UNIT_OF_WORK,
+        read_db=read_db,
+    )
     response = await agent.handle(payload.input)
 
+    # Single commit for everything the message wrote (patient, visit,
+    # queue entry); on error the session closes and rolls it all back
+    await db.commit()
+
     # -------------------------------------------------
-    # 3️⃣ Persist updated state
+    # 3️⃣ Persist changed fields (hot tier; Postgres in background, or
+    # right away when the hot tier is per-process)
     # -------------------------------------------------
-    await AgentSessionService.update(
-        db,
-        session_id=session_id,
-        state=agent.state.model_dump(),
+    changes = agent.state.dump_changes()
+    await session_store.save(
+        session_id,
+        agent.state.agent_name,
+        {**state_data, **changes},
+        changes=changes,
+        db=db,
     )
 
     return AgentResponse(
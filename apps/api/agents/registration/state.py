@@ -1,7 +1,7 @@
 from enum import Enum
 
-from pydantic import BaseModel, Field
-from typing import Optional,List
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, Optional, List, Set
 from uuid import UUID
 from datetime import datetime
 
@@ -53,4 +53,26 @@ class RegistrationAgentState(BaseModel):
     visit_id: Optional[UUID] = None
     
     # --- Handoff State ---
-    handoff_processed: bool = False
\ No newline at end of file
+    handoff_processed: bool = False
+
+    # --- Change tracking (not persisted) ---
+    _changed: Set[str] = PrivateAttr(default_factory=set)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._changed.add(name)
+
+    def changed_fields(self) -> Set[str]:
+        return set(self._changed)
+
+    def dump_changes(self) -> Dict[str, Any]:
+        """
+        JSON-ready dict of the fields assigned since load / last clear.
+        """
+        if not self._changed:
+            return {}
+        return self.model_dump(mode="json", include=self._changed)
+
+    def clear_changes(self) -> None:
+        self._changed.clear()
@@ -0,0 +1,11 @@
+-- Per-queue token counter replacing SELECT max(token_number) at intake.
+
+ALTER TABLE doctor_queues
+    ADD COLUMN IF NOT EXISTS last_token_number INT NOT NULL DEFAULT 0;
+
+-- Backfill from tokens already issued
+UPDATE doctor_queues q
+SET last_token_number = COALESCE(
+    (SELECT max(e.token_number) FROM queue_entries e WHERE e.queue_id = q.id),
+    0
+);
@@ -0,0 +1,29 @@
+-- Composite / partial indexes for QueueService hot paths.
+-- Unique indexes reuse the constraint names from schema.sql, so databases
+-- that already have the constraints skip them.
+-- On a large live database run each statement by hand with CONCURRENTLY.
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_doctor_queue
+    ON doctor_queues (doctor_id, queue_date);
+
+CREATE INDEX IF NOT EXISTS ix_doctor_queues_queue_date
+    ON doctor_queues (queue_date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_queue_visit
+    ON queue_entries (queue_id, visit_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_queue_token
+    ON queue_entries (queue_id, token_number);
+
+CREATE INDEX IF NOT EXISTS ix_queue_entries_queue_status_token
+    ON queue_entries (queue_id, status, token_number);
+
+CREATE INDEX IF NOT EXISTS ix_queue_entries_active
+    ON queue_entries (queue_id, token_number)
+    WHERE status IN ('waiting', 'present', 'called');
+
+CREATE INDEX IF NOT EXISTS ix_queue_entries_visit_id
+    ON queue_entries (visit_id);
+
+ANALYZE doctor_queues;
+ANALYZE queue_entries;
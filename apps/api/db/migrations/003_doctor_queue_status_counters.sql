@@ -0,0 +1,32 @@
+-- Per-status entry counters on doctor_queues, replacing per-request
+-- counting of queue_entries in the status views and at intake.
+
+ALTER TABLE doctor_queues
+    ADD COLUMN IF NOT EXISTS waiting_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS present_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS called_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS in_consultation_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS completed_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS skipped_count INT NOT NULL DEFAULT 0;
+
+-- Backfill from existing entries
+UPDATE doctor_queues q
+SET waiting_count = c.waiting,
+    present_count = c.present,
+    called_count = c.called,
+    in_consultation_count = c.in_consultation,
+    completed_count = c.completed,
+    skipped_count = c.skipped
+FROM (
+    SELECT
+        queue_id,
+        count(*) FILTER (WHERE status = 'waiting') AS waiting,
+        count(*) FILTER (WHERE status = 'present') AS present,
+        count(*) FILTER (WHERE status = 'called') AS called,
+        count(*) FILTER (WHERE status = 'in_consultation') AS in_consultation,
+        count(*) FILTER (WHERE status = 'completed') AS completed,
+        count(*) FILTER (WHERE status = 'skipped') AS skipped
+    FROM queue_entries
+    GROUP BY queue_id
+) c
+WHERE c.queue_id = q.id;
@@ -0,0 +1,83 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+# Recent checkouts kept for percentiles
+POOL_WAIT_SAMPLES = 2048
+
+
+@dataclass
+class PoolWaitStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=POOL_WAIT_SAMPLES))
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout: queueing for a free
+    connection, opening an overflow one, and pre-ping when enabled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - started)
+
+
+def pool_metrics(engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Current occupancy and checkout wait statistics of an engine's pool.
+    """
+    pool = engine.sync_engine.pool
+    metrics: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative while the base pool is not yet filled
+            overflow=pool.overflow(),
+        )
+
+    stats = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        metrics.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_avg_ms=round(stats.total_wait / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+            wait_p95_ms=round(stats.percentile(0.95) * 1000, 3),
+            wait_max_ms=round(stats.max_wait * 1000, 3),
+        )
+
+    return metrics
@@ -63,6 +63,15 @@ CREATE TABLE doctor_queues (
     -- Progress tracking
     current_token INT DEFAULT 0,
     current_visit_id UUID,
+    last_token_number INT NOT NULL DEFAULT 0,
+
+    -- Entries per status, moved with every status transition
+    waiting_count INT NOT NULL DEFAULT 0,
+    present_count INT NOT NULL DEFAULT 0,
+    called_count INT NOT NULL DEFAULT 0,
+    in_consultation_count INT NOT NULL DEFAULT 0,
+    completed_count INT NOT NULL DEFAULT 0,
+    skipped_count INT NOT NULL DEFAULT 0,
 
     -- Explainability & audit
     last_event_type TEXT,
@@ -110,6 +119,17 @@ CREATE TABLE queue_entries (
     CONSTRAINT uq_queue_token UNIQUE (queue_id, token_number)
 );
 
+CREATE INDEX ix_doctor_queues_queue_date ON doctor_queues (queue_date);
+
+CREATE INDEX ix_queue_entries_queue_status_token
+    ON queue_entries (queue_id, status, token_number);
+
+CREATE INDEX ix_queue_entries_active
+    ON queue_entries (queue_id, token_number)
+    WHERE status IN ('waiting', 'present', 'called');
+
+CREATE INDEX ix_queue_entries_visit_id ON queue_entries (visit_id);
+
 
 --dummy data
 INSERT INTO doctors (id, name, specialization, department_id, is_available)
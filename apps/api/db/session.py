@@ -1,14 +1,21 @@
+import asyncio
 import os
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.engine import URL
+from sqlalchemy import event, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+from db.pool import InstrumentedAsyncQueuePool
+
 load_dotenv()
 
 # ------------------------------------------------------------------
@@ -21,16 +28,145 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL environment variable not set")
 
 
+# ------------------------------------------------------------------
+# Pool / driver settings
+# ------------------------------------------------------------------
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+DB_ECHO = _env_flag("DB_ECHO", "false")  # SQL logs (disable in prod)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections older than this (seconds); -1 disables
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Pre-ping costs a round trip per checkout; recycle covers most stale
+# connections, so it is opt-in
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "false")
+# asyncpg prepared statement cache per connection; 0 behind PgBouncer
+# in transaction pooling mode
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+
 # ------------------------------------------------------------------
 # Async Engine
 # ------------------------------------------------------------------
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,          # SQL logs (disable in prod)
-    pool_pre_ping=True, # Detect stale connections
+def create_engine_from_settings(url: str, **overrides) -> AsyncEngine:
+    """
+    Engine factory driven by the DB_* settings; keyword overrides win.
+    """
+    options = dict(
+        echo=DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+    if make_url(url).drivername == "postgresql+asyncpg":
+        options["connect_args"] = {
+            # SQLAlchemy's adapter-level cache and asyncpg's own
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
+engine = create_engine_from_settings(DATABASE_URL)
+
+
+# ------------------------------------------------------------------
+# Read replica (optional)
+# ------------------------------------------------------------------
+
+# Unset: read-only sessions use the primary. May point at the same
+# instance under a second URL for local testing.
+POSTGRES_REPLICA_URI = os.getenv("POSTGRES_REPLICA_URI")
+# Staleness bound: above this replay lag reads go to the primary
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "2"))
+# How long a lag measurement is reused before asking the replica again
+DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "1"))
+# A probe slower than this counts as "replica unusable", reads go to the primary
+DB_REPLICA_PROBE_TIMEOUT_SECONDS = float(os.getenv("DB_REPLICA_PROBE_TIMEOUT_SECONDS", "0.5"))
+
+replica_engine: Optional[AsyncEngine] = (
+    create_engine_from_settings(POSTGRES_REPLICA_URI) if POSTGRES_REPLICA_URI else None
 )
 
+# Replay lag in seconds; 0 on a primary or when all received WAL is
+# replayed (an idle primary would otherwise look infinitely behind)
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaHealth:
+    """
+    Cached replica lag check deciding where read-only sessions go.
+    """
+
+    def __init__(
+        self,
+        replica: Optional[AsyncEngine],
+        max_lag_seconds: float = DB_REPLICA_MAX_LAG_SECONDS,
+        check_seconds: float = DB_REPLICA_LAG_CHECK_SECONDS,
+        probe_timeout_seconds: float = DB_REPLICA_PROBE_TIMEOUT_SECONDS,
+    ):
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.fallbacks = 0
+        self._lock = asyncio.Lock()
+
+    async def measure(self) -> Optional[float]:
+        """
+        Replica lag in seconds, or None when the replica is unreachable
+        or does not answer within probe_timeout_seconds.
+        """
+        try:
+            return await asyncio.wait_for(self._probe(), self.probe_timeout_seconds)
+        except Exception:
+            return None
+
+    async def _probe(self) -> float:
+        async with self.replica.connect() as conn:
+            return float((await conn.execute(_REPLICA_LAG_SQL)).scalar() or 0)
+
+    async def usable(self) -> bool:
+        if self.replica is None:
+            return False
+
+        # One session probes; the others use the last result meanwhile
+        if time.monotonic() - self.checked_at >= self.check_seconds and not self._lock.locked():
+            async with self._lock:
+                if time.monotonic() - self.checked_at >= self.check_seconds:
+                    self.lag_seconds = await self.measure()
+                    self.checked_at = time.monotonic()
+
+        ok = self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+        if not ok:
+            self.fallbacks += 1
+        return ok
+
+
+replica_health = ReplicaHealth(replica_engine)
+
 
 # ------------------------------------------------------------------
 # Async Session Factory
@@ -42,6 +178,82 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        info={"replica": True},
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    return bool(db.info.get("replica"))
+
+
+# ------------------------------------------------------------------
+# Post-commit hooks
+# ------------------------------------------------------------------
+
+def on_commit(db: AsyncSession, callback) -> None:
+    """
+    Runs callback once the DB write is durable: now if no transaction is
+    open, else when the outermost transaction commits (e.g. the caller's
+    unit of work). Dropped on rollback, including the rollback of a
+    savepoint it was registered in.
+    """
+    if db.in_transaction():
+        # Tagged with the innermost savepoint so rolling that back drops it
+        savepoint = db.sync_session.get_nested_transaction()
+        db.info.setdefault("on_commit", []).append((savepoint, callback))
+    else:
+        callback()
+
+
+def _enclosing_savepoint(savepoint):
+    outer = savepoint.parent
+    while outer is not None and not outer.nested:
+        outer = outer.parent
+    return outer
+
+
+# after_commit / after_rollback also fire for SAVEPOINT release / rollback;
+# only the outermost transaction decides whether callbacks run
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session):
+    savepoint = session.get_nested_transaction()
+    if savepoint is not None:
+        # Released savepoint: its callbacks now wait for the enclosing one
+        if "on_commit" in session.info:
+            outer = _enclosing_savepoint(savepoint)
+            session.info["on_commit"] = [
+                (outer if tag is savepoint else tag, callback)
+                for tag, callback in session.info["on_commit"]
+            ]
+        return
+
+    for _, callback in session.info.pop("on_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit(session):
+    savepoint = session.get_nested_transaction()
+    if savepoint is None:
+        session.info.pop("on_commit", None)
+    elif "on_commit" in session.info:
+        # Savepoint rollback: only what was registered inside it is undone
+        session.info["on_commit"] = [
+            (tag, callback)
+            for tag, callback in session.info["on_commit"]
+            if tag is not savepoint
+        ]
+
 
 # ------------------------------------------------------------------
 # Dependency / Context Manager
@@ -56,3 +268,23 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def read_session_factory() -> async_sessionmaker:
+    if await replica_health.usable():
+        return ReplicaSessionLocal
+    return AsyncSessionLocal
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only service calls: the replica while its lag is
+    within DB_REPLICA_MAX_LAG_SECONDS, otherwise the primary.
+    Never write through it.
+    """
+    factory = await read_session_factory()
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
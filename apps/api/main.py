@@ -1,16 +1,95 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from agents.registration.router import router as registration_router
 from agents.queue.router import router as queue_router
+from agents.queue.client import close_queue_transport
+from db.session import AsyncSessionLocal, engine, replica_engine, replica_health
+from db.pool import pool_metrics
+from services.queue_engine import queue_engine
+from services.queue_relay import queue_event_relay
+from services.queue_service import QueueService
+from services.llm.client import llm_clients
+from services.session_store import session_store
+from services.patient_lookup_cache import PATIENT_LOOKUP_PRELOAD, patient_lookup_cache
+from observability import (
+    OBSERVABILITY_ENABLED,
+    ObservabilityMiddleware,
+    instrument_engine,
+    recent_traces,
+    registry,
+)
+from observability.collectors import register_default_collectors
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rebuild today's resident queues from the DB after a restart, and
+    # warm phone lookups for patients booked today
+    async with AsyncSessionLocal() as db:
+        today = datetime.utcnow().date()
+        await queue_engine.reconcile(db, today)
+        if PATIENT_LOOKUP_PRELOAD:
+            await patient_lookup_cache.preload(db, queue_date=today)
+    session_store.start()
+    # Stream events committed on other workers
+    queue_event_relay.start(QueueService.apply_relayed_event, QueueService.resync_subscribed)
+
+    yield
+    await queue_event_relay.stop()
+    # Persist sessions still waiting for the background flusher
+    await session_store.stop()
+    # Release pooled connections held by the queue handoff transport
+    await close_queue_transport()
+    await llm_clients.aclose()
+
+
 app = FastAPI(
     title="HMS Multi-Agent API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(registration_router)
 app.include_router(queue_router)
 
+# Request spans, per-route / per-SQL-fingerprint / per-step histograms
+if OBSERVABILITY_ENABLED:
+    app.add_middleware(ObservabilityMiddleware)
+    instrument_engine(engine, "primary")
+    if replica_engine is not None:
+        instrument_engine(replica_engine, "replica")
+register_default_collectors()
+
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics/db-pool")
+def db_pool_metrics():
+    metrics = pool_metrics(engine)
+    if replica_engine is not None:
+        metrics["replica"] = {
+            **pool_metrics(replica_engine),
+            "lag_seconds": replica_health.lag_seconds,
+            "fallbacks": replica_health.fallbacks,
+        }
+    return metrics
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return registry.render()
+
+
+@app.get("/metrics/traces")
+def request_traces(limit: int = 20):
+    """
+    Most recent request span trees, newest first.
+    """
+    return [trace.to_dict() for trace in list(recent_traces)[-limit:][::-1]]
@@ -7,6 +7,8 @@ from sqlalchemy import (
     Integer,
     Text,
     ForeignKey,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -16,8 +18,25 @@ import uuid
 from db.base import Base
 
 
+# Every status a queue entry can be in; each has a <status>_count column
+QUEUE_STATUSES = (
+    "waiting",
+    "present",
+    "called",
+    "in_consultation",
+    "completed",
+    "skipped",
+)
+
+
 class DoctorQueue(Base):
     __tablename__ = "doctor_queues"
+    __table_args__ = (
+        # Every QueueService call looks the queue up by (doctor_id, queue_date)
+        UniqueConstraint("doctor_id", "queue_date", name="uq_doctor_queue"),
+        # Startup reconciliation loads all queues of a day
+        Index("ix_doctor_queues_queue_date", "queue_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -34,6 +53,18 @@ class DoctorQueue(Base):
     current_token = Column(Integer, default=0)
     current_visit_id = Column(UUID(as_uuid=True))
 
+    # Token allocator: last token handed out today (UPDATE ... RETURNING)
+    last_token_number = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Entries per status, moved by QueueService in the same transaction as
+    # every status transition (status views read these instead of counting)
+    waiting_count = Column(Integer, nullable=False, default=0, server_default="0")
+    present_count = Column(Integer, nullable=False, default=0, server_default="0")
+    called_count = Column(Integer, nullable=False, default=0, server_default="0")
+    in_consultation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    skipped_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     last_event_type = Column(Text)
     last_event_reason = Column(Text)
     last_updated_by = Column(Text)
@@ -53,3 +84,7 @@ class DoctorQueue(Base):
         back_populates="queue",
         cascade="all, delete-orphan",
     )
+
+    @property
+    def counts(self) -> dict:
+        return {status: getattr(self, f"{status}_count") or 0 for status in QUEUE_STATUSES}
@@ -4,6 +4,9 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     DateTime,
+    Index,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -15,6 +18,26 @@ from db.base import Base
 
 class QueueEntry(Base):
     __tablename__ = "queue_entries"
+    __table_args__ = (
+        UniqueConstraint("queue_id", "visit_id", name="uq_queue_visit"),
+        UniqueConstraint("queue_id", "token_number", name="uq_queue_token"),
+        # Status lookups and per-status ordering within a queue
+        Index(
+            "ix_queue_entries_queue_status_token",
+            "queue_id",
+            "status",
+            "token_number",
+        ),
+        # call_next: only entries still eligible to be called
+        Index(
+            "ix_queue_entries_active",
+            "queue_id",
+            "token_number",
+            postgresql_where=text("status IN ('waiting', 'present', 'called')"),
+        ),
+        # check_in: lookup by visit across queues
+        Index("ix_queue_entries_visit_id", "visit_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
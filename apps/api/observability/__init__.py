@@ -0,0 +1,4 @@
+from observability.metrics import registry, Counter, Histogram
+from observability.tracing import OBSERVABILITY_ENABLED, span, record_span, current_span, recent_traces
+from observability.sql import instrument_engine, fingerprint
+from observability.middleware import ObservabilityMiddleware
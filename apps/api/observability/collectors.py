@@ -0,0 +1,97 @@
+from typing import Iterable
+
+from db.pool import pool_metrics
+from db.session import engine, replica_engine
+from observability.metrics import Sample, registry
+from services.llm.cache import llm_cache
+from services.llm.circuit_breaker import CircuitBreaker
+from services.llm.client import llm_clients
+from services.llm.hedging import llm_hedger
+from services.llm.singleflight import llm_singleflight
+from services.patient_lookup_cache import patient_lookup_cache
+from services.queue_relay import queue_event_relay
+from services.session_store import session_store
+
+
+def _pool_samples() -> Iterable[Sample]:
+    engines = [("primary", engine)]
+    if replica_engine is not None:
+        engines.append(("replica", replica_engine))
+
+    snapshots = [(name, pool_metrics(e)) for name, e in engines]
+    gauges = [
+        ("db_pool_checked_out", "Connections currently checked out", "checked_out"),
+        ("db_pool_overflow", "Overflow connections in use (negative: unfilled base pool)", "overflow"),
+        ("db_pool_wait_p95_seconds", "p95 pool checkout time over recent checkouts", "wait_p95_ms"),
+    ]
+    for metric, help, key in gauges:
+        for name, metrics in snapshots:
+            if key in metrics:
+                value = metrics[key] / 1000 if key.endswith("_ms") else metrics[key]
+                yield metric, help, "gauge", {"engine": name}, value
+    for name, metrics in snapshots:
+        if "timeouts" in metrics:
+            yield "db_pool_timeouts_total", "Pool checkouts that timed out", "counter", {"engine": name}, metrics["timeouts"]
+
+
+def _llm_cache_samples() -> Iterable[Sample]:
+    stats = llm_cache.stats()
+    for outcome in ("hits", "misses", "bypassed"):
+        yield "llm_cache_lookups_total", "LLM response cache lookups", "counter", {"outcome": outcome}, stats[outcome]
+    yield "llm_cache_backend_errors_total", "Cache backend errors treated as a miss or a skipped store", "counter", {}, stats["backend_errors"]
+    yield "llm_singleflight_in_flight", "Distinct LLM calls currently shared by single-flight", "gauge", {}, llm_singleflight.in_flight()
+
+
+def _patient_lookup_samples() -> Iterable[Sample]:
+    stats = patient_lookup_cache.stats()
+    for outcome in ("hits", "negative_hits", "misses"):
+        yield "patient_lookup_cache_lookups_total", "Phone number lookups by cache outcome", "counter", {"outcome": outcome}, stats[outcome]
+    yield "patient_lookup_cache_entries", "Phone numbers cached (incl. negative entries)", "gauge", {}, stats["entries"]
+
+
+def _llm_breaker_samples() -> Iterable[Sample]:
+    for model, breaker in list(llm_clients.breakers.items()):
+        yield (
+            "llm_circuit_state",
+            "LLM circuit breaker state per model (0 closed, 1 open, 2 half-open)",
+            "gauge",
+            {"model": model},
+            CircuitBreaker.STATES.index(breaker.state),
+        )
+
+
+def _llm_hedge_samples() -> Iterable[Sample]:
+    if not llm_hedger.enabled:
+        return
+    for model, delay_ms in llm_hedger.stats()["delay_ms"].items():
+        yield "llm_hedge_current_delay_seconds", "Delay before a duplicate is sent (0 while warming up)", "gauge", {"model": model}, delay_ms / 1000
+    yield "llm_hedge_budget_credit", "Hedges that can be sent right now", "gauge", {}, llm_hedger.credit
+
+
+def _session_store_samples() -> Iterable[Sample]:
+    yield (
+        "session_store_pending",
+        "Sessions waiting for the background Postgres flush",
+        "gauge",
+        {},
+        session_store.pending_count(),
+    )
+
+
+def _queue_relay_samples() -> Iterable[Sample]:
+    if not queue_event_relay.enabled:
+        return
+    stats = queue_event_relay.stats()
+    yield "queue_relay_connected", "1 while the LISTEN connection for cross-worker queue events is up", "gauge", {}, int(stats["connected"])
+    for outcome in ("sent", "received", "failed"):
+        yield "queue_relay_events_total", "Cross-worker queue events by outcome", "counter", {"outcome": outcome}, stats[outcome]
+
+
+def register_default_collectors() -> None:
+    registry.register_collector(_pool_samples)
+    registry.register_collector(_llm_cache_samples)
+    registry.register_collector(_llm_breaker_samples)
+    registry.register_collector(_llm_hedge_samples)
+    registry.register_collector(_patient_lookup_samples)
+    registry.register_collector(_session_store_samples)
+    registry.register_collector(_queue_relay_samples)
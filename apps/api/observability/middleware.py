@@ -0,0 +1,47 @@
+from observability.metrics import registry
+from observability.tracing import span
+
+
+HTTP_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ("method", "route", "status"),
+)
+
+
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware (streaming responses pass through untouched):
+    opens the root span of each HTTP request and records its latency.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        with span(f"{method} {scope['path']}", "request", root=True) as root:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # Route template, not the raw path, keeps series bounded
+                route = getattr(scope.get("route"), "path", "unmatched")
+                root.name = f"{method} {route}"
+                root.attrs["status"] = status[0]
+                HTTP_DURATION.observe(
+                    root.elapsed,
+                    method=method,
+                    route=route,
+                    status=str(status[0]),
+                )
@@ -0,0 +1,73 @@
+import os
+import re
+import time
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from observability.metrics import registry
+from observability.tracing import record_span
+
+
+SQL_FINGERPRINT_MAX_LENGTH = int(os.getenv("SQL_FINGERPRINT_MAX_LENGTH", "200"))
+
+SQL_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement fingerprint",
+    ("engine", "statement"),
+)
+DB_COMMITS = registry.counter(
+    "db_commits",
+    "Transactions committed",
+    ("engine",),
+)
+
+
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Statement shape with literals and parameters replaced, so executions
+    of the same query share one histogram series.
+    """
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _PARAM.sub("?", shape)
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    # IN (?, ?, ?) and multi-row VALUES (?, ?), (?, ?)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    shape = _REPEATED_LIST.sub("(...)", shape)
+    return shape[:SQL_FINGERPRINT_MAX_LENGTH]
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """
+    Times every statement and counts commits on engine.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._observability_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_observability_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        shape = fingerprint(statement)
+        SQL_DURATION.observe(elapsed, engine=name, statement=shape)
+        record_span("sql", "sql", elapsed, engine=name, statement=shape)
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        DB_COMMITS.inc(engine=name)
@@ -0,0 +1,121 @@
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from observability.metrics import Histogram
+
+
+OBSERVABILITY_ENABLED = os.getenv("OBSERVABILITY_ENABLED", "false").lower() in ("1", "true", "yes")
+# Completed request span trees kept for GET /metrics/traces
+OBSERVABILITY_TRACE_BUFFER = int(os.getenv("OBSERVABILITY_TRACE_BUFFER", "200"))
+# Spans per trace beyond this are counted, not kept (e.g. SQL in a loop)
+OBSERVABILITY_MAX_SPANS = int(os.getenv("OBSERVABILITY_MAX_SPANS", "500"))
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    children: List["Span"] = field(default_factory=list)
+    root: Optional["Span"] = None
+    span_count: int = 1
+    dropped: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def finish(self) -> None:
+        if self.duration is None:
+            self.duration = self.elapsed
+
+    def adopt(self, child: "Span") -> None:
+        root = self.root or self
+        child.root = root
+        if root.span_count >= OBSERVABILITY_MAX_SPANS:
+            root.dropped += 1
+            return
+        root.span_count += 1
+        self.children.append(child)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round((self.duration or self.elapsed) * 1000, 3),
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        if self.dropped:
+            data["dropped_spans"] = self.dropped
+        return data
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("observability_span", default=None)
+
+recent_traces: Deque[Span] = deque(maxlen=OBSERVABILITY_TRACE_BUFFER)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: str = "internal",
+    *,
+    root: bool = False,
+    histogram: Optional[Histogram] = None,
+    labels: Optional[Dict[str, Any]] = None,
+    **attrs,
+):
+    """
+    Times a block as a child of the current span (or as a new trace when
+    root=True) and optionally observes the duration into histogram.
+    Yields None when observability is disabled.
+    """
+    if not OBSERVABILITY_ENABLED:
+        yield None
+        return
+
+    # Outside a request (startup, background tasks) the span is only timed
+    current = Span(name, kind, attrs)
+    parent = None if root else _current_span.get()
+    if parent is not None:
+        parent.adopt(current)
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+        if histogram is not None:
+            histogram.observe(current.duration, **(labels or {}))
+        if root:
+            recent_traces.append(current)
+
+
+def record_span(name: str, kind: str, duration: float, **attrs) -> None:
+    """
+    Attaches an already-measured span (e.g. from SQLAlchemy events) to the
+    current trace.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    child = Span(name, kind, attrs, started=time.perf_counter() - duration, duration=duration)
+    parent.adopt(child)
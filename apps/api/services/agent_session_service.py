@@ -1,10 +1,11 @@
 import uuid
-from typing import Optional
-from datetime import datetime
-from uuid import UUID as PythonUUID
+from typing import Dict, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update
+from sqlalchemy import select, insert, update, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy import Table, Column, Text, DateTime
@@ -14,19 +15,8 @@ from db.base import Base
 
 
 def _serialize_state(state: dict) -> dict:
-    """Convert datetime and UUID objects to ISO/string format for JSON serialization."""
-    def convert_value(v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        elif isinstance(v, PythonUUID):
-            return str(v)
-        elif isinstance(v, dict):
-            return {k: convert_value(val) for k, val in v.items()}
-        elif isinstance(v, (list, tuple)):
-            return [convert_value(item) for item in v]
-        return v
-    
-    return convert_value(state)
+    """Convert datetime, UUID and Enum values to JSON-ready primitives (pydantic-core, not a Python walk)."""
+    return to_jsonable_python(state)
 
 
 # -------------------------------------------------
@@ -84,15 +74,55 @@ class AgentSessionService:
     async def update(
         db: AsyncSession,
         session_id: uuid.UUID,
-        state: dict,
+        changes: dict,
     ) -> None:
+        """
+        Merges the changed fields into the stored state (jsonb ||), so only
+        the delta is shipped instead of the whole document.
+        """
+        if not changes:
+            return
+
         stmt = (
             update(agent_sessions)
             .where(agent_sessions.c.session_id == session_id)
             .values(
-                state=_serialize_state(state),
+                state=agent_sessions.c.state.op("||")(
+                    cast(_serialize_state(changes), JSONB)
+                ),
                 updated_at=func.now(),
             )
         )
         await db.execute(stmt)
         await db.commit()
+
+    @staticmethod
+    async def upsert_many(
+        db: AsyncSession,
+        sessions: Dict[uuid.UUID, Tuple[str, dict]],
+    ) -> None:
+        """
+        Persists a batch of (agent_name, state) by session_id in one statement.
+        For existing rows the state is a delta merged with jsonb ||; new
+        sessions carry their full state.
+        """
+        if not sessions:
+            return
+
+        stmt = pg_insert(agent_sessions).values([
+            {
+                "session_id": session_id,
+                "agent_name": agent_name,
+                "state": _serialize_state(state),
+            }
+            for session_id, (agent_name, state) in sessions.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[agent_sessions.c.session_id],
+            set_={
+                "state": agent_sessions.c.state.op("||")(stmt.excluded.state),
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+        await db.commit()
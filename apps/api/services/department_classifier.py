@@ -0,0 +1,259 @@
+import math
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.department import Department
+from models.doctor import Doctor
+from models.visit import Visit
+
+
+# Off until scripts/eval_department_classifier.py shows acceptable accuracy
+DEPARTMENT_CLASSIFIER_ENABLED = os.getenv("DEPARTMENT_CLASSIFIER_ENABLED", "false").lower() in ("1", "true", "yes")
+DEPARTMENT_CLASSIFIER_REFRESH_SECONDS = int(os.getenv("DEPARTMENT_CLASSIFIER_REFRESH_SECONDS", "3600"))
+# Most recent visit summaries used as training text
+DEPARTMENT_CLASSIFIER_HISTORY_LIMIT = int(os.getenv("DEPARTMENT_CLASSIFIER_HISTORY_LIMIT", "2000"))
+# Below this cosine similarity nothing is "obvious"
+DEPARTMENT_CLASSIFIER_MIN_SIMILARITY = float(os.getenv("DEPARTMENT_CLASSIFIER_MIN_SIMILARITY", "0.3"))
+# Similarity at which the margin counts in full; weaker matches are scaled down
+DEPARTMENT_CLASSIFIER_FULL_SIMILARITY = float(os.getenv("DEPARTMENT_CLASSIFIER_FULL_SIMILARITY", "0.6"))
+# Informative terms (not shared by most departments) the best match must contain
+DEPARTMENT_CLASSIFIER_MIN_TERMS = int(os.getenv("DEPARTMENT_CLASSIFIER_MIN_TERMS", "2"))
+
+
+_TOKEN = re.compile(r"[a-z]+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "by", "for", "from",
+    "has", "have", "he", "her", "his", "i", "in", "is", "it", "its", "me",
+    "my", "of", "on", "or", "patient", "reports", "related", "she", "since",
+    "the", "their", "to", "was", "with", "days", "day", "weeks", "week",
+    "some", "mild", "severe", "also", "having", "feel", "feeling",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS or len(token) < 3:
+            continue
+        # Cheap plural folding: "rashes" / "rash", "joints" / "joint"
+        if token.endswith("es") and len(token) > 4:
+            token = token[:-2]
+        elif token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class DepartmentClassifier:
+    """
+    TF-IDF centroid per department; cosine similarity against the input.
+
+    A match needs an absolute similarity of at least min_similarity and
+    min_terms informative matched terms; a single shared word ("pain")
+    scores 0. On top of that, confidence is the relative margin between
+    the best and second-best department, scaled down for matches weaker
+    than full_similarity.
+    """
+
+    def __init__(
+        self,
+        idf: Dict[str, float],
+        centroids: Dict[str, Dict[str, float]],
+        min_similarity: float = DEPARTMENT_CLASSIFIER_MIN_SIMILARITY,
+        full_similarity: float = DEPARTMENT_CLASSIFIER_FULL_SIMILARITY,
+        min_terms: int = DEPARTMENT_CLASSIFIER_MIN_TERMS,
+    ):
+        self.idf = idf
+        self.centroids = centroids
+        self.min_similarity = min_similarity
+        self.full_similarity = full_similarity
+        self.min_terms = min_terms
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(
+        cls,
+        documents: Dict[str, List[str]],
+        min_similarity: float = DEPARTMENT_CLASSIFIER_MIN_SIMILARITY,
+        full_similarity: float = DEPARTMENT_CLASSIFIER_FULL_SIMILARITY,
+        min_terms: int = DEPARTMENT_CLASSIFIER_MIN_TERMS,
+    ) -> "DepartmentClassifier":
+        """
+        documents: department name -> texts labelled with it.
+        """
+        tokenized = {
+            name: [tokenize(text) for text in texts if text]
+            for name, texts in documents.items()
+        }
+
+        doc_freq: Counter = Counter()
+        total_docs = 0
+        for docs in tokenized.values():
+            for tokens in docs:
+                doc_freq.update(set(tokens))
+                total_docs += 1
+
+        idf = {
+            term: math.log((1 + total_docs) / (1 + freq)) + 1
+            for term, freq in doc_freq.items()
+        }
+
+        centroids = {}
+        for name, docs in tokenized.items():
+            centroid: Counter = Counter()
+            for tokens in docs:
+                vector = cls._weigh(Counter(tokens), idf)
+                for term, weight in vector.items():
+                    centroid[term] += weight
+            centroids[name] = cls._normalize(centroid)
+
+        return cls(idf, centroids, min_similarity, full_similarity, min_terms)
+
+    @staticmethod
+    def _weigh(counts: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+        vector = {
+            term: (1 + math.log(count)) * idf[term]
+            for term, count in counts.items()
+            if term in idf
+        }
+        return DepartmentClassifier._normalize(vector)
+
+    @staticmethod
+    def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if not norm:
+            return {}
+        return {term: w / norm for term, w in vector.items()}
+
+    def classify(
+        self,
+        text: str,
+        allowed_departments: Optional[List[str]] = None,
+    ) -> Optional[Dict]:
+        """
+        Same shape as DepartmentResolverService.resolve, or None when the
+        text shares no vocabulary with any department.
+        """
+        query = self._weigh(Counter(tokenize(text)), self.idf)
+        if not query:
+            return None
+
+        scores = []
+        for name, centroid in self.centroids.items():
+            if allowed_departments is not None and name not in allowed_departments:
+                continue
+            similarity = sum(w * centroid.get(term, 0.0) for term, w in query.items())
+            scores.append((similarity, name))
+
+        if not scores:
+            return None
+
+        scores.sort(reverse=True)
+        best, department = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+
+        centroid = self.centroids[department]
+        matched = sorted(
+            (term for term in query if term in centroid),
+            key=lambda term: query[term] * centroid[term],
+            reverse=True,
+        )
+
+        # Terms most candidate departments share say nothing about which one
+        candidates = [name for _, name in scores]
+        informative = [
+            term for term in matched
+            if sum(term in self.centroids[name] for name in candidates) * 2 <= len(candidates)
+            or len(candidates) == 1
+        ]
+
+        if best < self.min_similarity or len(informative) < self.min_terms:
+            confidence = 0.0
+        else:
+            strength = min(best / self.full_similarity, 1.0) if self.full_similarity else 1.0
+            confidence = strength * (best - runner_up) / best
+
+        matched = matched[:3]
+
+        return {
+            "department": department,
+            "confidence": round(confidence, 3),
+            "reasoning": [f"Matched terms: {', '.join(matched)}"] if matched else [],
+        }
+
+
+class DepartmentClassifierService:
+    """
+    Builds the classifier from departments + historical visit summaries
+    and keeps it resident, rebuilding every REFRESH_SECONDS.
+    """
+
+    _classifier: Optional[DepartmentClassifier] = None
+
+    @staticmethod
+    async def training_documents(
+        db: AsyncSession,
+        history_limit: int = DEPARTMENT_CLASSIFIER_HISTORY_LIMIT,
+    ) -> Dict[str, List[str]]:
+        result = await db.execute(select(Department.name, Department.description))
+        documents = {
+            name: [f"{name} {description or ''}"]
+            for name, description in result.all()
+        }
+
+        # Historical summaries labelled by the department of the visited doctor
+        result = await db.execute(
+            select(Department.name, Visit.symptoms_summary)
+            .join(Doctor, Doctor.department_id == Department.id)
+            .join(Visit, Visit.doctor_id == Doctor.id)
+            .where(Visit.symptoms_summary.is_not(None))
+            .order_by(Visit.created_at.desc())
+            .limit(history_limit)
+        )
+        for name, summary in result.all():
+            documents.setdefault(name, []).append(summary)
+
+        return documents
+
+    @staticmethod
+    async def get(db: AsyncSession) -> DepartmentClassifier:
+        classifier = DepartmentClassifierService._classifier
+        if (
+            classifier is None
+            or time.monotonic() - classifier.built_at > DEPARTMENT_CLASSIFIER_REFRESH_SECONDS
+        ):
+            documents = await DepartmentClassifierService.training_documents(db)
+            classifier = DepartmentClassifier.build(documents)
+            DepartmentClassifierService._classifier = classifier
+        return classifier
+
+    @staticmethod
+    async def classify(
+        db: AsyncSession,
+        text: str,
+        allowed_departments: List[str],
+        threshold: float,
+    ) -> Optional[Dict]:
+        """
+        Returns a suggestion only when the local confidence reaches
+        threshold; otherwise None and the caller asks the LLM.
+        """
+        if not DEPARTMENT_CLASSIFIER_ENABLED or not text:
+            return None
+
+        classifier = await DepartmentClassifierService.get(db)
+        result = classifier.classify(text, allowed_departments)
+        if result and result["confidence"] >= threshold:
+            return result
+        return None
+
+    @staticmethod
+    def invalidate() -> None:
+        DepartmentClassifierService._classifier = None
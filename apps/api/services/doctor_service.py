@@ -34,3 +34,22 @@ class DoctorService:
         stmt = select(Doctor).where(Doctor.id == doctor_id)
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
+
+    @staticmethod
+    async def set_availability(
+        db: AsyncSession,
+        doctor_id,
+        is_available: bool,
+    ) -> Doctor | None:
+        doctor = await DoctorService.get_by_id(db, doctor_id)
+        if not doctor:
+            return None
+
+        doctor.is_available = is_available
+        await db.commit()
+
+        # Registration reads doctor lists from the reference cache
+        from services.reference_cache import reference_cache
+        reference_cache.invalidate_doctors(doctor.department_id)
+
+        return doctor
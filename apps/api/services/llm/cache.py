@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.llm.singleflight import llm_singleflight
+
+try:
+    import redis.asyncio as redis_asyncio
+    from redis.exceptions import RedisError
+except ImportError:  # optional shared backend
+    redis_asyncio = None
+    RedisError = OSError
+
+
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()  # memory | redis
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+def normalize_text(text: str) -> str:
+    """
+    "Fever and  cough." and "fever and cough" share one cache entry.
+
+    Letters, combining marks and digits of every script are kept (\\W
+    would split "पेट" on its vowel sign and merge it with "पाट");
+    punctuation, symbols and whitespace collapse to single spaces.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    kept = "".join(ch if unicodedata.category(ch)[0] in "LMN" else " " for ch in text)
+    return " ".join(kept.split())
+
+
+# The prompts route under-18s to Pediatrics, so no band may straddle 18
+PEDIATRIC_AGE_LIMIT = 18
+
+
+def age_band(age: Optional[int]) -> Optional[str]:
+    """
+    Age by decade for cache keys (exact ages would defeat the cache),
+    split at PEDIATRIC_AGE_LIMIT: 17 is "minor:1", 19 is "adult:1".
+    """
+    if age is None:
+        return None
+    group = "minor" if age < PEDIATRIC_AGE_LIMIT else "adult"
+    return f"{group}:{age // 10}"
+
+
+def make_cache_key(
+    kind: str,
+    model: str,
+    text: str,
+    allowed_departments: Optional[List[str]] = None,
+    **extra: Any,
+) -> Optional[str]:
+    """
+    None when nothing is left of the text after normalization: such
+    inputs must not share an entry (or a single-flight call).
+    """
+    text = normalize_text(text or "")
+    if not text:
+        return None
+
+    payload = {
+        "kind": kind,
+        "model": model,
+        "text": text,
+        "departments": sorted(allowed_departments) if allowed_departments else None,
+        **extra,
+    }
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"llm:{kind}:{digest}"
+
+
+# ------------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------------
+
+class CacheBackend(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU with TTL.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared across API workers. Eviction is left to Redis (maxmemory-policy
+    allkeys-lru); entries expire by TTL.
+
+    Redis being down never fails a registration: a failed get is a miss
+    and a failed set is skipped.
+    """
+
+    def __init__(self, url: str = LLM_CACHE_REDIS_URL):
+        if redis_asyncio is None:
+            raise RuntimeError("LLM_CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis_asyncio.from_url(url)
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._client.get(key)
+        except (RedisError, OSError):
+            self.errors += 1
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        try:
+            await self._client.set(key, json.dumps(value), ex=ttl_seconds)
+        except (RedisError, OSError):
+            self.errors += 1
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter("llm:*"):
+            await self._client.delete(key)
+
+
+# ------------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------------
+
+class LLMResponseCache:
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        enabled: bool = not LLM_CACHE_DISABLED,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    async def get_or_compute(
+        self,
+        key: Optional[str],
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        bypass: bool = False,
+    ) -> Any:
+        """
+        Returns the cached value for key, or computes and stores it.
+        None results (failed/invalid LLM output) are never cached.
+        Concurrent misses on one key share a single compute (single-flight).
+        A None key (see make_cache_key) computes uncached and alone.
+        """
+        if bypass or key is None:
+            self.bypassed += 1
+            return await compute()
+
+        kind = key.partition(":")[2].partition(":")[0]
+
+        if not self.enabled:
+            self.bypassed += 1
+            return await llm_singleflight.do(key, compute, kind=kind)
+
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+
+        async def compute_and_store():
+            value = await compute()
+            if value is not None:
+                await self.backend.set(key, value, self.ttl_seconds)
+            return value
+
+        return await llm_singleflight.do(key, compute_and_store, kind=kind)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "backend_errors": getattr(self.backend, "errors", 0),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _build_backend() -> CacheBackend:
+    if LLM_CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    return InMemoryCacheBackend()
+
+
+llm_cache = LLMResponseCache(_build_backend())
@@ -0,0 +1,83 @@
+import os
+import time
+from typing import Any, Dict
+
+
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+class LLMUnavailableError(Exception):
+    """
+    An LLM call was refused (circuit open, no free slot) or failed
+    (deadline, upstream error). Callers degrade instead of failing.
+    """
+
+    def __init__(self, model: str, reason: str):
+        super().__init__(f"LLM {model} unavailable: {reason}")
+        self.model = model
+        self.reason = reason
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one model.
+
+    closed:    calls pass; LLM_BREAKER_FAILURE_THRESHOLD failures in a row open it
+    open:      calls are refused for LLM_BREAKER_RESET_SECONDS
+    half_open: one probe call passes; success closes, failure re-opens
+    """
+
+    STATES = ("closed", "open", "half_open")
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.probing:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def abandon_probe(self) -> None:
+        self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+        }
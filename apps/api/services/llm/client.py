@@ -0,0 +1,192 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from groq import APIError, AsyncGroq
+from dotenv import load_dotenv
+
+from observability import OBSERVABILITY_ENABLED, registry, span
+from services.llm.circuit_breaker import CircuitBreaker, LLMUnavailableError
+load_dotenv()
+
+
+# Point GROQ_BASE_URL at a local fake server for benchmarks (read by the SDK)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# Admission: longest wait for an LLM_MAX_CONCURRENCY slot before refusing
+LLM_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("LLM_ADMISSION_TIMEOUT_SECONDS", "2"))
+# Per-call deadline, SDK retries included
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "10"))
+
+LLM_DURATION = registry.histogram(
+    "llm_request_duration_seconds",
+    "Chat completion latency (SDK retries included)",
+    ("model",),
+)
+LLM_SLOT_WAIT = registry.histogram(
+    "llm_concurrency_wait_seconds",
+    "Time spent waiting for an LLM_MAX_CONCURRENCY slot",
+    ("model",),
+)
+LLM_UNAVAILABLE = registry.counter(
+    "llm_unavailable",
+    "LLM calls refused or failed, by reason (circuit_open, admission_timeout, deadline, upstream_error)",
+    ("model", "reason"),
+)
+
+
+class LLMClientRegistry:
+    """
+    Process-wide Groq clients.
+
+    One AsyncGroq over a pooled httpx client keeps TCP/TLS sessions alive
+    across registrations; a semaphore caps in-flight LLM calls.
+
+    Every async call is bounded: a per-model circuit breaker refuses calls
+    while the model keeps failing, slot waits are capped at
+    LLM_ADMISSION_TIMEOUT_SECONDS and calls at LLM_DEADLINE_SECONDS.
+    All of these raise LLMUnavailableError.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self._async_client: Optional[AsyncGroq] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+        )
+
+    def get_async_client(self) -> AsyncGroq:
+        if self._async_client is None:
+            self._async_client = AsyncGroq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                max_retries=LLM_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    limits=self._limits(),
+                    timeout=LLM_TIMEOUT_SECONDS,
+                ),
+            )
+        return self._async_client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker()
+        return self.breakers[model]
+
+    async def chat(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+    ) -> str:
+        """
+        One chat completion; returns the stripped message content.
+        Raises LLMUnavailableError instead of waiting on a sick upstream.
+        """
+        breaker = self.breaker(model)
+        probe = breaker.state == "half_open"
+        if not breaker.allow():
+            LLM_UNAVAILABLE.inc(model=model, reason="circuit_open")
+            raise LLMUnavailableError(model, "circuit_open")
+
+        try:
+            return await self._admitted_chat(breaker, model, messages, temperature)
+        except asyncio.CancelledError:
+            # A cancelled probe proves nothing; let the next call probe
+            if probe:
+                breaker.abandon_probe()
+            raise
+        except LLMUnavailableError as e:
+            # Neither does a probe that never got a slot
+            if probe and e.reason == "admission_timeout":
+                breaker.abandon_probe()
+            raise
+
+    async def _admitted_chat(
+        self,
+        breaker: CircuitBreaker,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+    ) -> str:
+        # 1️⃣ Admission: a bounded wait for a concurrency slot
+        waiting_since = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), LLM_ADMISSION_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Slots are shared by all models: a full pool says nothing about
+            # this model's health, so the breaker is left alone
+            LLM_UNAVAILABLE.inc(model=model, reason="admission_timeout")
+            raise LLMUnavailableError(model, "admission_timeout")
+        if OBSERVABILITY_ENABLED:
+            LLM_SLOT_WAIT.observe(time.perf_counter() - waiting_since, model=model)
+
+        # 2️⃣ The call itself, under its deadline
+        try:
+            with span("llm.chat", "llm", histogram=LLM_DURATION, labels={"model": model}, model=model):
+                response = await asyncio.wait_for(
+                    self.get_async_client().chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                    ),
+                    LLM_DEADLINE_SECONDS,
+                )
+        except asyncio.TimeoutError:
+            return self._failed(breaker, model, "deadline")
+        except APIError as e:
+            return self._failed(breaker, model, "upstream_error", e)
+        finally:
+            self.semaphore.release()
+
+        breaker.record_success()
+        return response.choices[0].message.content.strip()
+
+    @staticmethod
+    def _failed(breaker: CircuitBreaker, model: str, reason: str, cause=None):
+        breaker.record_failure()
+        LLM_UNAVAILABLE.inc(model=model, reason=reason)
+        raise LLMUnavailableError(model, reason) from cause
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+
+llm_clients = LLMClientRegistry()
+
+
+async def chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+) -> str:
+    return await llm_clients.chat(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+    )
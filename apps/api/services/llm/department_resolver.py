@@ -1,28 +1,111 @@
-import os
 import json
-from typing import Dict, List, Optional
-from groq import Groq
-from dotenv import load_dotenv
-load_dotenv()
-import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from observability import registry
+from services.llm.cache import age_band, llm_cache, make_cache_key
+from services.llm.circuit_breaker import LLMUnavailableError
+from services.llm.client import chat_completion
+from services.llm.hedging import llm_hedger
+
+
+# Cascade tiers, cheapest first; the last one has the final word
+DEPARTMENT_RESOLVER_MODELS = [
+    model.strip()
+    for model in os.getenv(
+        "DEPARTMENT_RESOLVER_MODELS", "llama-3.1-8b-instant,openai/gpt-oss-120b"
+    ).split(",")
+    if model.strip()
+] or ["openai/gpt-oss-120b"]
+# A tier's answer at or above this confidence is accepted (and recommended)
+CONFIDENCE_THRESHOLD = float(os.getenv("DEPARTMENT_CONFIDENCE_THRESHOLD", "0.75"))
+
+TIER_DURATION = registry.histogram(
+    "department_resolver_tier_duration_seconds",
+    "Department resolution latency per cascade tier (cache hits included)",
+    ("model",),
+)
+TIER_OUTCOMES = registry.counter(
+    "department_resolver_tier_outcomes",
+    "Cascade tier answers: accepted, low_confidence, invalid or unavailable",
+    ("model", "outcome"),
+)
+TIER_AGREEMENT = registry.counter(
+    "department_resolver_agreement",
+    "Escalations where the next tier picked the same department as the lower one",
+    ("model", "agreed"),
+)
+
+
+class CascadeStats:
+    """
+    In-process counters behind the cascade metrics, for scripts and
+    tuning CONFIDENCE_THRESHOLD.
+    """
+
+    def __init__(self):
+        self.resolutions = 0
+        self.escalations = 0
+        self.agreed = 0
+        self.compared = 0
+        self.tiers: Dict[str, Dict[str, Any]] = {}
+
+    def record_tier(self, model: str, seconds: float, outcome: str) -> None:
+        tier = self.tiers.setdefault(model, {"calls": 0, "seconds": 0.0, "outcomes": {}})
+        tier["calls"] += 1
+        tier["seconds"] += seconds
+        tier["outcomes"][outcome] = tier["outcomes"].get(outcome, 0) + 1
+        TIER_DURATION.observe(seconds, model=model)
+        TIER_OUTCOMES.inc(model=model, outcome=outcome)
+
+    def record_agreement(self, model: str, agreed: bool) -> None:
+        self.compared += 1
+        self.agreed += agreed
+        TIER_AGREEMENT.inc(model=model, agreed=str(agreed).lower())
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "resolutions": self.resolutions,
+            "escalation_rate": self.escalations / self.resolutions if self.resolutions else 0.0,
+            "agreement_rate": self.agreed / self.compared if self.compared else None,
+            "tiers": {
+                model: {
+                    "calls": tier["calls"],
+                    "mean_ms": tier["seconds"] / tier["calls"] * 1000,
+                    "outcomes": dict(tier["outcomes"]),
+                }
+                for model, tier in self.tiers.items()
+            },
+        }
+
+
+department_cascade_stats = CascadeStats()
 
 
 class DepartmentResolverService:
     """
-    Uses gpt-oss-120b to suggest a department with confidence and reasoning.
+    Suggests a department with confidence and reasoning through a model
+    cascade: each tier in DEPARTMENT_RESOLVER_MODELS answers the same strict
+    JSON prompt, and the first answer at CONFIDENCE_THRESHOLD wins. Low
+    confidence, invalid output or an unavailable model escalate to the next
+    tier.
     """
 
-    MODEL = "openai/gpt-oss-120b"
+    MODELS = DEPARTMENT_RESOLVER_MODELS
+    MODEL = DEPARTMENT_RESOLVER_MODELS[-1]
 
     @staticmethod
-    def _resolve_sync(
+    async def _resolve(
         *,
+        model: str,
         symptom_summary: str,
         age: int | None,
         allowed_departments: List[str],
     ) -> Optional[Dict]:
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
         department_list = ", ".join(allowed_departments)
 
         prompt = f"""
@@ -51,23 +134,28 @@ class DepartmentResolverService:
             {symptom_summary}
             """
 
-        response = client.chat.completions.create(
-            model=DepartmentResolverService.MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You assist with hospital department routing."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0,
-        )
+        async def attempt() -> Optional[Dict]:
+            raw_output = await chat_completion(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You assist with hospital department routing."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0,
+            )
+            return DepartmentResolverService._parse(raw_output, allowed_departments)
 
-        raw_output = response.choices[0].message.content.strip()
+        # Stragglers get a duplicate (LLM_HEDGE_ENABLED); first valid JSON wins
+        return await llm_hedger.run(model, attempt)
 
+    @staticmethod
+    def _parse(raw_output: str, allowed_departments: List[str]) -> Optional[Dict]:
         try:
             parsed = json.loads(raw_output)
         except json.JSONDecodeError:
@@ -85,17 +173,86 @@ class DepartmentResolverService:
         parsed["confidence"] = float(parsed["confidence"])
         return parsed
 
+    @staticmethod
+    async def _resolve_tier(
+        model: str,
+        symptom_summary: str,
+        age: int | None,
+        allowed_departments: List[str],
+        use_cache: bool,
+    ) -> Optional[Dict]:
+        key = make_cache_key(
+            "department",
+            model,
+            symptom_summary,
+            allowed_departments,
+            age_band=age_band(age),
+        )
+        return await llm_cache.get_or_compute(
+            key,
+            lambda: DepartmentResolverService._resolve(
+                model=model,
+                symptom_summary=symptom_summary,
+                age=age,
+                allowed_departments=allowed_departments,
+            ),
+            bypass=not use_cache,
+        )
 
     @staticmethod
     async def resolve(
         symptom_summary: str,
         age: int | None,
         allowed_departments: List[str],
+        *,
+        use_cache: bool = True,
+        models: Optional[List[str]] = None,
     ) -> Optional[Dict]:
-        # ✅ Async-safe wrapper
-        return await asyncio.to_thread(
-            DepartmentResolverService._resolve_sync,
-            symptom_summary=symptom_summary,
-            age=age,
-            allowed_departments=allowed_departments,
-        )
\ No newline at end of file
+        """
+        Returns the first confident answer; otherwise the last valid one
+        (low confidence, so the caller asks the patient to confirm).
+        Raises LLMUnavailableError when no tier produced an answer and the
+        last one was unavailable.
+        """
+        models = models or DepartmentResolverService.MODELS
+        stats = department_cascade_stats
+        stats.resolutions += 1
+        best = None
+        unavailable = None
+
+        for tier, model in enumerate(models):
+            last = tier == len(models) - 1
+            started = time.perf_counter()
+            try:
+                result = await DepartmentResolverService._resolve_tier(
+                    model, symptom_summary, age, allowed_departments, use_cache
+                )
+            except LLMUnavailableError as e:
+                stats.record_tier(model, time.perf_counter() - started, "unavailable")
+                unavailable = e
+                result = None
+            else:
+                unavailable = None
+                if result is None:
+                    outcome = "invalid"
+                elif result["confidence"] >= CONFIDENCE_THRESHOLD:
+                    outcome = "accepted"
+                else:
+                    outcome = "low_confidence"
+                stats.record_tier(model, time.perf_counter() - started, outcome)
+
+            if result is not None:
+                # Did the escalation change the answer?
+                if best is not None:
+                    stats.record_agreement(model, result["department"] == best["department"])
+                best = result
+                if result["confidence"] >= CONFIDENCE_THRESHOLD:
+                    return result
+
+            if tier == 0 and not last:
+                # Counted once per resolution, however many tiers follow
+                stats.escalations += 1
+
+        if best is None and unavailable is not None:
+            raise unavailable
+        return best
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from observability import registry
+
+
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+# The duplicate is sent once the first attempt is slower than this percentile
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "50"))
+# Latency samples kept per model; no hedging until LLM_HEDGE_MIN_SAMPLES are in
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "500"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Budget: each call earns this many hedges (0.1 = at most ~10% extra requests)
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1"))
+LLM_HEDGE_BUDGET_BURST = float(os.getenv("LLM_HEDGE_BUDGET_BURST", "10"))
+
+HEDGE_CALLS = registry.counter(
+    "llm_hedge_calls",
+    "Hedged LLM calls by outcome: fast (no hedge needed), primary_won, hedge_won, "
+    "no_valid (both attempts failed), over_budget (slow but no budget left), "
+    "warming_up (too few latency samples)",
+    ("model", "outcome"),
+)
+HEDGE_DELAY = registry.histogram(
+    "llm_hedge_delay_seconds",
+    "Delay after which a duplicate was sent",
+    ("model",),
+)
+
+
+class Hedger:
+    """
+    Hedged requests: when an attempt has not answered within the rolling
+    LLM_HEDGE_PERCENTILE latency of its model, a duplicate is sent. The
+    first valid answer wins and the other attempt is cancelled.
+
+    Duplicates are capped by a budget that refills with traffic, so a
+    slow upstream cannot double its own load. Each attempt still goes
+    through admission, deadline and circuit breaker in the client.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = LLM_HEDGE_ENABLED,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        min_delay_ms: float = LLM_HEDGE_MIN_DELAY_MS,
+        window: int = LLM_HEDGE_WINDOW,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        budget_ratio: float = LLM_HEDGE_BUDGET_RATIO,
+        budget_burst: float = LLM_HEDGE_BUDGET_BURST,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay_ms / 1000
+        self.window = window
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.credit = 0.0
+        self.calls = 0
+        self.outcomes: Dict[str, int] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def delay(self, model: str) -> Optional[float]:
+        samples = self._latencies.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(ordered[index], self.min_delay)
+
+    def observe(self, model: str, seconds: float) -> None:
+        samples = self._latencies.get(model)
+        if samples is None:
+            samples = self._latencies[model] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    async def run(
+        self,
+        model: str,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        valid: Callable[[Any], bool] = lambda result: result is not None,
+    ) -> Any:
+        if not self.enabled:
+            return await fn()
+
+        self.calls += 1
+        self.credit = min(self.credit + self.budget_ratio, self.budget_burst)
+        delay = self.delay(model)
+
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(fn())
+        attempts = {primary: started}
+        try:
+            # 1️⃣ Give the first attempt its percentile delay
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or delay is None:
+                result = await primary
+                self.observe(model, time.perf_counter() - started)
+                self._record(model, "fast" if delay is not None else "warming_up")
+                return result
+
+            if self.credit < 1:
+                self._record(model, "over_budget")
+                result = await primary
+                self.observe(model, time.perf_counter() - started)
+                return result
+
+            # 2️⃣ Slow: send the duplicate, first valid answer wins
+            self.credit -= 1
+            HEDGE_DELAY.observe(delay, model=model)
+            hedge = asyncio.ensure_future(fn())
+            attempts[hedge] = time.perf_counter()
+            return await self._race(model, primary, attempts, valid)
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+                    # A cancelled attempt was at least this slow
+                    self.observe(model, time.perf_counter() - attempts[attempt])
+
+    async def _race(self, model, primary, attempts, valid) -> Any:
+        pending = set(attempts)
+        fallback = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                self.observe(model, time.perf_counter() - attempts[attempt])
+                if attempt.exception() is None and valid(attempt.result()):
+                    self._record(model, "primary_won" if attempt is primary else "hedge_won")
+                    return attempt.result()
+                if fallback is None or fallback.exception() is not None:
+                    fallback = attempt
+
+        # Neither answer was valid: same result as an unhedged call would give
+        self._record(model, "no_valid")
+        return fallback.result()
+
+    def _record(self, model: str, outcome: str) -> None:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        HEDGE_CALLS.inc(model=model, outcome=outcome)
+
+    def reset(self) -> None:
+        self.credit = 0.0
+        self.calls = 0
+        self.outcomes = {}
+        self._latencies = {}
+
+    def stats(self) -> Dict[str, Any]:
+        hedged = sum(self.outcomes.get(o, 0) for o in ("primary_won", "hedge_won", "no_valid"))
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedge_rate": hedged / self.calls if self.calls else 0.0,
+            "outcomes": dict(self.outcomes),
+            "delay_ms": {
+                model: (self.delay(model) or 0) * 1000 for model in self._latencies
+            },
+        }
+
+
+llm_hedger = Hedger()
@@ -0,0 +1,125 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from observability import registry
+
+
+LLM_SINGLEFLIGHT_ENABLED = os.getenv("LLM_SINGLEFLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+# Deadline of one shared call, counted from its start (0 = none)
+LLM_SINGLEFLIGHT_TIMEOUT_SECONDS = float(os.getenv("LLM_SINGLEFLIGHT_TIMEOUT_SECONDS", "60"))
+
+SINGLEFLIGHT_CALLS = registry.counter(
+    "llm_singleflight_calls",
+    "LLM calls by single-flight role: leader (went upstream) or coalesced (shared a leader's result)",
+    ("kind", "role"),
+)
+SINGLEFLIGHT_TIMEOUTS = registry.counter(
+    "llm_singleflight_timeouts",
+    "Shared LLM calls abandoned at their deadline",
+    ("kind",),
+)
+
+
+class _Flight:
+
+    def __init__(self, task: asyncio.Task, deadline: Optional[float]):
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-flight registry: concurrent calls with the same key await one shared
+    execution instead of each going upstream. Nothing is kept after the
+    call finishes (that is the response cache's job).
+
+    The shared call runs in its own task:
+    - a cancelled caller only stops waiting; the call is cancelled when
+      its last waiter leaves
+    - every waiter times out at the flight's deadline; the call is then
+      cancelled and the next caller starts a fresh one
+    - exceptions reach every waiter
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = LLM_SINGLEFLIGHT_TIMEOUT_SECONDS,
+        enabled: bool = LLM_SINGLEFLIGHT_ENABLED,
+    ):
+        self.timeout_seconds = timeout_seconds or None
+        self.enabled = enabled
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self._flights: Dict[str, _Flight] = {}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        kind: str = "",
+    ) -> Any:
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout_seconds if self.timeout_seconds else None
+            flight = _Flight(asyncio.ensure_future(fn()), deadline)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finished(key, flight))
+            self.leaders += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, role="leader")
+        else:
+            self.coalesced += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, role="coalesced")
+
+        flight.waiters += 1
+        try:
+            if flight.deadline is None:
+                return await asyncio.shield(flight.task)
+            remaining = flight.deadline - asyncio.get_running_loop().time()
+            return await asyncio.wait_for(asyncio.shield(flight.task), max(remaining, 0))
+        except asyncio.TimeoutError:
+            if not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+                self.timeouts += 1
+                SINGLEFLIGHT_TIMEOUTS.inc(kind=kind)
+            raise
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "coalescing_ratio": self.coalesced / calls if calls else 0.0,
+        }
+
+    def _finished(self, key: str, flight: _Flight) -> None:
+        self._forget(key, flight)
+        # Mark the exception retrieved even if every waiter left
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+llm_singleflight = SingleFlight()
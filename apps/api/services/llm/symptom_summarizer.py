@@ -1,17 +1,12 @@
-import os
-from groq import Groq
-from dotenv import load_dotenv
-load_dotenv()
-import asyncio
+from services.llm.cache import llm_cache, make_cache_key
+from services.llm.client import chat_completion
 
 class SymptomSummarizerService:
 
     MODEL = "llama-3.1-8b-instant"
 
     @staticmethod
-    def _summarize_sync(symptoms_raw: str) -> str:
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
+    async def _summarize(symptoms_raw: str) -> str:
         prompt = f"""
             Summarize the following patient symptoms clearly and concisely.
             Do NOT diagnose.
@@ -22,7 +17,7 @@ class SymptomSummarizerService:
             {symptoms_raw}
             """
 
-        response = client.chat.completions.create(
+        return await chat_completion(
             model=SymptomSummarizerService.MODEL,
             messages=[
                 {
@@ -37,13 +32,15 @@ class SymptomSummarizerService:
             temperature=0.2,
         )
 
-        return response.choices[0].message.content.strip()
-    
     @staticmethod
-    async def summarize(symptoms_raw: str) -> str:
-        # ✅ Async-safe wrapper
-        return await asyncio.to_thread(
-            SymptomSummarizerService._summarize_sync,
+    async def summarize(symptoms_raw: str, *, use_cache: bool = True) -> str:
+        key = make_cache_key(
+            "summary",
+            SymptomSummarizerService.MODEL,
             symptoms_raw,
         )
-        
+        return await llm_cache.get_or_compute(
+            key,
+            lambda: SymptomSummarizerService._summarize(symptoms_raw),
+            bypass=not use_cache,
+        )
@@ -0,0 +1,108 @@
+import os
+from typing import Dict, List, Optional
+
+from services.llm.cache import age_band, llm_cache, make_cache_key
+from services.llm.client import chat_completion
+from services.llm.department_resolver import DepartmentResolverService
+
+
+# "two_stage": summarize, then resolve (two LLM round trips)
+# "fused":     one structured call returns summary + department
+TRIAGE_MODE = os.getenv("TRIAGE_MODE", "two_stage").lower()
+
+
+class TriageService:
+    """
+    Fused triage: summary, department, confidence and reasoning
+    from one gpt-oss-120b call.
+    """
+
+    MODEL = DepartmentResolverService.MODEL
+
+    @staticmethod
+    async def _triage(
+        *,
+        symptoms_raw: str,
+        age: int | None,
+        allowed_departments: List[str],
+    ) -> Optional[Dict]:
+        department_list = ", ".join(allowed_departments)
+
+        prompt = f"""
+            You are a hospital triage assistant.
+
+            Choose ONE department from this list ONLY:
+            {department_list}
+
+            Return STRICT JSON in the following format:
+
+            {{
+            "summary": "<clear, concise summary of the symptoms>",
+            "department": "<department name>",
+            "confidence": <float between 0 and 1>,
+            "reasoning": ["short bullet point", "short bullet point"]
+            }}
+
+            Rules:
+            - Summary: do not diagnose, do not give medical advice
+            - Do not invent departments
+            - If age below 18, choose 'Pediatrics'
+            - If unsure, lower the confidence
+            - Max 3 reasoning bullets
+
+            Patient age: {age}
+            Symptoms:
+            {symptoms_raw}
+            """
+
+        raw_output = await chat_completion(
+            model=TriageService.MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You summarize patient symptoms and assist with hospital department routing."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0,
+        )
+
+        # Same strict checks as the two-stage resolver, plus the summary
+        parsed = DepartmentResolverService._parse(raw_output, allowed_departments)
+        if not parsed:
+            return None
+
+        summary = parsed.get("summary")
+        if not isinstance(summary, str) or not summary.strip():
+            return None
+
+        parsed["summary"] = summary.strip()
+        return parsed
+
+    @staticmethod
+    async def triage(
+        symptoms_raw: str,
+        age: int | None,
+        allowed_departments: List[str],
+        *,
+        use_cache: bool = True,
+    ) -> Optional[Dict]:
+        key = make_cache_key(
+            "triage",
+            TriageService.MODEL,
+            symptoms_raw,
+            allowed_departments,
+            age_band=age_band(age),
+        )
+        return await llm_cache.get_or_compute(
+            key,
+            lambda: TriageService._triage(
+                symptoms_raw=symptoms_raw,
+                age=age,
+                allowed_departments=allowed_departments,
+            ),
+            bypass=not use_cache,
+        )
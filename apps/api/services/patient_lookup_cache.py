@@ -0,0 +1,152 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.doctor_queue import DoctorQueue
+from models.patient import Patient
+from models.queue_entry import QueueEntry
+from models.visit import Visit
+
+
+PATIENT_LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv("PATIENT_LOOKUP_CACHE_MAX_ENTRIES", "50000"))
+PATIENT_LOOKUP_TTL_SECONDS = int(os.getenv("PATIENT_LOOKUP_TTL_SECONDS", "3600"))
+# Unknown numbers: short, since another API worker may register the caller
+PATIENT_LOOKUP_NEGATIVE_TTL_SECONDS = int(os.getenv("PATIENT_LOOKUP_NEGATIVE_TTL_SECONDS", "60"))
+
+# Warm the cache with today's booked patients at startup and after bulk intake
+PATIENT_LOOKUP_PRELOAD = os.getenv("PATIENT_LOOKUP_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+# Rows per IN (...) when preloading by patient id
+PRELOAD_CHUNK = 1000
+
+
+@dataclass(frozen=True)
+class PatientSummary:
+    id: UUID
+    full_name: str
+    age: Optional[int]
+
+
+class PatientLookupCache:
+    """
+    Per-process LRU of phone number -> PatientSummary with TTL eviction.
+    A None value is a negative entry: the number is known to be unregistered.
+
+    New patients are installed by PatientService.create once their row
+    commits; installs bump the version so a lookup that raced one does not
+    overwrite it with an older (e.g. replica) miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PATIENT_LOOKUP_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = PATIENT_LOOKUP_TTL_SECONDS,
+        negative_ttl_seconds: int = PATIENT_LOOKUP_NEGATIVE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.version = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[float, Optional[PatientSummary]]]" = OrderedDict()
+
+    async def lookup(self, db: AsyncSession, phone_number: str) -> Optional[PatientSummary]:
+        item = self._data.get(phone_number)
+        if item is not None:
+            expires_at, summary = item
+            if expires_at >= time.monotonic():
+                self._data.move_to_end(phone_number)
+                if summary is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return summary
+            del self._data[phone_number]
+
+        self.misses += 1
+        version = self.version
+        result = await db.execute(
+            select(Patient.id, Patient.full_name, Patient.age)
+            .where(Patient.contact_number == phone_number)
+        )
+        row = result.one_or_none()
+        summary = PatientSummary(*row) if row else None
+
+        if version == self.version:
+            self._store(phone_number, summary)
+        return summary
+
+    def put(self, phone_number: str, summary: PatientSummary) -> None:
+        self.version += 1
+        self._store(phone_number, summary)
+
+    def invalidate(self, phone_number: Optional[str] = None) -> None:
+        self.version += 1
+        if phone_number is None:
+            self._data.clear()
+        else:
+            self._data.pop(phone_number, None)
+
+    async def preload(
+        self,
+        db: AsyncSession,
+        queue_date: Optional[date] = None,
+        patient_ids: Optional[Iterable[UUID]] = None,
+    ) -> int:
+        """
+        Bulk-loads patients queued for queue_date, or the given patient ids,
+        so their first lookup is a hit. Returns the number of entries loaded.
+        """
+        columns = select(Patient.contact_number, Patient.id, Patient.full_name, Patient.age)
+
+        if patient_ids is not None:
+            ids = list(dict.fromkeys(patient_ids))
+            statements = [
+                columns.where(Patient.id.in_(ids[i:i + PRELOAD_CHUNK]))
+                for i in range(0, len(ids), PRELOAD_CHUNK)
+            ]
+        else:
+            statements = [
+                columns.distinct()
+                .join(Visit, Visit.patient_id == Patient.id)
+                .join(QueueEntry, QueueEntry.visit_id == Visit.id)
+                .join(DoctorQueue, DoctorQueue.id == QueueEntry.queue_id)
+                .where(DoctorQueue.queue_date == (queue_date or datetime.utcnow().date()))
+            ]
+
+        loaded = 0
+        for statement in statements:
+            result = await db.execute(statement)
+            for phone_number, *fields in result.all():
+                self._store(phone_number, PatientSummary(*fields))
+                loaded += 1
+        return loaded
+
+    def _store(self, phone_number: str, summary: Optional[PatientSummary]) -> None:
+        ttl = self.ttl_seconds if summary is not None else self.negative_ttl_seconds
+        self._data[phone_number] = (time.monotonic() + ttl, summary)
+        self._data.move_to_end(phone_number)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+patient_lookup_cache = PatientLookupCache()
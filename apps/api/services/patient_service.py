@@ -1,8 +1,10 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
 
+from db.session import on_commit
 from models.patient import Patient
+from services.patient_lookup_cache import PatientSummary, patient_lookup_cache
 
 
 class PatientService:
@@ -16,6 +18,17 @@ class PatientService:
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def lookup_by_phone(
+        db: AsyncSession,
+        phone_number: str,
+    ) -> Optional[PatientSummary]:
+        """
+        Cached get_by_phone for callers that only need id, name and age;
+        unknown numbers are cached too (negative entries).
+        """
+        return await patient_lookup_cache.lookup(db, phone_number)
+
     @staticmethod
     async def create(
         db: AsyncSession,
@@ -24,16 +37,30 @@ class PatientService:
         age: int,
         contact_number: str,
         abha_id: Optional[str] = None,
+        commit: bool = True,
     ) -> Patient:
-        patient = Patient(
-            full_name=full_name,
-            age=age,
-            contact_number=contact_number,
-            abha_id=abha_id,
+        """
+        Generated columns come back via RETURNING (no refresh round trip).
+        commit=False leaves the row in the caller's unit of work.
+        """
+        stmt = (
+            insert(Patient)
+            .values(
+                full_name=full_name,
+                age=age,
+                contact_number=contact_number,
+                abha_id=abha_id,
+            )
+            .returning(Patient)
         )
+        patient = await db.scalar(stmt)
+
+        if commit:
+            await db.commit()
 
-        db.add(patient)
-        await db.commit()
-        await db.refresh(patient)
+        # Replaces a cached "unknown number" once the row is durable
+        # (the caller's commit under a unit of work)
+        summary = PatientSummary(patient.id, patient.full_name, patient.age)
+        on_commit(db, lambda: patient_lookup_cache.put(contact_number, summary))
 
         return patient
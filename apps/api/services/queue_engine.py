@@ -0,0 +1,380 @@
+import asyncio
+import heapq
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.doctor_queue import DoctorQueue
+from models.queue_entry import QueueEntry
+
+
+# Statuses call_next may pick (present first, then by token)
+SELECTABLE_STATUSES = ("present", "waiting", "called")
+
+# Statuses that count as "ahead" of a patient in the patient view
+AHEAD_STATUSES = ("waiting", "present", "called")
+
+# Statuses shown in the doctor's "next waiting" list
+LISTED_STATUSES = ("present", "waiting")
+
+# Statuses that consume shift capacity at intake
+CAPACITY_STATUSES = ("waiting", "present", "in_consultation")
+
+# Rebuild a resident queue from the DB after this many seconds.
+# Bounds drift when several API workers mutate the same queue.
+QUEUE_ENGINE_MAX_AGE_SECONDS = float(os.getenv("QUEUE_ENGINE_MAX_AGE_SECONDS", "300"))
+
+
+@dataclass
+class LiveEntry:
+    visit_id: UUID
+    token_number: int
+    status: str
+
+
+class _TokenIndex:
+    """
+    Fenwick tree over token numbers.
+    Counts members with token <= t and finds the k-th smallest in O(log n).
+    """
+
+    def __init__(self):
+        self._tree = [0] * 64
+        self.size = 0
+
+    def _grow(self, token: int) -> None:
+        capacity = len(self._tree)
+        while token >= capacity:
+            capacity *= 2
+        if capacity == len(self._tree):
+            return
+
+        # Rebuild: Fenwick layout depends on capacity only through bounds,
+        # so copying point values is enough.
+        values = [self._point(i) for i in range(1, len(self._tree))]
+        self._tree = [0] * capacity
+        for i, value in enumerate(values, start=1):
+            if value:
+                self._update(i, value)
+
+    def _point(self, token: int) -> int:
+        return self._prefix(token) - self._prefix(token - 1)
+
+    def _update(self, token: int, delta: int) -> None:
+        while token < len(self._tree):
+            self._tree[token] += delta
+            token += token & -token
+
+    def _prefix(self, token: int) -> int:
+        token = min(token, len(self._tree) - 1)
+        total = 0
+        while token > 0:
+            total += self._tree[token]
+            token -= token & -token
+        return total
+
+    def add(self, token: int) -> None:
+        self._grow(token)
+        self._update(token, 1)
+        self.size += 1
+
+    def remove(self, token: int) -> None:
+        self._update(token, -1)
+        self.size -= 1
+
+    def count_below(self, token: int) -> int:
+        return self._prefix(token - 1)
+
+    def kth(self, k: int) -> int:
+        """
+        Token of the k-th smallest member (1-based).
+        """
+        position = 0
+        step = 1
+        while step * 2 < len(self._tree):
+            step *= 2
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] < k:
+                position = nxt
+                k -= self._tree[nxt]
+            step //= 2
+        return position + 1
+
+
+class LiveQueue:
+    """
+    Resident view of one doctor's queue for one day.
+    Mirrors queue_entries; the DB stays the source of truth.
+    """
+
+    def __init__(self, queue_id: UUID, doctor_id: UUID, queue_date: date):
+        self.queue_id = queue_id
+        self.doctor_id = doctor_id
+        self.queue_date = queue_date
+        self.loaded_at = time.monotonic()
+
+        self.entries: Dict[UUID, LiveEntry] = {}
+        self.counts: Dict[str, int] = {}
+        self.max_token = 0
+
+        self._by_token: Dict[int, LiveEntry] = {}
+        self._present: List[Tuple[int, UUID]] = []
+        self._pending: List[Tuple[int, UUID]] = []
+        self._called: Dict[int, LiveEntry] = {}
+        self._ahead = _TokenIndex()
+        self._listed = _TokenIndex()
+
+    # ------------------------------------------------------------------
+    # Mutations (call after the matching DB write commits)
+    # ------------------------------------------------------------------
+    def add(self, visit_id: UUID, token_number: int, status: str) -> None:
+        if visit_id in self.entries:
+            self.set_status(visit_id, status)
+            return
+
+        entry = LiveEntry(visit_id=visit_id, token_number=token_number, status=status)
+        self.entries[visit_id] = entry
+        self._by_token[token_number] = entry
+        self.max_token = max(self.max_token, token_number)
+        self._enter(entry)
+
+    def set_status(self, visit_id: UUID, status: str) -> None:
+        entry = self.entries.get(visit_id)
+        if entry is None or entry.status == status:
+            return
+
+        self._leave(entry)
+        entry.status = status
+        self._enter(entry)
+
+    def _enter(self, entry: LiveEntry) -> None:
+        self.counts[entry.status] = self.counts.get(entry.status, 0) + 1
+
+        if entry.status == "present":
+            heapq.heappush(self._present, (entry.token_number, entry.visit_id))
+        elif entry.status in ("waiting", "called"):
+            heapq.heappush(self._pending, (entry.token_number, entry.visit_id))
+
+        if entry.status == "called":
+            self._called[entry.token_number] = entry
+        if entry.status in AHEAD_STATUSES:
+            self._ahead.add(entry.token_number)
+        if entry.status in LISTED_STATUSES:
+            self._listed.add(entry.token_number)
+
+    def _leave(self, entry: LiveEntry) -> None:
+        # Heaps are cleaned lazily in peek_next()
+        self.counts[entry.status] -= 1
+
+        if entry.status == "called":
+            self._called.pop(entry.token_number, None)
+        if entry.status in AHEAD_STATUSES:
+            self._ahead.remove(entry.token_number)
+        if entry.status in LISTED_STATUSES:
+            self._listed.remove(entry.token_number)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def count(self, *statuses: str) -> int:
+        return sum(self.counts.get(s, 0) for s in statuses)
+
+    def matches(self, counts: Dict[str, int]) -> bool:
+        """
+        True when this view agrees with a queue's per-status counters.
+        """
+        return all(self.counts.get(status, 0) == n for status, n in counts.items())
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+    def peek_next(self) -> Optional[LiveEntry]:
+        """
+        Next patient to call: present first, then lowest token.
+        """
+        for heap, statuses in (
+            (self._present, ("present",)),
+            (self._pending, ("waiting", "called")),
+        ):
+            while heap:
+                token, visit_id = heap[0]
+                entry = self.entries.get(visit_id)
+                if entry is not None and entry.status in statuses:
+                    return entry
+                heapq.heappop(heap)
+        return None
+
+    def called_entry(self) -> Optional[LiveEntry]:
+        if not self._called:
+            return None
+        return self._called[min(self._called)]
+
+    def next_waiting(self, limit: int = 3) -> List[LiveEntry]:
+        """
+        Lowest-token present/waiting entries.
+        """
+        return [
+            self._by_token[self._listed.kth(k)]
+            for k in range(1, min(limit, self._listed.size) + 1)
+        ]
+
+    def patients_ahead(self, token_number: int) -> int:
+        return self._ahead.count_below(token_number)
+
+
+class QueueEngine:
+    """
+    Registry of resident LiveQueues keyed by (doctor_id, queue_date).
+    Loaded lazily from the DB, then kept in step by QueueService.
+    """
+
+    def __init__(self):
+        self._queues: Dict[Tuple[UUID, date], LiveQueue] = {}
+        self._by_queue_id: Dict[UUID, LiveQueue] = {}
+        self._locks: Dict[Tuple[UUID, date], asyncio.Lock] = {}
+        # queue_id -> True once a mutation raced the in-flight load
+        self._loading: Dict[UUID, bool] = {}
+
+    def get(self, doctor_id: UUID, queue_date: date) -> Optional[LiveQueue]:
+        return self._queues.get((doctor_id, queue_date))
+
+    async def load(
+        self,
+        db: AsyncSession,
+        queue: DoctorQueue,
+        install: bool = True,
+        fresh: bool = False,
+    ) -> LiveQueue:
+        """
+        install=False (reads from a lagging replica): use the resident queue
+        if there is one, else build a throwaway snapshot that is not kept.
+        fresh=True: ignore the resident queue and read the DB again.
+        """
+        key = (queue.doctor_id, queue.queue_date)
+        live = self._queues.get(key)
+        if not fresh and live is not None and live.queue_id == queue.id and not self._expired(live):
+            return live
+
+        if not install:
+            return await self._read(db, queue)
+
+        seen = live
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            live = self._queues.get(key)
+            # For fresh: a queue rebuilt by someone else while we waited will do
+            if (
+                live is not None
+                and live.queue_id == queue.id
+                and not self._expired(live)
+                and (not fresh or live is not seen)
+            ):
+                return live
+            return await self.rebuild(db, queue)
+
+    async def rebuild(self, db: AsyncSession, queue: DoctorQueue) -> LiveQueue:
+        """
+        Reconciliation path: rebuild the resident queue from queue_entries.
+        """
+        self._loading[queue.id] = False
+        try:
+            live = await self._read(db, queue)
+            stale = self._loading.get(queue.id, False)
+        finally:
+            self._loading.pop(queue.id, None)
+
+        # A write committed while we were reading: serve this snapshot once
+        # but do not keep it resident.
+        if not stale:
+            self._install(live)
+        return live
+
+    @staticmethod
+    def _entries_statement(queue_id: UUID):
+        return select(
+            QueueEntry.visit_id,
+            QueueEntry.token_number,
+            QueueEntry.status,
+        ).where(QueueEntry.queue_id == queue_id)
+
+    @staticmethod
+    def _day_statement(queue_date: date):
+        return select(DoctorQueue).where(DoctorQueue.queue_date == queue_date)
+
+    @staticmethod
+    async def _read(db: AsyncSession, queue: DoctorQueue) -> LiveQueue:
+        result = await db.execute(QueueEngine._entries_statement(queue.id))
+
+        live = LiveQueue(queue.id, queue.doctor_id, queue.queue_date)
+        for visit_id, token_number, status in result.all():
+            live.add(visit_id, token_number, status)
+        return live
+
+    async def reconcile(self, db: AsyncSession, queue_date: date) -> int:
+        """
+        Rebuild every queue for a date, e.g. after a restart.
+        Returns the number of queues loaded.
+        """
+        result = await db.execute(QueueEngine._day_statement(queue_date))
+        queues = result.scalars().all()
+        for queue in queues:
+            await self.rebuild(db, queue)
+        return len(queues)
+
+    def discard(self, doctor_id: UUID, queue_date: date) -> None:
+        live = self._queues.pop((doctor_id, queue_date), None)
+        if live is not None:
+            self._by_queue_id.pop(live.queue_id, None)
+
+    def clear(self) -> None:
+        self._queues.clear()
+        self._by_queue_id.clear()
+
+    # ------------------------------------------------------------------
+    # Mutations mirrored from committed DB writes
+    # ------------------------------------------------------------------
+    def add_entry(
+        self,
+        queue_id: UUID,
+        visit_id: UUID,
+        token_number: int,
+        status: str = "waiting",
+    ) -> None:
+        live = self._resident(queue_id)
+        if live is not None:
+            live.add(visit_id, token_number, status)
+
+    def set_status(self, queue_id: UUID, visit_id: UUID, status: str) -> None:
+        live = self._resident(queue_id)
+        if live is not None:
+            live.set_status(visit_id, status)
+
+    def _resident(self, queue_id: UUID) -> Optional[LiveQueue]:
+        if queue_id in self._loading:
+            self._loading[queue_id] = True
+        return self._by_queue_id.get(queue_id)
+
+    def _install(self, live: LiveQueue) -> None:
+        previous = self._queues.get((live.doctor_id, live.queue_date))
+        if previous is not None:
+            self._by_queue_id.pop(previous.queue_id, None)
+        self._queues[(live.doctor_id, live.queue_date)] = live
+        self._by_queue_id[live.queue_id] = live
+
+    @staticmethod
+    def _expired(live: LiveQueue) -> bool:
+        return (
+            QUEUE_ENGINE_MAX_AGE_SECONDS > 0
+            and time.monotonic() - live.loaded_at > QUEUE_ENGINE_MAX_AGE_SECONDS
+        )
+
+
+queue_engine = QueueEngine()
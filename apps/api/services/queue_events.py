@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+
+# Events buffered per subscriber before the oldest is dropped
+QUEUE_STREAM_BUFFER = int(os.getenv("QUEUE_STREAM_BUFFER", "32"))
+
+
+@dataclass
+class QueueHeader:
+    """
+    DoctorQueue fields the status views need, captured at commit time.
+    """
+    queue_open: bool
+    current_token: Optional[int]
+    current_visit_id: Optional[UUID]
+    avg_consult_time_minutes: int
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class QueueEvent:
+    event_type: str  # last_event_type recorded by QueueService
+    doctor_id: UUID
+    queue_date: date
+    header: QueueHeader
+    visit_id: Optional[UUID] = None
+    token_number: Optional[int] = None
+    reason: Optional[str] = None
+    emitted_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass(eq=False)
+class Subscription:
+    key: Tuple[UUID, date]
+    role: str
+    visit_id: Optional[UUID]
+    messages: asyncio.Queue
+    dropped: int = 0
+
+
+# Renders the role view for (role, visit_id); None when the view is unavailable
+StatusRenderer = Callable[[str, Optional[UUID]], Optional[Dict[str, Any]]]
+
+
+class QueueEventBroker:
+    """
+    In-process pub/sub for queue transitions, one channel per
+    (doctor_id, queue_date). Transitions committed on other workers
+    arrive through services.queue_relay.
+
+    QueueService publishes once per committed transition. Each message is
+    rendered and serialized once per role (once per visit for patients) and
+    the same string is handed to every matching subscriber, so fan-out cost
+    is a put_nowait per subscriber.
+    """
+
+    def __init__(self, buffer_size: int = QUEUE_STREAM_BUFFER):
+        self.buffer_size = buffer_size
+        self._channels: Dict[Tuple[UUID, date], Set[Subscription]] = {}
+        self._sequence = 0
+
+    def subscribe(
+        self,
+        doctor_id: UUID,
+        queue_date: date,
+        role: str,
+        visit_id: Optional[UUID] = None,
+    ) -> Subscription:
+        key = (doctor_id, queue_date)
+        subscription = Subscription(
+            key=key,
+            role=role,
+            visit_id=visit_id,
+            messages=asyncio.Queue(maxsize=self.buffer_size),
+        )
+        self._channels.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self._channels.get(subscription.key)
+        if channel is None:
+            return
+        channel.discard(subscription)
+        if not channel:
+            self._channels.pop(subscription.key, None)
+
+    def discard_pending(self, subscription: Subscription) -> int:
+        """
+        Drops the events queued so far, e.g. ones a fresh snapshot already
+        includes. Returns how many were dropped.
+        """
+        discarded = 0
+        while not subscription.messages.empty():
+            subscription.messages.get_nowait()
+            discarded += 1
+        return discarded
+
+    def subscriber_count(self, doctor_id: UUID, queue_date: date) -> int:
+        return len(self._channels.get((doctor_id, queue_date), ()))
+
+    def channel_keys(self) -> List[Tuple[UUID, date]]:
+        """
+        (doctor_id, queue_date) of every queue with a subscriber.
+        """
+        return list(self._channels)
+
+    def publish(self, event: QueueEvent, render: StatusRenderer) -> int:
+        """
+        Fans an event out to every subscriber of its queue.
+        Returns the number of subscribers reached.
+        """
+        channel = self._channels.get((event.doctor_id, event.queue_date))
+        if not channel:
+            return 0
+
+        self._sequence += 1
+        base = {
+            "event": event.event_type,
+            "sequence": self._sequence,
+            "visit_id": str(event.visit_id) if event.visit_id else None,
+            "token_number": event.token_number,
+            "reason": event.reason,
+            "emitted_at": event.emitted_at.isoformat(),
+        }
+
+        rendered: Dict[Tuple[str, Optional[UUID]], str] = {}
+        for subscription in list(channel):
+            view_key = (
+                subscription.role,
+                subscription.visit_id if subscription.role == "patient" else None,
+            )
+            message = rendered.get(view_key)
+            if message is None:
+                message = json.dumps({**base, "status": render(*view_key)}, default=str)
+                rendered[view_key] = message
+
+            self._offer(subscription, message)
+
+        return len(channel)
+
+    @staticmethod
+    def _offer(subscription: Subscription, message: str) -> None:
+        # Slow consumer: drop the oldest event rather than block the publisher
+        if subscription.messages.full():
+            subscription.messages.get_nowait()
+            subscription.dropped += 1
+        subscription.messages.put_nowait(message)
+
+
+queue_event_broker = QueueEventBroker()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from db.session import DATABASE_URL
+
+
+QUEUE_RELAY_ENABLED = os.getenv("QUEUE_RELAY_ENABLED", "true").lower() in ("1", "true", "yes")
+# LISTEN needs a session-level connection: point this at Postgres directly
+# when POSTGRES_URI goes through PgBouncer in transaction pooling mode
+QUEUE_RELAY_URI = os.getenv("QUEUE_RELAY_URI") or DATABASE_URL
+QUEUE_RELAY_CHANNEL = os.getenv("QUEUE_RELAY_CHANNEL", "queue_events")
+# Liveness ping on the listening connection, and the wait before reconnecting
+QUEUE_RELAY_PING_SECONDS = float(os.getenv("QUEUE_RELAY_PING_SECONDS", "15"))
+QUEUE_RELAY_RETRY_SECONDS = float(os.getenv("QUEUE_RELAY_RETRY_SECONDS", "2"))
+
+# Receives an event committed by another worker
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+# Called after (re)connecting: events sent meanwhile were missed
+ResyncHandler = Callable[[], Awaitable[None]]
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class QueueEventRelay:
+    """
+    Cross-worker fan-out of queue transitions over Postgres LISTEN/NOTIFY.
+
+    Each worker publishes its committed transitions to its own stream
+    subscribers and NOTIFYs the others on one dedicated connection (kept
+    out of the pool). Workers ignore their own notifications; for the
+    others' they refresh the resident queue and publish to local
+    subscribers. Delivery is best effort: after a reconnect every
+    subscribed queue is resynced from the DB.
+    """
+
+    def __init__(
+        self,
+        url: str = QUEUE_RELAY_URI,
+        channel: str = QUEUE_RELAY_CHANNEL,
+        enabled: bool = QUEUE_RELAY_ENABLED,
+    ):
+        self.dsn = _asyncpg_dsn(url)
+        self.channel = channel
+        self.enabled = enabled
+        # Tells this worker's notifications apart from the others'
+        self.origin = uuid.uuid4().hex
+        self.sent = 0
+        self.received = 0
+        self.failed = 0
+        self._conn: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._on_event: Optional[EventHandler] = None
+        self._on_resync: Optional[ResyncHandler] = None
+        self._handlers: set = set()
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+    def notify(self, event: Dict[str, Any]) -> None:
+        """
+        Sends a committed transition to the other workers without waiting.
+        Dropped (and counted) while disconnected.
+        """
+        if not self._task:
+            return
+        if not self.connected:
+            self.failed += 1
+            return
+        message = json.dumps({**event, "origin": self.origin}, default=str)
+        self._spawn(self._send(message))
+
+    async def _send(self, message: str) -> None:
+        try:
+            # One connection: asyncpg runs one operation at a time on it
+            async with self._lock:
+                await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, message)
+            self.sent += 1
+        except Exception:
+            self.failed += 1
+
+    # ------------------------------------------------------------------
+    # Receiving
+    # ------------------------------------------------------------------
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        if event.pop("origin", None) == self.origin:
+            return
+        self.received += 1
+        self._spawn(self._handle(self._on_event(event)))
+
+    async def _handle(self, handler: Awaitable[None]) -> None:
+        try:
+            await handler
+        except Exception:
+            # A failed refresh leaves the stream as is; the next event fixes it
+            self.failed += 1
+
+    def _spawn(self, coro) -> None:
+        # Keep a reference until done so the task is not collected
+        task = asyncio.create_task(coro)
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                self._conn = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                self._conn.add_termination_listener(lambda _: lost.set())
+                await self._conn.add_listener(self.channel, self._on_notification)
+                await self._handle(self._on_resync())
+
+                # A silently dropped socket only shows up on use
+                while True:
+                    try:
+                        await asyncio.wait_for(lost.wait(), QUEUE_RELAY_PING_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        async with self._lock:
+                            await asyncio.wait_for(
+                                self._conn.execute("SELECT 1"), QUEUE_RELAY_PING_SECONDS
+                            )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            finally:
+                await self._close()
+            await asyncio.sleep(QUEUE_RELAY_RETRY_SECONDS)
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await asyncio.wait_for(conn.close(), QUEUE_RELAY_PING_SECONDS)
+            except Exception:
+                conn.terminate()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self, on_event: EventHandler, on_resync: ResyncHandler) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._on_event = on_event
+        self._on_resync = on_resync
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for task in list(self._handlers):
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "connected": self.connected,
+            "sent": self.sent,
+            "received": self.received,
+            "failed": self.failed,
+        }
+
+
+queue_event_relay = QueueEventRelay()
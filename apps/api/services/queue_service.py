@@ -1,9 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func,asc
-from datetime import datetime, timedelta
-
-from agents.queue.schemas import QueueIntakeRequest, QueueIntakeResponse,CallNextResponse,CallNextRequest,EndConsultationResponse,EndConsultationRequest,CheckInResponse,CheckInRequest,SkipResponse,SkipRequest,StartConsultationRequest,StartConsultationResponse,QueueStatusRequest,DoctorQueueStatus,ReceptionQueueStatus,PatientQueueStatus,TokenInfo
-from models.doctor_queue import DoctorQueue
+from sqlalchemy import select, update, insert, asc, func, tuple_, values, column, Integer
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert, UUID as PG_UUID
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from agents.queue.schemas import QueueIntakeRequest, QueueIntakeResponse,CallNextResponse,CallNextRequest,EndConsultationResponse,EndConsultationRequest,CheckInResponse,CheckInRequest,SkipResponse,SkipRequest,StartConsultationRequest,StartConsultationResponse,QueueStatusRequest,DoctorQueueStatus,ReceptionQueueStatus,PatientQueueStatus,TokenInfo,QueueBulkIntakeItemResult,QueueBulkIntakeResponse,QueueCounterDrift
+from models.doctor_queue import DoctorQueue, QUEUE_STATUSES
 from models.queue_entry import QueueEntry
 from models.visit import Visit
 from models.patient import Patient
@@ -11,6 +15,58 @@ from models.doctor import Doctor
 from models.department import Department
 from agents.doctor_assistance.agent import DoctorAssistanceAgent
 from agents.doctor_assistance.state import DoctorAssistanceState
+from services.queue_engine import queue_engine, LiveQueue, CAPACITY_STATUSES, SELECTABLE_STATUSES
+from services.queue_events import queue_event_broker, QueueEvent, QueueHeader
+from services.queue_relay import queue_event_relay
+from db.session import AsyncSessionLocal, is_replica_session, on_commit
+
+
+# MVP: hardcoded shift for queues created on first intake
+# (can later move to doctor table)
+_DEFAULT_SHIFT = dict(
+    shift_start_time=datetime.strptime("09:00", "%H:%M").time(),
+    shift_end_time=datetime.strptime("17:00", "%H:%M").time(),
+    avg_consult_time_minutes=10,
+    queue_open=True,
+)
+
+# Rows per multi-row INSERT (asyncpg caps bind parameters at 32767)
+BULK_INSERT_CHUNK = 1000
+
+# Per-status counter columns, RETURNING target of every counter UPDATE
+_COUNTER_COLUMNS = [getattr(DoctorQueue, f"{status}_count") for status in QUEUE_STATUSES]
+
+
+def _counter_moves(from_status: Optional[str], to_status: str, n=1) -> dict:
+    """
+    UPDATE values moving n entries from one status counter to another
+    (from_status=None for new entries).
+    """
+    moves = {}
+    if from_status:
+        moves[f"{from_status}_count"] = getattr(DoctorQueue, f"{from_status}_count") - n
+    moves[f"{to_status}_count"] = getattr(DoctorQueue, f"{to_status}_count") + n
+    return moves
+
+
+def _apply_counters(queue: DoctorQueue, row) -> None:
+    """
+    Copies counters returned by an UPDATE onto the loaded queue without
+    marking them dirty, so the ORM flush never writes them back.
+    """
+    for counter in _COUNTER_COLUMNS:
+        set_committed_value(queue, counter.key, row._mapping[counter.key])
+
+
+def _transaction(db: AsyncSession):
+    """
+    Opens the service transaction, or a SAVEPOINT when the caller already
+    holds one (in-process handoff from the Registration Agent). In the
+    nested case the caller owns the final commit.
+    """
+    if db.in_transaction():
+        return db.begin_nested()
+    return db.begin()
 
 
 class QueueService:
@@ -21,29 +77,32 @@ class QueueService:
         request: QueueIntakeRequest,
     ) -> QueueIntakeResponse:
 
-        async with db.begin():  # 🔒 TRANSACTION START
+        async with _transaction(db):  # 🔒 TRANSACTION START
 
             # 1️⃣ Get or create doctor queue
-            result = await db.execute(
-                select(DoctorQueue).where(
-                    DoctorQueue.doctor_id == request.doctor_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+            # FOR UPDATE serializes intakes on this queue until commit, so
+            # the capacity check and token allocation see exact counters
+            locked_queue = QueueService._queue_statement(
+                request.doctor_id, request.queue_date, lock=True
             )
+            result = await db.execute(locked_queue)
             queue = result.scalar_one_or_none()
 
             if not queue:
-                # MVP: hardcoded shift (can later move to doctor table)
-                queue = DoctorQueue(
-                    doctor_id=request.doctor_id,
-                    queue_date=request.queue_date,
-                    shift_start_time=datetime.strptime("09:00", "%H:%M").time(),
-                    shift_end_time=datetime.strptime("17:00", "%H:%M").time(),
-                    avg_consult_time_minutes=10,
-                    queue_open=True,
+                # ON CONFLICT: a concurrent intake may create the same queue
+                await db.execute(
+                    pg_insert(DoctorQueue)
+                    .values(
+                        doctor_id=request.doctor_id,
+                        queue_date=request.queue_date,
+                        **_DEFAULT_SHIFT,
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=["doctor_id", "queue_date"]
+                    )
                 )
-                db.add(queue)
-                await db.flush()
+                result = await db.execute(locked_queue)
+                queue = result.scalar_one()
 
             # 2️⃣ Queue open check
             if not queue.queue_open:
@@ -52,14 +111,8 @@ class QueueService:
                     reason="Doctor queue is closed for today",
                 )
 
-            # 3️⃣ Active queue size
-            result = await db.execute(
-                select(func.count(QueueEntry.id)).where(
-                    QueueEntry.queue_id == queue.id,
-                    QueueEntry.status.in_(["waiting", "present", "in_consultation"]),
-                )
-            )
-            active_count = result.scalar() or 0
+            # 3️⃣ Active queue size (counters on the locked row, no COUNT)
+            active_count = sum(queue.counts[s] for s in CAPACITY_STATUSES)
 
             # 4️⃣ Expected finish time
             expected_finish = (
@@ -78,14 +131,12 @@ class QueueService:
                     reason="Doctor shift will end before consultation",
                 )
 
-            # 5️⃣ Assign token (unique across ALL entries)
-            result = await db.execute(
-                select(func.max(QueueEntry.token_number)).where(
-                    QueueEntry.queue_id == queue.id,
-                )
-            )
-            max_token = result.scalar() or 0
-            token_number = max_token + 1
+            # 5️⃣ Assign token (unique across ALL entries) and count the
+            # new waiting entry in the same UPDATE
+            result = await db.execute(QueueService._token_statement(queue.id))
+            row = result.one()
+            token_number = row.last_token_number
+            _apply_counters(queue, row)
 
             entry = QueueEntry(
                 queue_id=queue.id,
@@ -102,6 +153,11 @@ class QueueService:
 
         # 🔓 TRANSACTION COMMIT
 
+        QueueService._after_commit(
+            db, queue, request.visit_id, token_number,
+            lambda: queue_engine.add_entry(queue.id, request.visit_id, token_number),
+        )
+
         return QueueIntakeResponse(
             accepted=True,
             token_number=token_number,
@@ -109,115 +165,445 @@ class QueueService:
             estimated_wait_minutes=active_count * queue.avg_consult_time_minutes,
         )
     
+    @staticmethod
+    async def bulk_intake(
+        db: AsyncSession,
+        items: List[QueueIntakeRequest],
+    ) -> QueueBulkIntakeResponse:
+        """
+        Intake of many visits for many doctors in one transaction.
+        Per (doctor_id, queue_date): one capacity check and one token range;
+        all token ranges come from a single UPDATE and entries go in with
+        multi-row INSERTs. Results follow the input order.
+        """
+        results: List[Optional[QueueBulkIntakeItemResult]] = [None] * len(items)
+
+        def reject(index: int, reason: str) -> None:
+            item = items[index]
+            results[index] = QueueBulkIntakeItemResult(
+                visit_id=item.visit_id,
+                doctor_id=item.doctor_id,
+                queue_date=item.queue_date,
+                accepted=False,
+                reason=reason,
+            )
+
+        # 1️⃣ Group by queue, keeping input order
+        groups: Dict[Tuple[UUID, date], List[int]] = {}
+        seen = set()
+        for index, item in enumerate(items):
+            key = (item.doctor_id, item.queue_date)
+            if (key, item.visit_id) in seen:
+                reject(index, "Duplicate visit in batch")
+                continue
+            seen.add((key, item.visit_id))
+            groups.setdefault(key, []).append(index)
+
+        added_by_queue: List[Tuple[DoctorQueue, List[Tuple[UUID, int]]]] = []
+
+        if groups:
+            async with _transaction(db):  # 🔒 TRANSACTION START
+
+                # 2️⃣ Unknown doctors are rejected per item: doctor_queues has
+                # no FK to doctors, so the upsert would create orphan queues
+                result = await db.execute(
+                    select(Doctor.id).where(
+                        Doctor.id.in_({doctor_id for doctor_id, _ in groups})
+                    )
+                )
+                known_doctors = set(result.scalars())
+                for key in [key for key in groups if key[0] not in known_doctors]:
+                    for index in groups.pop(key):
+                        reject(index, "Doctor not found")
+
+                # Create missing queues, then lock all of them in id order
+                # so concurrent imports cannot deadlock
+                if groups:
+                    await db.execute(
+                        pg_insert(DoctorQueue)
+                        .values([
+                            dict(doctor_id=doctor_id, queue_date=queue_date, **_DEFAULT_SHIFT)
+                            for doctor_id, queue_date in groups
+                        ])
+                        .on_conflict_do_nothing(
+                            index_elements=["doctor_id", "queue_date"]
+                        )
+                    )
+                result = await db.execute(QueueService._bulk_queues_statement(list(groups)))
+                queues = {(q.doctor_id, q.queue_date): q for q in result.scalars()}
+
+                # 3️⃣ Visits already queued (single intake hits uq_queue_visit)
+                result = await db.execute(
+                    QueueService._queued_visits_statement(
+                        [q.id for q in queues.values()],
+                        {item.visit_id for item in items},
+                    )
+                )
+                existing = {(row.queue_id, row.visit_id) for row in result}
+
+                # 4️⃣ Open + capacity check once per queue
+                allocations: Dict[UUID, Tuple[DoctorQueue, List[int], int]] = {}
+                for key, indexes in groups.items():
+                    queue = queues[key]
+
+                    if not queue.queue_open:
+                        for index in indexes:
+                            reject(index, "Doctor queue is closed for today")
+                        continue
+
+                    fresh = []
+                    for index in indexes:
+                        if (queue.id, items[index].visit_id) in existing:
+                            reject(index, "Visit already in queue")
+                        else:
+                            fresh.append(index)
+                    if not fresh:
+                        continue
+
+                    active_count = sum(queue.counts[s] for s in CAPACITY_STATUSES)
+
+                    # Same rule as intake: start + (active + k) * avg <= shift end
+                    shift_minutes = (
+                        datetime.combine(queue.queue_date, queue.shift_end_time)
+                        - datetime.combine(queue.queue_date, queue.shift_start_time)
+                    ).total_seconds() / 60
+                    slots = max(int(shift_minutes // queue.avg_consult_time_minutes) - active_count, 0)
+
+                    if len(fresh) > slots:
+                        queue.queue_open = False
+                        for index in fresh[slots:]:
+                            reject(index, "Doctor shift will end before consultation")
+                        fresh = fresh[:slots]
+
+                    if fresh:
+                        allocations[queue.id] = (queue, fresh, active_count)
+
+                if allocations:
+                    # 5️⃣ Token ranges (and waiting counters) for every queue
+                    # in one statement
+                    result = await db.execute(
+                        QueueService._token_ranges_statement([
+                            (queue_id, len(indexes))
+                            for queue_id, (_, indexes, _) in allocations.items()
+                        ])
+                    )
+                    last_tokens = {}
+                    for row in result:
+                        last_tokens[row.id] = row.last_token_number
+                        _apply_counters(allocations[row.id][0], row)
+
+                    # 6️⃣ Entries via multi-row INSERT
+                    rows = []
+                    for queue_id, (queue, indexes, active_count) in allocations.items():
+                        first_token = last_tokens[queue_id] - len(indexes) + 1
+                        added = []
+                        for offset, index in enumerate(indexes):
+                            item = items[index]
+                            token_number = first_token + offset
+                            rows.append(dict(
+                                queue_id=queue_id,
+                                visit_id=item.visit_id,
+                                token_number=token_number,
+                                position=token_number,
+                                status="waiting",
+                            ))
+                            results[index] = QueueBulkIntakeItemResult(
+                                visit_id=item.visit_id,
+                                doctor_id=item.doctor_id,
+                                queue_date=item.queue_date,
+                                accepted=True,
+                                token_number=token_number,
+                                position=token_number,
+                                estimated_wait_minutes=(active_count + offset) * queue.avg_consult_time_minutes,
+                            )
+                            added.append((item.visit_id, token_number))
+
+                        queue.last_event_type = "VISIT_ADDED"
+                        queue.last_event_reason = f"Bulk intake of {len(indexes)} visits"
+                        queue.last_updated_by = "queue_agent"
+                        added_by_queue.append((queue, added))
+
+                    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+                        await db.execute(
+                            insert(QueueEntry).values(rows[start:start + BULK_INSERT_CHUNK])
+                        )
+
+            # 🔓 TRANSACTION COMMIT
+
+        # One engine update + one stream event per queue
+        for queue, added in added_by_queue:
+            def mirror(queue_id=queue.id, added=added):
+                for visit_id, token_number in added:
+                    queue_engine.add_entry(queue_id, visit_id, token_number)
+
+            QueueService._after_commit(db, queue, None, None, mirror)
+
+        accepted = sum(1 for r in results if r.accepted)
+        return QueueBulkIntakeResponse(
+            accepted=accepted,
+            rejected=len(results) - accepted,
+            results=results,
+        )
+
     @staticmethod
     async def call_next(
         db: AsyncSession,
         request: CallNextRequest,
     ) -> CallNextResponse:
 
-        async with db.begin():
-
-            # 0️⃣ Validate doctor exists
-            doctor = await db.get(Doctor, request.doctor_id)
-            if not doctor:
-                raise ValueError("Doctor not found")
+        async with _transaction(db):
 
-            # 1️⃣ Fetch queue
+            # 1️⃣ Fetch + lock queue: one call_next per doctor at a time, so
+            # SKIP LOCKED below can never hand out two patients at once
             result = await db.execute(
-                select(DoctorQueue).where(
-                    DoctorQueue.doctor_id == request.doctor_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+                QueueService._queue_statement(request.doctor_id, request.queue_date, lock=True)
             )
             queue = result.scalar_one_or_none()
 
             if not queue:
+                if not await db.get(Doctor, request.doctor_id):
+                    raise ValueError("Doctor not found")
                 raise ValueError("No active queue for this doctor")
 
             if queue.current_visit_id:
                 raise ValueError("Consultation already in progress")
 
-            # 2️⃣ Pick next entry (present > waiting)
-            result = await db.execute(
-                select(QueueEntry)
-                .where(
-                    QueueEntry.queue_id == queue.id,
-                    QueueEntry.status.in_(["present", "waiting", "called"]),
-                )
-                .order_by(
-                    asc(
-                        QueueEntry.status != "present"
-                    ),  # present first
-                    asc(QueueEntry.token_number),
+            # 2️⃣ Pick, mark called and fetch context in one statement,
+            # targeting the resident engine's candidate (present > waiting)
+            row = None
+            live = await queue_engine.load(db, queue)
+            if not live.matches(queue.counts):
+                # Another worker moved this queue since it was loaded; the
+                # locked row's counters are authoritative, so re-read it
+                live = await queue_engine.load(db, queue, fresh=True)
+            candidate = live.peek_next()
+
+            if candidate:
+                result = await db.execute(
+                    QueueService._call_next_statement(queue.id, candidate.visit_id)
                 )
-                .limit(1)
-            )
+                row = result.one_or_none()
 
-            entry = result.scalar_one_or_none()
+            if not row:
+                # Resident view missed a write (another worker, restart):
+                # rebuild it and fall back to the ordered pick.
+                await queue_engine.rebuild(db, queue)
+                result = await db.execute(QueueService._call_next_statement(queue.id))
+                row = result.one_or_none()
 
-            if not entry:
+            if not row:
                 raise ValueError("No patients waiting in queue")
 
-            # 3️⃣ Mark entry as called (awaiting patient)
-            entry.status = "called"
-            entry.consultation_start_time = datetime.utcnow()
+            # The entry UPDATE already ran; raising rolls it back
+            if row.patient_id is None:
+                raise ValueError("Patient not found for visit")
+            if row.visit_doctor_id is None:
+                raise ValueError("Doctor not found for visit")
+            if row.department_id and row.department is None:
+                raise ValueError("Doctor department not found")
 
-            # 4️⃣ Update queue
-            queue.current_token = entry.token_number
-            queue.current_visit_id = entry.visit_id
+            # 3️⃣ Update queue
+            await QueueService._move_counters(db, queue, row.previous_status, "called")
+            queue.current_token = row.token_number
+            queue.current_visit_id = row.visit_id
             queue.last_event_type = "CALL_NEXT"
             queue.last_event_reason = "Doctor called next patient"
             queue.last_updated_by = "doctor"
-
-            # 5️⃣ Fetch visit + patient context
-            visit = await db.get(Visit, entry.visit_id)
-            patient = await db.get(Patient, visit.patient_id)
-            doctor = await db.get(Doctor, visit.doctor_id)
-            # Eagerly resolve department name to avoid async lazy-load later
-            if not doctor:
-                raise ValueError("Doctor not found for visit")
-            dept_name = None
-            if doctor.department_id:
-                dept = await db.get(Department, doctor.department_id)
-                if not dept:
-                    raise ValueError("Doctor department not found")
-                dept_name = dept.name
         # 🔓 COMMIT DONE — SAFE TO HANDOFF
 
+        QueueService._after_commit(
+            db, queue, row.visit_id, row.token_number,
+            lambda: queue_engine.set_status(queue.id, row.visit_id, "called"),
+        )
+
         # 6️⃣ Handoff to Doctor Assistance Agent
         state = DoctorAssistanceState(
-            visit_id=visit.id,
-            patient_id=patient.id,
-            doctor_id=visit.doctor_id,
-            department=dept_name,
-            token_number=entry.token_number,
-            symptoms_summary=visit.symptoms_summary,
+            visit_id=row.visit_id,
+            patient_id=row.patient_id,
+            doctor_id=row.visit_doctor_id,
+            department=row.department,
+            token_number=row.token_number,
+            symptoms_summary=row.symptoms_summary,
         )
 
         DoctorAssistanceAgent(state).handle()
 
         return CallNextResponse(
-            visit_id=visit.id,
-            patient_id=patient.id,
-            doctor_id=visit.doctor_id,
-            token_number=entry.token_number,
+            visit_id=row.visit_id,
+            patient_id=row.patient_id,
+            doctor_id=row.visit_doctor_id,
+            token_number=row.token_number,
             status="called",
         )
 
+    # ------------------------------------------------------------------
+    # Statements (also EXPLAINed by scripts/queue_index_explain_test.py)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _queue_statement(doctor_id: UUID, queue_date: date, lock: bool = False):
+        """
+        The queue of a doctor and day; lock=True takes its row lock and
+        refreshes an already loaded instance.
+        """
+        stmt = select(DoctorQueue).where(
+            DoctorQueue.doctor_id == doctor_id,
+            DoctorQueue.queue_date == queue_date,
+        )
+        if lock:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+        return stmt
+
+    @staticmethod
+    def _bulk_queues_statement(keys: List[Tuple[UUID, date]]):
+        # Locked in id order so concurrent imports cannot deadlock
+        return (
+            select(DoctorQueue)
+            .where(tuple_(DoctorQueue.doctor_id, DoctorQueue.queue_date).in_(keys))
+            .order_by(DoctorQueue.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
+    @staticmethod
+    def _entry_statement(queue_id: UUID, visit_id: UUID, status: Optional[str] = None):
+        return select(QueueEntry).where(
+            QueueEntry.queue_id == queue_id,
+            QueueEntry.visit_id == visit_id,
+            *([QueueEntry.status == status] if status else []),
+        )
+
+    @staticmethod
+    def _queued_visits_statement(queue_ids, visit_ids):
+        return select(QueueEntry.queue_id, QueueEntry.visit_id).where(
+            QueueEntry.queue_id.in_(queue_ids),
+            QueueEntry.visit_id.in_(visit_ids),
+        )
+
+    @staticmethod
+    def _check_in_statement(visit_id: UUID, queue_date: date):
+        return (
+            select(QueueEntry, DoctorQueue)
+            .join(DoctorQueue, QueueEntry.queue_id == DoctorQueue.id)
+            .where(
+                QueueEntry.visit_id == visit_id,
+                DoctorQueue.queue_date == queue_date,
+            )
+        )
+
+    @staticmethod
+    def _token_statement(queue_id: UUID):
+        """
+        Next token of one queue, counting the new entry as waiting.
+        """
+        return (
+            update(DoctorQueue)
+            .where(DoctorQueue.id == queue_id)
+            .values(
+                last_token_number=DoctorQueue.last_token_number + 1,
+                **_counter_moves(None, "waiting"),
+            )
+            .returning(DoctorQueue.last_token_number, *_COUNTER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _token_ranges_statement(counts: List[Tuple[UUID, int]]):
+        """
+        A range of n tokens per (queue_id, n) in one UPDATE ... FROM VALUES;
+        each row returns the last token of its range.
+        """
+        batch = values(
+            column("queue_id", PG_UUID(as_uuid=True)),
+            column("n", Integer),
+            name="batch",
+        ).data(counts)
+        return (
+            update(DoctorQueue)
+            .where(DoctorQueue.id == batch.c.queue_id)
+            .values(
+                last_token_number=DoctorQueue.last_token_number + batch.c.n,
+                **_counter_moves(None, "waiting", batch.c.n),
+            )
+            .returning(DoctorQueue.id, DoctorQueue.last_token_number, *_COUNTER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _counter_statement(queue_id: UUID, from_status: str, to_status: str):
+        return (
+            update(DoctorQueue)
+            .where(DoctorQueue.id == queue_id)
+            .values(**_counter_moves(from_status, to_status))
+            .returning(*_COUNTER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _call_next_statement(queue_id: UUID, visit_id: Optional[UUID] = None):
+        """
+        picked: next selectable entry (or the given visit), locked with
+                SKIP LOCKED so rows held by other transitions are passed over
+        called: marks it called, returning its previous status
+        SELECT: the entry joined to visit, patient, doctor and department
+        """
+        picked = (
+            select(QueueEntry.id, QueueEntry.status)
+            .where(
+                QueueEntry.queue_id == queue_id,
+                QueueEntry.status.in_(SELECTABLE_STATUSES),
+                *([QueueEntry.visit_id == visit_id] if visit_id else []),
+            )
+            .order_by(
+                asc(QueueEntry.status != "present"),  # present first
+                asc(QueueEntry.token_number),
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        called = (
+            update(QueueEntry)
+            .where(QueueEntry.id == picked.c.id)
+            .values(status="called", consultation_start_time=datetime.utcnow())
+            .returning(
+                QueueEntry.visit_id,
+                QueueEntry.token_number,
+                picked.c.status.label("previous_status"),
+            )
+            .cte("called")
+        )
+        # Outer joins: a missing row must still surface the called entry,
+        # so call_next can raise (and roll back) instead of losing it
+        return (
+            select(
+                called.c.visit_id,
+                called.c.token_number,
+                called.c.previous_status,
+                Visit.symptoms_summary,
+                Patient.id.label("patient_id"),
+                Doctor.id.label("visit_doctor_id"),
+                Doctor.department_id,
+                Department.name.label("department"),
+            )
+            .select_from(called)
+            .outerjoin(Visit, Visit.id == called.c.visit_id)
+            .outerjoin(Patient, Patient.id == Visit.patient_id)
+            .outerjoin(Doctor, Doctor.id == Visit.doctor_id)
+            .outerjoin(Department, Department.id == Doctor.department_id)
+        )
+
     @staticmethod
     async def end_consultation(
         db: AsyncSession,
         request: EndConsultationRequest,
     ) -> EndConsultationResponse:
 
-        async with db.begin():  # 🔒 TRANSACTION START
+        async with _transaction(db):  # 🔒 TRANSACTION START
 
             # 1️⃣ Fetch doctor queue
             result = await db.execute(
-                select(DoctorQueue).where(
-                    DoctorQueue.doctor_id == request.doctor_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+                QueueService._queue_statement(request.doctor_id, request.queue_date)
             )
             queue = result.scalar_one_or_none()
 
@@ -230,11 +616,7 @@ class QueueService:
 
             # 3️⃣ Fetch queue entry
             result = await db.execute(
-                select(QueueEntry).where(
-                    QueueEntry.queue_id == queue.id,
-                    QueueEntry.visit_id == request.visit_id,
-                    QueueEntry.status == "in_consultation",
-                )
+                QueueService._entry_statement(queue.id, request.visit_id, "in_consultation")
             )
             entry = result.scalar_one_or_none()
 
@@ -242,6 +624,7 @@ class QueueService:
                 raise ValueError("Queue entry not found or already closed")
 
             # 4️⃣ Close queue entry
+            await QueueService._move_counters(db, queue, "in_consultation", "completed")
             entry.status = "completed"
             entry.consultation_end_time = datetime.utcnow()
 
@@ -258,6 +641,11 @@ class QueueService:
 
         # 🔓 TRANSACTION COMMIT
 
+        QueueService._after_commit(
+            db, queue, request.visit_id, entry.token_number,
+            lambda: queue_engine.set_status(queue.id, request.visit_id, "completed"),
+        )
+
         return EndConsultationResponse(
             success=True,
             visit_id=request.visit_id,
@@ -270,22 +658,19 @@ class QueueService:
         request: CheckInRequest,
     ) -> CheckInResponse:
 
-        async with db.begin():  # 🔒 TRANSACTION
+        async with _transaction(db):  # 🔒 TRANSACTION
 
             # 1️⃣ Find queue entry for this visit & date
             result = await db.execute(
-                select(QueueEntry)
-                .join(DoctorQueue, QueueEntry.queue_id == DoctorQueue.id)
-                .where(
-                    QueueEntry.visit_id == request.visit_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+                QueueService._check_in_statement(request.visit_id, request.queue_date)
             )
-            entry = result.scalar_one_or_none()
+            row = result.one_or_none()
 
-            if not entry:
+            if not row:
                 raise ValueError("Queue entry not found")
 
+            entry, queue = row
+
             # 2️⃣ Validate state
             if entry.status == "present":
                 # Idempotent success
@@ -301,11 +686,21 @@ class QueueService:
                 )
 
             # 3️⃣ Mark as present
+            await QueueService._move_counters(db, queue, "waiting", "present")
             entry.status = "present"
             entry.check_in_time = datetime.utcnow()
 
+            queue.last_event_type = "CHECK_IN"
+            queue.last_event_reason = "Patient checked in"
+            queue.last_updated_by = "patient"
+
         # 🔓 COMMIT
 
+        QueueService._after_commit(
+            db, queue, request.visit_id, entry.token_number,
+            lambda: queue_engine.set_status(queue.id, request.visit_id, "present"),
+        )
+
         return CheckInResponse(
             success=True,
             visit_id=request.visit_id,
@@ -319,14 +714,11 @@ class QueueService:
         request: SkipRequest,
     ) -> SkipResponse:
 
-        async with db.begin():  # 🔒 TRANSACTION
+        async with _transaction(db):  # 🔒 TRANSACTION
 
             # 1️⃣ Fetch queue
             result = await db.execute(
-                select(DoctorQueue).where(
-                    DoctorQueue.doctor_id == request.doctor_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+                QueueService._queue_statement(request.doctor_id, request.queue_date)
             )
             queue = result.scalar_one_or_none()
 
@@ -335,10 +727,7 @@ class QueueService:
 
             # 2️⃣ Fetch queue entry
             result = await db.execute(
-                select(QueueEntry).where(
-                    QueueEntry.queue_id == queue.id,
-                    QueueEntry.visit_id == request.visit_id,
-                )
+                QueueService._entry_statement(queue.id, request.visit_id)
             )
             entry = result.scalar_one_or_none()
 
@@ -353,6 +742,7 @@ class QueueService:
                 raise ValueError("Cannot skip patient in active consultation. End consultation first.")
 
             # 4️⃣ Mark skipped (terminal)
+            await QueueService._move_counters(db, queue, entry.status, "skipped")
             entry.status = "skipped"
             entry.skipped_at = datetime.utcnow()
             entry.skip_reason = request.reason
@@ -372,6 +762,11 @@ class QueueService:
 
         # 🔓 COMMIT
 
+        QueueService._after_commit(
+            db, queue, request.visit_id, entry.token_number,
+            lambda: queue_engine.set_status(queue.id, request.visit_id, "skipped"),
+        )
+
         return SkipResponse(
             success=True,
             visit_id=request.visit_id,
@@ -384,13 +779,10 @@ class QueueService:
         request: StartConsultationRequest,
     ) -> StartConsultationResponse:
 
-        async with db.begin():
+        async with _transaction(db):
 
             result = await db.execute(
-                select(DoctorQueue).where(
-                    DoctorQueue.doctor_id == request.doctor_id,
-                    DoctorQueue.queue_date == request.queue_date,
-                )
+                QueueService._queue_statement(request.doctor_id, request.queue_date)
             )
             queue = result.scalar_one_or_none()
 
@@ -398,23 +790,26 @@ class QueueService:
                 raise ValueError("No active called visit for this doctor")
 
             result = await db.execute(
-                select(QueueEntry).where(
-                    QueueEntry.queue_id == queue.id,
-                    QueueEntry.visit_id == request.visit_id,
-                    QueueEntry.status == "called",
-                )
+                QueueService._entry_statement(queue.id, request.visit_id, "called")
             )
             entry = result.scalar_one_or_none()
 
             if not entry:
                 raise ValueError("Visit is not in called state")
 
+            await QueueService._move_counters(db, queue, "called", "in_consultation")
             entry.status = "in_consultation"
             entry.consultation_start_time = datetime.utcnow()
 
             queue.last_event_type = "CONSULTATION_STARTED"
+            queue.last_event_reason = "Doctor started consultation"
             queue.last_updated_by = "doctor"
 
+        QueueService._after_commit(
+            db, queue, request.visit_id, entry.token_number,
+            lambda: queue_engine.set_status(queue.id, request.visit_id, "in_consultation"),
+        )
+
         return StartConsultationResponse(
             success=True,
             visit_id=request.visit_id,
@@ -426,42 +821,55 @@ class QueueService:
 
         # 1️⃣ Fetch queue
         result = await db.execute(
-            select(DoctorQueue).where(
-                DoctorQueue.doctor_id == request.doctor_id,
-                DoctorQueue.queue_date == request.queue_date,
-            )
+            QueueService._queue_statement(request.doctor_id, request.queue_date)
         )
         queue = result.scalar_one_or_none()
 
         if not queue:
             raise ValueError("Queue not found")
 
-        # 2️⃣ Fetch all queue entries
-        result = await db.execute(
-            select(QueueEntry).where(
-                QueueEntry.queue_id == queue.id
+        # 2️⃣ Reception view reads only the counters on the queue row
+        if request.role == "receptionist":
+            return QueueService._render_status(queue, None, request)
+
+        # 3️⃣ Resident queue view (loaded once, no per-request scan);
+        # a replica snapshot is never installed as the resident queue
+        install = not is_replica_session(db)
+        live = await queue_engine.load(db, queue, install=install)
+
+        # 4️⃣ Visit unknown to this worker's resident queue (intake on another
+        # worker, or not yet reloaded): reconcile once if the DB has it
+        if (
+            request.role == "patient"
+            and request.visit_id
+            and request.visit_id not in live.entries
+        ):
+            queued = await db.scalar(
+                QueueService._entry_statement(queue.id, request.visit_id)
             )
-        )
-        entries = result.scalars().all()
+            if queued is not None:
+                live = await queue_engine.load(db, queue, install=install, fresh=True)
+
+        return QueueService._render_status(queue, live, request)
+
+    @staticmethod
+    def _render_status(queue, live: Optional[LiveQueue], request: QueueStatusRequest):
+        """
+        Builds the role view from queue header fields and counters plus the
+        resident queue (not needed for the reception view).
+        `queue` is a DoctorQueue or a QueueHeader snapshot.
+        """
+        counts = queue.counts
 
         # ---------- DOCTOR VIEW ----------
         if request.role == "doctor":
 
-            called_entry = next(
-                (e for e in entries if e.status == "called"), None
-            )
+            called_entry = live.called_entry()
 
             next_waiting = [
                 TokenInfo(token_number=e.token_number, status=e.status)
-                for e in sorted(entries, key=lambda x: x.token_number)
-                if e.status in ("present", "waiting")
-            ][:3]
-
-            counts = {
-                "waiting": sum(1 for e in entries if e.status == "waiting"),
-                "present": sum(1 for e in entries if e.status == "present"),
-                "skipped": sum(1 for e in entries if e.status == "skipped"),
-            }
+                for e in live.next_waiting(3)
+            ]
 
             return DoctorQueueStatus(
                 role="doctor",
@@ -476,7 +884,11 @@ class QueueService:
                     if called_entry else None
                 ),
                 next_waiting=next_waiting,
-                counts=counts,
+                counts={
+                    "waiting": counts["waiting"],
+                    "present": counts["present"],
+                    "skipped": counts["skipped"],
+                },
             )
 
         # ---------- PATIENT VIEW ----------
@@ -485,22 +897,12 @@ class QueueService:
             if not request.visit_id:
                 raise ValueError("visit_id is required for patient view")
 
-            entry = next(
-                (e for e in entries if e.visit_id == request.visit_id), None
-            )
+            entry = live.entries.get(request.visit_id)
 
             if not entry:
                 raise ValueError("Visit not found in queue")
 
-            active_entries = [
-                e for e in entries
-                if e.status in ("waiting", "present", "called")
-            ]
-
-            patients_ahead = sum(
-                1 for e in active_entries
-                if e.token_number < entry.token_number
-            )
+            patients_ahead = live.patients_ahead(entry.token_number)
 
             estimated_wait = (
                 patients_ahead * queue.avg_consult_time_minutes
@@ -523,15 +925,238 @@ class QueueService:
                 role="receptionist",
                 queue_date=request.queue_date,
                 doctor_id=request.doctor_id,
-                total_visits=len(entries),
-                completed=sum(1 for e in entries if e.status == "completed"),
-                in_progress=sum(
-                    1 for e in entries
-                    if e.status in ("called", "in_consultation")
-                ),
-                waiting=sum(1 for e in entries if e.status == "waiting"),
-                skipped=sum(1 for e in entries if e.status == "skipped"),
+                total_visits=sum(counts.values()),
+                completed=counts["completed"],
+                in_progress=counts["called"] + counts["in_consultation"],
+                waiting=counts["waiting"],
+                skipped=counts["skipped"],
             )
 
         raise ValueError("Invalid role")
-        
\ No newline at end of file
+
+    @staticmethod
+    async def check_counters(
+        db: AsyncSession,
+        queue_date: Optional[date] = None,
+        repair: bool = False,
+    ) -> List[QueueCounterDrift]:
+        """
+        Recounts entries per status and reports queues whose counters
+        drifted. With repair=True the drifted counters are overwritten.
+        """
+        scope = [DoctorQueue.queue_date == queue_date] if queue_date else []
+
+        async with _transaction(db):
+
+            if repair:
+                # Every transition updates its queue row, so holding the row
+                # locks freezes the entries we are about to count
+                await db.execute(
+                    select(DoctorQueue.id)
+                    .where(*scope)
+                    .order_by(DoctorQueue.id)
+                    .with_for_update()
+                )
+
+            # One statement: counters and recount come from the same snapshot
+            result = await db.execute(QueueService._check_counters_statement(queue_date))
+
+            drift = []
+            for queue, *recounted in result.all():
+                actual = dict(zip(QUEUE_STATUSES, recounted))
+                stored = queue.counts
+                if stored == actual:
+                    continue
+
+                drift.append(QueueCounterDrift(
+                    queue_id=queue.id,
+                    doctor_id=queue.doctor_id,
+                    queue_date=queue.queue_date,
+                    stored=stored,
+                    actual=actual,
+                ))
+                if repair:
+                    for status, count in actual.items():
+                        setattr(queue, f"{status}_count", count)
+
+        return drift
+
+    @staticmethod
+    def _check_counters_statement(queue_date: Optional[date] = None):
+        """
+        Queues (of queue_date, or all) with their entries recounted per
+        status. The recount only groups the entries of those queues.
+        """
+        scope = [DoctorQueue.queue_date == queue_date] if queue_date else []
+        recount = (
+            select(
+                QueueEntry.queue_id,
+                *[
+                    func.count().filter(QueueEntry.status == status).label(status)
+                    for status in QUEUE_STATUSES
+                ],
+            )
+            .where(
+                *([QueueEntry.queue_id.in_(select(DoctorQueue.id).where(*scope))] if scope else [])
+            )
+            .group_by(QueueEntry.queue_id)
+            .subquery()
+        )
+        return (
+            select(
+                DoctorQueue,
+                *[func.coalesce(recount.c[status], 0) for status in QUEUE_STATUSES],
+            )
+            .outerjoin(recount, recount.c.queue_id == DoctorQueue.id)
+            .where(*scope)
+            .order_by(DoctorQueue.queue_date, DoctorQueue.doctor_id)
+            .execution_options(populate_existing=True)
+        )
+
+    @staticmethod
+    async def _move_counters(
+        db: AsyncSession,
+        queue: DoctorQueue,
+        from_status: str,
+        to_status: str,
+    ) -> None:
+        """
+        Moves one entry between status counters inside the caller's
+        transaction (single UPDATE, no recount).
+        """
+        if from_status == to_status:
+            return
+
+        result = await db.execute(
+            QueueService._counter_statement(queue.id, from_status, to_status)
+        )
+        _apply_counters(queue, result.one())
+
+    @staticmethod
+    def _after_commit(db, queue, visit_id, token_number, mirror) -> None:
+        """
+        Mirrors a transition into the resident engine, publishes it and
+        relays it to the other workers, deferred to the caller's commit
+        when we ran inside its transaction.
+        """
+        def apply():
+            mirror()
+            QueueService._publish(queue, visit_id=visit_id, token_number=token_number)
+            queue_event_relay.notify({
+                "doctor_id": queue.doctor_id,
+                "queue_date": queue.queue_date,
+                "event_type": queue.last_event_type,
+                "visit_id": visit_id,
+                "token_number": token_number,
+                "reason": queue.last_event_reason,
+            })
+
+        on_commit(db, apply)
+
+    @staticmethod
+    async def apply_relayed_event(event: Dict) -> None:
+        """
+        A transition committed on another worker: our resident queue missed
+        it, so it is re-read before publishing to our subscribers.
+        """
+        await QueueService._refresh_and_publish(
+            UUID(event["doctor_id"]),
+            date.fromisoformat(event["queue_date"]),
+            event_type=event.get("event_type"),
+            visit_id=UUID(event["visit_id"]) if event.get("visit_id") else None,
+            token_number=event.get("token_number"),
+            reason=event.get("reason"),
+        )
+
+    @staticmethod
+    async def resync_subscribed() -> None:
+        """
+        Republishes every subscribed queue from the DB, e.g. after relayed
+        events may have been missed.
+        """
+        for doctor_id, queue_date in queue_event_broker.channel_keys():
+            await QueueService._refresh_and_publish(doctor_id, queue_date)
+
+    @staticmethod
+    async def _refresh_and_publish(
+        doctor_id: UUID,
+        queue_date: date,
+        event_type: str | None = None,
+        visit_id=None,
+        token_number: int | None = None,
+        reason: str | None = None,
+    ) -> None:
+        if not queue_event_broker.subscriber_count(doctor_id, queue_date):
+            # Nobody to tell: drop the stale resident queue, the next use reloads it
+            queue_engine.discard(doctor_id, queue_date)
+            return
+
+        # Primary: a replica may not have replayed the relayed commit yet
+        async with AsyncSessionLocal() as db:
+            queue = await db.scalar(QueueService._queue_statement(doctor_id, queue_date))
+            if queue is None:
+                return
+            await queue_engine.load(db, queue, fresh=True)
+
+        QueueService._publish(
+            queue,
+            visit_id=visit_id,
+            token_number=token_number,
+            event_type=event_type,
+            reason=reason,
+        )
+
+    @staticmethod
+    def _publish(
+        queue: DoctorQueue,
+        visit_id=None,
+        token_number: int | None = None,
+        event_type: str | None = None,
+        reason: str | None = None,
+    ) -> None:
+        """
+        Pushes a committed transition to this worker's queue stream
+        subscribers; event_type / reason default to the queue's last event.
+        """
+        if not queue_event_broker.subscriber_count(queue.doctor_id, queue.queue_date):
+            return
+
+        header = QueueHeader(
+            queue_open=queue.queue_open,
+            current_token=queue.current_token,
+            current_visit_id=queue.current_visit_id,
+            avg_consult_time_minutes=queue.avg_consult_time_minutes,
+            counts=queue.counts,
+        )
+        live = queue_engine.get(queue.doctor_id, queue.queue_date)
+
+        def render(role, role_visit_id):
+            if live is None and role != "receptionist":
+                return None
+            try:
+                view = QueueService._render_status(
+                    header,
+                    live,
+                    QueueStatusRequest(
+                        queue_date=queue.queue_date,
+                        doctor_id=queue.doctor_id,
+                        role=role,
+                        visit_id=role_visit_id,
+                    ),
+                )
+            except ValueError:
+                return None
+            return view.model_dump(mode="json")
+
+        queue_event_broker.publish(
+            QueueEvent(
+                event_type=event_type or queue.last_event_type,
+                doctor_id=queue.doctor_id,
+                queue_date=queue.queue_date,
+                header=header,
+                visit_id=visit_id,
+                token_number=token_number,
+                reason=reason or queue.last_event_reason,
+            ),
+            render,
+        )
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.department_service import DepartmentService
+from services.doctor_service import DoctorService
+
+
+# Fallback for changes made outside the API (e.g. SQL consoles)
+REFERENCE_CACHE_TTL_SECONDS = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+
+@dataclass(frozen=True)
+class DepartmentRef:
+    id: UUID
+    name: str
+    description: Optional[str]
+
+
+@dataclass(frozen=True)
+class DoctorRef:
+    id: UUID
+    name: str
+    specialization: Optional[str]
+    department_id: UUID
+
+
+@dataclass
+class DepartmentDirectory:
+    departments: List[DepartmentRef]
+    by_name: Dict[str, DepartmentRef] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.by_name = {d.name.lower(): d for d in self.departments}
+
+    @property
+    def names(self) -> List[str]:
+        return [d.name for d in self.departments]
+
+    def id_for(self, name: Optional[str]) -> Optional[UUID]:
+        if not name:
+            return None
+        department = self.by_name.get(name.lower())
+        return department.id if department else None
+
+
+class ReferenceDataCache:
+    """
+    In-process cache of departments and available doctors.
+
+    Entries are immutable snapshots (never ORM objects) tagged with the
+    cache version; invalidation bumps the version so a load that raced it
+    is not installed.
+    """
+
+    def __init__(self, ttl_seconds: int = REFERENCE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._directory: Optional[Tuple[float, DepartmentDirectory]] = None
+        self._doctors: Dict[UUID, Tuple[float, List[DoctorRef]]] = {}
+        self._lock = asyncio.Lock()
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at < self.ttl_seconds
+
+    async def departments(self, db: AsyncSession) -> DepartmentDirectory:
+        cached = self._directory
+        if cached and self._fresh(cached[0]):
+            return cached[1]
+
+        async with self._lock:
+            cached = self._directory
+            if cached and self._fresh(cached[0]):
+                return cached[1]
+
+            version = self.version
+            rows = await DepartmentService.list_all(db)
+            directory = DepartmentDirectory(
+                [DepartmentRef(d.id, d.name, d.description) for d in rows]
+            )
+            if version == self.version:
+                self._directory = (time.monotonic(), directory)
+            return directory
+
+    async def doctors(
+        self,
+        db: AsyncSession,
+        department_id: Optional[UUID],
+    ) -> List[DoctorRef]:
+        """
+        Available doctors of a department, ordered by name.
+        """
+        if department_id is None:
+            return []
+
+        cached = self._doctors.get(department_id)
+        if cached and self._fresh(cached[0]):
+            return cached[1]
+
+        async with self._lock:
+            cached = self._doctors.get(department_id)
+            if cached and self._fresh(cached[0]):
+                return cached[1]
+
+            version = self.version
+            rows = await DoctorService.list_available_by_department(db, department_id)
+            doctors = [
+                DoctorRef(d.id, d.name, d.specialization, d.department_id)
+                for d in rows
+            ]
+            if version == self.version:
+                self._doctors[department_id] = (time.monotonic(), doctors)
+            return doctors
+
+    def invalidate_departments(self) -> None:
+        self.version += 1
+        self._directory = None
+
+    def invalidate_doctors(self, department_id: Optional[UUID] = None) -> None:
+        self.version += 1
+        if department_id is None:
+            self._doctors.clear()
+        else:
+            self._doctors.pop(department_id, None)
+
+    def invalidate(self) -> None:
+        self.invalidate_departments()
+        self.invalidate_doctors()
+
+
+reference_cache = ReferenceDataCache()
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal
+from services.agent_session_service import AgentSessionService
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional shared tier
+    redis_asyncio = None
+
+
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory").lower()  # memory | redis
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/1")
+# Hot-tier lifetime of an idle session (abandoned registrations fall out)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_FLUSH_INTERVAL_SECONDS", "2"))
+SESSION_FLUSH_BATCH_SIZE = int(os.getenv("SESSION_FLUSH_BATCH_SIZE", "200"))
+# API worker processes (uvicorn/gunicorn read the same variable)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+# ------------------------------------------------------------------
+# Hot tiers
+# ------------------------------------------------------------------
+
+class SessionTier(ABC):
+
+    # Seen by every API worker; a per-process tier is only a read cache
+    shared = False
+
+    @abstractmethod
+    async def get(self, session_id: uuid.UUID) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def set(self, session_id: uuid.UUID, state: dict, ttl_seconds: int) -> None:
+        pass
+
+    async def purge_expired(self) -> int:
+        return 0
+
+
+class InMemorySessionTier(SessionTier):
+    """
+    Per-process tier: a read cache over rows the store writes through, so
+    a restart loses nothing. Refused with several workers (see _build_tier).
+    """
+
+    def __init__(self):
+        self._data: Dict[uuid.UUID, Tuple[float, dict]] = {}
+
+    async def get(self, session_id: uuid.UUID) -> Optional[dict]:
+        item = self._data.get(session_id)
+        if item is None:
+            return None
+
+        expires_at, state = item
+        if expires_at < time.monotonic():
+            del self._data[session_id]
+            return None
+        return state
+
+    async def set(self, session_id: uuid.UUID, state: dict, ttl_seconds: int) -> None:
+        self._data[session_id] = (time.monotonic() + ttl_seconds, state)
+
+    async def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [sid for sid, (expires_at, _) in self._data.items() if expires_at < now]
+        for sid in expired:
+            del self._data[sid]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisSessionTier(SessionTier):
+    """
+    Shared tier speaking the Redis protocol (Redis, Valkey, KeyDB, or any
+    local stand-in). Expiry is handled by the server.
+    """
+
+    shared = True
+
+    def __init__(self, url: str = SESSION_REDIS_URL):
+        if redis_asyncio is None:
+            raise RuntimeError("SESSION_STORE_BACKEND=redis requires the 'redis' package")
+        self._client = redis_asyncio.from_url(url)
+
+    @staticmethod
+    def _key(session_id: uuid.UUID) -> str:
+        return f"agent_session:{session_id}"
+
+    async def get(self, session_id: uuid.UUID) -> Optional[dict]:
+        raw = await self._client.get(self._key(session_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, session_id: uuid.UUID, state: dict, ttl_seconds: int) -> None:
+        await self._client.set(self._key(session_id), json.dumps(state), ex=ttl_seconds)
+
+
+# ------------------------------------------------------------------
+# Store
+# ------------------------------------------------------------------
+
+class SessionStore:
+    """
+    Agent session state with a hot tier in front of agent_sessions.
+
+    Reads hit the hot tier; only a miss (restart, expiry) reads Postgres.
+    With a shared tier, writes go to it immediately and are persisted to
+    Postgres in batches by a background flusher, so a message normally
+    costs no session round trips at all. A per-process tier is written
+    through instead: each save is persisted before it is cached.
+    """
+
+    def __init__(
+        self,
+        tier: SessionTier,
+        ttl_seconds: int = SESSION_TTL_SECONDS,
+        flush_interval_seconds: float = SESSION_FLUSH_INTERVAL_SECONDS,
+        flush_batch_size: int = SESSION_FLUSH_BATCH_SIZE,
+        write_through: Optional[bool] = None,
+    ):
+        self.tier = tier
+        self.write_through = not tier.shared if write_through is None else write_through
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        # session_id -> (agent_name, state delta) awaiting persistence;
+        # a session created since the last flush carries its full state
+        self._dirty: Dict[uuid.UUID, Tuple[str, dict]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession, session_id: uuid.UUID) -> Optional[dict]:
+        state = await self.tier.get(session_id)
+        if state is not None:
+            return state
+
+        state = await AgentSessionService.get(db, session_id)
+        pending = self._dirty.get(session_id)
+        if pending is not None:
+            # Changes not flushed yet are newer than the stored row
+            state = {**(state or {}), **pending[1]}
+        if state is not None:
+            await self.tier.set(session_id, state, self.ttl_seconds)
+        return state
+
+    async def create(
+        self,
+        agent_name: str,
+        state: dict,
+        db: Optional[AsyncSession] = None,
+    ) -> uuid.UUID:
+        session_id = uuid.uuid4()
+        await self.save(session_id, agent_name, state, db=db)
+        return session_id
+
+    async def save(
+        self,
+        session_id: uuid.UUID,
+        agent_name: str,
+        state: dict,
+        changes: Optional[dict] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        """
+        state: the full JSON-ready state, kept in the hot tier.
+        changes: fields modified by this message; only these are written
+        to Postgres (None writes the full state).
+        db: session for write-through saves (committed); a new one if None.
+        """
+        delta = state if changes is None else changes
+
+        if self.write_through:
+            # Persisted first: the cache never holds state Postgres lacks
+            sessions = {session_id: (agent_name, dict(delta))}
+            if db is not None:
+                await AgentSessionService.upsert_many(db, sessions)
+            else:
+                async with AsyncSessionLocal() as db:
+                    await AgentSessionService.upsert_many(db, sessions)
+            await self.tier.set(session_id, state, self.ttl_seconds)
+            return
+
+        await self.tier.set(session_id, state, self.ttl_seconds)
+
+        pending = self._dirty.get(session_id)
+        if pending is None:
+            self._dirty[session_id] = (agent_name, dict(delta))
+        else:
+            pending[1].update(delta)
+
+    def pending_count(self) -> int:
+        return len(self._dirty)
+
+    async def flush(self) -> int:
+        """
+        Persists pending sessions in batches. Returns rows written.
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._dirty:
+                batch = {}
+                for session_id in list(self._dirty)[: self.flush_batch_size]:
+                    batch[session_id] = self._dirty.pop(session_id)
+
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await AgentSessionService.upsert_many(db, batch)
+                except Exception:
+                    # Requeue for the next tick, under any newer changes
+                    for session_id, (agent_name, delta) in batch.items():
+                        newer = self._dirty.get(session_id)
+                        if newer is not None:
+                            delta.update(newer[1])
+                        self._dirty[session_id] = (agent_name, delta)
+                    raise
+                written += len(batch)
+        return written
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+                await self.tier.purge_expired()
+            except Exception:
+                # DB unavailable: sessions stay dirty and are retried
+                continue
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+
+def _build_tier() -> SessionTier:
+    if SESSION_STORE_BACKEND == "redis":
+        return RedisSessionTier()
+    if WEB_CONCURRENCY > 1:
+        # Each worker would keep serving its own, older copy of a session
+        raise RuntimeError(
+            "SESSION_STORE_BACKEND=memory is per-process; use redis when WEB_CONCURRENCY > 1"
+        )
+    return InMemorySessionTier()
+
+
+session_store = SessionStore(_build_tier())
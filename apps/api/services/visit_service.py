@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
@@ -13,19 +14,25 @@ class VisitService:
         patient_id: UUID,
         doctor_id: UUID,
         symptoms_summary: str | None,
+        commit: bool = True,
     ) -> Visit:
         """
         Creates a visit for a patient with a doctor.
+        commit=False leaves it in the caller's unit of work.
         """
-        visit = Visit(
-            patient_id=patient_id,
-            doctor_id=doctor_id,
-            symptoms_summary=symptoms_summary,
-            status="scheduled",
+        stmt = (
+            insert(Visit)
+            .values(
+                patient_id=patient_id,
+                doctor_id=doctor_id,
+                symptoms_summary=symptoms_summary,
+                status="scheduled",
+            )
+            .returning(Visit)
         )
+        visit = await db.scalar(stmt)
 
-        db.add(visit)
-        await db.commit()
-        await db.refresh(visit)
+        if commit:
+            await db.commit()
 
         return visit
@@ -0,0 +1,109 @@
+"""
+Latency and statements per QueueService.call_next with every doctor
+calling patients concurrently.
+
+Seeds benchmark doctors and visits (scripts/benchmark/seed.py), queues all
+visits with one bulk intake, then runs call-next -> start -> end cycles
+per doctor in parallel. Statements are counted with an engine
+"before_cursor_execute" event; benchmark rows are removed afterwards.
+
+Usage:
+    python scripts/bench_call_next.py --doctors 20 --patients-per-day 400 --rounds 10
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts" / "benchmark"))
+
+from sqlalchemy import event
+
+from db.session import AsyncSessionLocal, engine
+from agents.queue.schemas import (
+    CallNextRequest,
+    EndConsultationRequest,
+    QueueIntakeRequest,
+    StartConsultationRequest,
+)
+from services.queue_service import QueueService
+from seed import cleanup, seed
+
+statements = [0]
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    statements[0] += 1
+
+
+async def doctor_loop(doctor_id: UUID, queue_date, rounds: int, samples: list):
+    for _ in range(rounds):
+        before = statements[0]
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            try:
+                called = await QueueService.call_next(
+                    db, CallNextRequest(doctor_id=doctor_id, queue_date=queue_date)
+                )
+            except ValueError:
+                return
+        # Counts overlap between concurrent doctors; read as an upper bound
+        samples.append(((time.perf_counter() - started) * 1000, statements[0] - before))
+
+        for Request, action in (
+            (StartConsultationRequest, QueueService.start_consultation),
+            (EndConsultationRequest, QueueService.end_consultation),
+        ):
+            async with AsyncSessionLocal() as db:
+                await action(db, Request(
+                    doctor_id=doctor_id, visit_id=called.visit_id, queue_date=queue_date
+                ))
+
+
+async def run_bench(args):
+    data = await seed(
+        departments=args.departments,
+        doctors=args.doctors,
+        patients_per_day=args.patients_per_day,
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            intake = await QueueService.bulk_intake(db, [
+                QueueIntakeRequest(**vars(visit)) for visit in data.visits
+            ])
+        print(f"queued {intake.accepted} visits for {len(data.doctor_ids)} doctors")
+
+        queue_date = data.visits[0].queue_date
+        samples = []
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            doctor_loop(UUID(doctor_id), queue_date, args.rounds, samples)
+            for doctor_id in data.doctor_ids
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        await cleanup()
+
+    latencies = sorted(ms for ms, _ in samples)
+    print(f"call_next x{len(samples)} in {elapsed:.2f} s")
+    print(f"  p50 {statistics.median(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, max {latencies[-1]:.2f} ms")
+    print(f"  statements per call (median): {statistics.median(n for _, n in samples)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--doctors", type=int, default=20)
+    parser.add_argument("--patients-per-day", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=10, help="call-next cycles per doctor")
+    args = parser.parse_args()
+    asyncio.run(run_bench(args))
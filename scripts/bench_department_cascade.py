@@ -0,0 +1,105 @@
+"""
+Department resolution cascade against the local fake LLM server: for each
+confidence the small model reports, p50/p95 of a resolution, escalation
+rate, agreement and per-tier latency, next to the large model alone. The
+response cache is bypassed so every resolution pays its round trips.
+
+Usage:
+    python scripts/bench_department_cascade.py --resolutions 200 --concurrency 20 \
+        --latency-ms 400 --distribution lognormal
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+DEPARTMENTS = ["General Medicine", "Cardiology", "Orthopedics", "Pediatrics"]
+SUMMARY = "Fever and cough for three days with mild chest discomfort"
+SMALL_CONFIDENCES = [0.95, 0.8, 0.6, 0.4]
+
+
+async def run(name, models, resolutions, concurrency):
+    from services.llm.department_resolver import (
+        CONFIDENCE_THRESHOLD,
+        DepartmentResolverService,
+        department_cascade_stats,
+    )
+
+    department_cascade_stats.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    below = 0
+
+    async def one():
+        nonlocal below
+        async with semaphore:
+            started = time.perf_counter()
+            result = await DepartmentResolverService.resolve(
+                SUMMARY, 40, DEPARTMENTS, use_cache=False, models=models
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not result or result["confidence"] < CONFIDENCE_THRESHOLD:
+                below += 1
+
+    await asyncio.gather(*(one() for _ in range(resolutions)))
+
+    latencies.sort()
+    stats = department_cascade_stats.stats()
+    print(f"\n--- {name} ---")
+    print(f"resolutions:     {resolutions}  below threshold: {below}")
+    print(f"p50:             {statistics.median(latencies):.2f} ms")
+    print(f"p95:             {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+    print(f"escalation rate: {stats['escalation_rate']:.2f}")
+    if stats["agreement_rate"] is not None:
+        print(f"agreement rate:  {stats['agreement_rate']:.2f}")
+    for model, tier in stats["tiers"].items():
+        print(f"  {model:<24} calls {tier['calls']:<5} mean {tier['mean_ms']:.2f} ms  {tier['outcomes']}")
+    return stats
+
+
+async def main(server, args):
+    from services.llm.client import llm_clients
+    from services.llm.department_resolver import CONFIDENCE_THRESHOLD, DepartmentResolverService
+
+    models = DepartmentResolverService.MODELS
+    small, large = models[0], models[-1]
+    try:
+        await run(f"{large} only", [large], args.resolutions, args.concurrency)
+        for confidence in SMALL_CONFIDENCES:
+            server.fake.config.model_confidence[small] = confidence
+            stats = await run(
+                f"cascade, {small} confidence {confidence}",
+                models,
+                args.resolutions,
+                args.concurrency,
+            )
+            if len(models) > 1:
+                expected = 0.0 if confidence >= CONFIDENCE_THRESHOLD else 1.0
+                assert stats["escalation_rate"] == expected, stats
+    finally:
+        await llm_clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        asyncio.run(main(server, args))
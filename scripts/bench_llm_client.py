@@ -0,0 +1,96 @@
+"""
+Latency benchmark: per-call Groq client in a worker thread (old behaviour)
+vs the shared pooled AsyncGroq registry, against the local fake LLM server.
+
+Usage:
+    python scripts/bench_llm_client.py --requests 500 --concurrency 50 --latency-ms 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+MODEL = "llama-3.1-8b-instant"
+MESSAGES = [
+    {"role": "system", "content": "You are a clinical note summarizer."},
+    {"role": "user", "content": "Symptoms:\nfever and cough for two days"},
+]
+
+
+def per_call_client():
+    from groq import Groq
+
+    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=MESSAGES,
+        temperature=0.2,
+    )
+    return response.choices[0].message.content.strip()
+
+
+async def run(name, call, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"\n--- {name} ---")
+    print(f"throughput: {requests / elapsed:.1f} req/s")
+    print(f"p50:        {statistics.median(latencies):.2f} ms")
+    print(f"p95:        {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+    print(f"p99:        {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+
+async def main(args):
+    from services.llm.client import LLMClientRegistry
+
+    registry = LLMClientRegistry(max_concurrency=args.concurrency)
+
+    await run(
+        "per-call Groq client + asyncio.to_thread",
+        lambda: asyncio.to_thread(per_call_client),
+        args.requests,
+        args.concurrency,
+    )
+    await run(
+        "shared AsyncGroq registry",
+        lambda: registry.chat(model=MODEL, messages=MESSAGES, temperature=0.2),
+        args.requests,
+        args.concurrency,
+    )
+    await registry.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        asyncio.run(main(args))
@@ -0,0 +1,104 @@
+"""
+Hedged department resolution against the local fake LLM server with
+heavy-tailed (Pareto) latency: p50/p95/p99 with hedging off and on, extra
+upstream requests and who won the races. The response cache is bypassed
+and only the last cascade tier is used, so every resolution is one call.
+
+Usage:
+    python scripts/bench_llm_hedging.py --resolutions 1000 --concurrency 10 \
+        --latency-ms 100 --distribution pareto --spread 1.5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+DEPARTMENTS = ["General Medicine", "Cardiology", "Orthopedics", "Pediatrics"]
+SUMMARY = "Fever and cough for three days with mild chest discomfort"
+WARMUP = 100
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def run(server, name, hedging, resolutions, concurrency):
+    from services.llm.department_resolver import DepartmentResolverService
+    from services.llm.hedging import llm_hedger
+
+    llm_hedger.enabled = hedging
+    llm_hedger.reset()
+    model = DepartmentResolverService.MODEL
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    invalid = 0
+
+    async def one(measure):
+        nonlocal invalid
+        async with semaphore:
+            started = time.perf_counter()
+            result = await DepartmentResolverService.resolve(
+                SUMMARY, 40, DEPARTMENTS, use_cache=False, models=[model]
+            )
+            if measure:
+                latencies.append((time.perf_counter() - started) * 1000)
+                invalid += result is None
+
+    # Warm up the rolling latency window before measuring
+    await asyncio.gather(*(one(False) for _ in range(WARMUP)))
+    before = server.fake.requests
+    await asyncio.gather(*(one(True) for _ in range(resolutions)))
+    upstream = server.fake.requests - before
+
+    latencies.sort()
+    stats = llm_hedger.stats()
+    print(f"\n--- {name} ---")
+    print(f"resolutions:       {resolutions}  invalid results: {invalid}")
+    print(f"p50:               {statistics.median(latencies):.2f} ms")
+    print(f"p95:               {percentile(latencies, 0.95):.2f} ms")
+    print(f"p99:               {percentile(latencies, 0.99):.2f} ms")
+    print(f"upstream requests: {upstream} ({upstream / resolutions:.3f} per resolution)")
+    if hedging:
+        print(f"hedge delay:       {stats['delay_ms'].get(model, 0):.2f} ms")
+        print(f"outcomes:          {stats['outcomes']}")
+        # Budget: every call earns budget_ratio hedges on top of the burst
+        cap = llm_hedger.budget_ratio * stats["calls"] + llm_hedger.budget_burst
+        hedged = stats["hedge_rate"] * stats["calls"]
+        assert hedged <= cap, (hedged, cap)
+
+
+async def main(server, args):
+    from services.llm.client import llm_clients
+
+    try:
+        await run(server, "no hedging", False, args.resolutions, args.concurrency)
+        await run(server, "hedged", True, args.resolutions, args.concurrency)
+    finally:
+        await llm_clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    parser.set_defaults(latency_ms=100.0, distribution="pareto", spread=1.5)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        os.environ.setdefault("LLM_DEADLINE_SECONDS", "60")
+        asyncio.run(main(server, args))
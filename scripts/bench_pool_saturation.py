@@ -0,0 +1,112 @@
+"""
+Finds the saturation point of the queue endpoints for the pool settings a
+running API was started with (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...).
+
+Concurrency is stepped up; at each level a mix of GET /agents/queue/status
+and POST /agents/queue/intake runs for --duration seconds. Throughput,
+p95 latency and the pool's checkout wait (from /metrics/db-pool) are
+reported. Saturation is the first level where throughput gains less than
+--min-gain over the previous level while p95 keeps rising.
+
+Usage:
+    DB_POOL_SIZE=5 DB_MAX_OVERFLOW=0 uvicorn main:app --port 8000
+    python scripts/bench_pool_saturation.py --doctor-id <uuid> --levels 1,2,4,8,16,32,64
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+from uuid import uuid4
+
+import httpx
+
+
+async def worker(client, args, deadline, latencies, errors):
+    status_params = {
+        "queue_date": args.queue_date,
+        "doctor_id": args.doctor_id,
+        "role": "receptionist",
+    }
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if random.random() < args.intake_ratio:
+                response = await client.post("/agents/queue/intake", json={
+                    "visit_id": str(uuid4()),
+                    "patient_id": str(uuid4()),
+                    "doctor_id": args.doctor_id,
+                    "queue_date": args.queue_date,
+                })
+            else:
+                response = await client.get("/agents/queue/status", params=status_params)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError:
+            errors[0] += 1
+
+
+async def run_level(client, args, concurrency):
+    latencies, errors = [], [0]
+    before = (await client.get("/metrics/db-pool")).json()
+
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*(
+        worker(client, args, deadline, latencies, errors)
+        for _ in range(concurrency)
+    ))
+
+    after = (await client.get("/metrics/db-pool")).json()
+    latencies.sort()
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)] if latencies else 0.0
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / args.duration,
+        "p95_ms": p95,
+        "errors": errors[0],
+        "pool_timeouts": after.get("timeouts", 0) - before.get("timeouts", 0),
+        "pool_wait_p95_ms": after.get("wait_p95_ms", 0.0),
+    }
+
+
+async def main(args):
+    levels = [int(level) for level in args.levels.split(",")]
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        pool = (await client.get("/metrics/db-pool")).json()
+        print(f"pool: size={pool.get('size')} overflow={pool.get('overflow')}")
+        print(f"{'conc':>5} {'req/s':>9} {'p95 ms':>9} {'errors':>7} {'timeouts':>9} {'wait p95':>9}")
+
+        results = []
+        saturation = None
+        for concurrency in levels:
+            result = await run_level(client, args, concurrency)
+            results.append(result)
+            print(
+                f"{concurrency:>5} {result['throughput']:>9.1f} {result['p95_ms']:>9.1f} "
+                f"{result['errors']:>7} {result['pool_timeouts']:>9} {result['pool_wait_p95_ms']:>9.1f}"
+            )
+
+            if saturation is None and len(results) > 1:
+                previous = results[-2]
+                gain = result["throughput"] / previous["throughput"] - 1 if previous["throughput"] else 0
+                if gain < args.min_gain and result["p95_ms"] > previous["p95_ms"]:
+                    saturation = previous["concurrency"]
+
+    if saturation is None:
+        print("\nno saturation within the tested levels")
+    else:
+        print(f"\nsaturation at ~{saturation} concurrent clients")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--doctor-id", required=True)
+    parser.add_argument("--queue-date", default=date.today().isoformat())
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64,128")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--intake-ratio", type=float, default=0.1)
+    parser.add_argument("--min-gain", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
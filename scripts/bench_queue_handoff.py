@@ -0,0 +1,143 @@
+"""
+Compares the in-process and HTTP queue handoff transports under
+concurrent registrations.
+
+Usage:
+    python scripts/bench_queue_handoff.py --registrations 200 --concurrency 50
+
+HTTP mode needs the API running at QUEUE_AGENT_URL
+(default http://localhost:8000/agents/queue/intake).
+
+Every registration gets its own queue_date so token contention on a single
+doctor queue does not skew the transport comparison.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import select
+
+from db.session import AsyncSessionLocal
+from models.doctor import Doctor
+from services.patient_service import PatientService
+from services.visit_service import VisitService
+from agents.queue.client import (
+    HttpQueueTransport,
+    InProcessQueueTransport,
+    handoff_to_queue_agent,
+    set_queue_transport,
+)
+
+
+async def seed_visits(count: int):
+    async with AsyncSessionLocal() as db:
+        doctor = (
+            await db.execute(select(Doctor).where(Doctor.is_available.is_(True)).limit(1))
+        ).scalar_one_or_none()
+        if not doctor:
+            raise RuntimeError("No available doctor found, seed doctors first")
+
+        payloads = []
+        for _ in range(count):
+            patient = await PatientService.create(
+                db,
+                full_name="Bench Patient",
+                age=30,
+                contact_number=str(uuid4().int)[:10],
+            )
+            visit = await VisitService.create(
+                db,
+                patient_id=patient.id,
+                doctor_id=doctor.id,
+                symptoms_summary="benchmark",
+            )
+            payloads.append(
+                {
+                    "visit_id": visit.id,
+                    "patient_id": patient.id,
+                    "doctor_id": doctor.id,
+                }
+            )
+        return payloads
+
+
+async def run_mode(name, transport, payloads, concurrency, base_date):
+    set_queue_transport(transport)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(index, payload):
+        nonlocal errors
+        async with semaphore:
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                try:
+                    await handoff_to_queue_agent(
+                        {**payload, "queue_date": base_date + timedelta(days=index)},
+                        db,
+                    )
+                    await db.commit()
+                except Exception:
+                    errors += 1
+                    return
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i, p) for i, p in enumerate(payloads)))
+    elapsed = time.perf_counter() - started
+    await transport.aclose()
+
+    latencies.sort()
+    print(f"\n--- {name} ---")
+    print(f"registrations: {len(payloads)}  errors: {errors}")
+    print(f"throughput:    {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"p50:           {statistics.median(latencies):.2f} ms")
+        print(f"p95:           {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registrations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--skip-http", action="store_true")
+    args = parser.parse_args()
+
+    # Far-future dates keep benchmark queues apart from real ones
+    base_date = date.today() + timedelta(days=3650)
+
+    payloads = await seed_visits(args.registrations * 2)
+    inprocess_payloads = payloads[: args.registrations]
+    http_payloads = payloads[args.registrations:]
+
+    await run_mode(
+        "inprocess",
+        InProcessQueueTransport(),
+        inprocess_payloads,
+        args.concurrency,
+        base_date,
+    )
+
+    if not args.skip_http:
+        await run_mode(
+            "http",
+            HttpQueueTransport(),
+            http_payloads,
+            args.concurrency,
+            base_date + timedelta(days=args.registrations),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Commits per message and end-to-end latency of full new-patient
+registrations, with and without the single-transaction unit of work.
+
+Messages go through the registration router handler against the real DB
+(departments and available doctors must be seeded) and the local fake LLM
+server. Commits are counted with an engine "commit" event; session
+persistence is off the request path and not included.
+
+Usage:
+    python scripts/bench_registration_uow.py --registrations 50 --latency-ms 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+
+async def register(db_factory, handler, AgentRequest, commits, timings):
+    """
+    One registration: phone -> details -> symptoms -> confirm -> doctor.
+    Returns True when the queue handoff completed.
+    """
+    session_id = None
+
+    async def send(label, data):
+        nonlocal session_id
+        before = commits[0]
+        started = time.perf_counter()
+        async with db_factory() as db:
+            result = await handler(
+                AgentRequest(session_id=session_id, input=data), db=db, read_db=db
+            )
+        timings[label].append(((time.perf_counter() - started) * 1000, commits[0] - before))
+        session_id = result.session_id
+        return result.response
+
+    await send("phone", {"phone_number": f"7{random.randrange(10**9):09d}"})
+    await send("details", {"full_name": "Bench Patient", "age": 40})
+    await send("symptoms", {"symptoms": "Fever and cough for three days"})
+    response = await send("confirm", {"confirm": True})
+
+    doctors = response.get("doctors") or []
+    if not doctors:
+        return False
+
+    response = await send("doctor", {"doctor_id": doctors[0]["id"]})
+    return "queue_status" in response
+
+
+async def run(mode: str, registrations: int):
+    from sqlalchemy import event
+
+    import agents.registration.router as registration_router
+    from db.session import AsyncSessionLocal, engine
+    from schemas.agent import AgentRequest
+
+    registration_router.REGISTRATION_UNIT_OF_WORK = mode == "unit_of_work"
+
+    commits = [0]
+
+    def count_commit(conn):
+        commits[0] += 1
+
+    event.listen(engine.sync_engine, "commit", count_commit)
+
+    timings = defaultdict(list)
+    completed = 0
+    for _ in range(registrations):
+        completed += await register(
+            AsyncSessionLocal,
+            registration_router.handle_registration_message,
+            AgentRequest,
+            commits,
+            timings,
+        )
+
+    event.remove(engine.sync_engine, "commit", count_commit)
+
+    print(f"\n--- {mode} ---  completed registrations: {completed}/{registrations}")
+    print(f"{'message':<10} {'commits':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    total_commits = 0
+    for label, samples in timings.items():
+        latencies = sorted(ms for ms, _ in samples)
+        per_message = statistics.mean(c for _, c in samples)
+        total_commits += per_message
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        print(f"{label:<10} {per_message:>8.2f} {statistics.median(latencies):>8.2f} {p95:>8.2f}")
+    print(f"commits per registration: {total_commits:.2f}")
+
+
+async def main(args):
+    from services.llm.client import llm_clients
+
+    await run("autocommit", args.registrations)
+    await run("unit_of_work", args.registrations)
+    await llm_clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registrations", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        asyncio.run(main(args))
@@ -0,0 +1,168 @@
+"""
+Bytes written per registration and serializer cost: full-state rewrites
+(the legacy recursive converter) vs delta updates of changed fields.
+
+The message flow is replayed on RegistrationAgentState without the LLM or
+the DB. With --db the same updates are also run against agent_sessions and
+the WAL generated by each strategy is measured with pg_current_wal_lsn().
+
+Usage:
+    python scripts/bench_session_state.py --registrations 1000
+    python scripts/bench_session_state.py --registrations 200 --db
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from agents.registration.state import RegistrationAgentState, RegistrationStep
+
+
+def legacy_serialize(state: dict) -> dict:
+    """The previous Python-level recursive converter, kept for comparison."""
+    def convert_value(v):
+        if isinstance(v, datetime):
+            return v.isoformat()
+        elif isinstance(v, UUID):
+            return str(v)
+        elif isinstance(v, dict):
+            return {k: convert_value(val) for k, val in v.items()}
+        elif isinstance(v, (list, tuple)):
+            return [convert_value(item) for item in v]
+        return v
+
+    return convert_value(state)
+
+
+# One registration as the agent writes it: (fields set) per message
+MESSAGES = [
+    {"phone_number": "9876543210", "step": RegistrationStep.PATIENT_LOOKUP},
+    {"step": RegistrationStep.COLLECT_PATIENT_DETAILS},
+    {"full_name": "Asha Verma", "age": 34, "patient_id": None,
+     "step": RegistrationStep.COLLECT_SYMPTOMS},
+    {"symptoms_raw": "Fever and cough for three days with mild chest discomfort",
+     "symptoms_summary": "Fever and productive cough for 3 days; mild chest discomfort.",
+     "step": RegistrationStep.RESOLVE_DEPARTMENT},
+    {"department_suggested": "General Medicine", "department_confidence": 0.86,
+     "department_reasoning": ["Fever with cough", "No red-flag symptoms"]},
+    {"department_final": "General Medicine", "department_id": None,
+     "step": RegistrationStep.SELECT_DOCTOR},
+    {"doctor_id": None, "step": RegistrationStep.CREATE_VISIT},
+    {"visit_id": None, "step": RegistrationStep.HANDOFF_COMPLETE,
+     "handoff_processed": True},
+]
+
+
+def replay():
+    """
+    Yields (full JSON state, changed fields) after each message.
+    """
+    state_data = RegistrationAgentState().model_dump(mode="json")
+    for fields in MESSAGES:
+        state = RegistrationAgentState(**state_data)
+        for key, value in fields.items():
+            if value is None and key.endswith("_id"):
+                value = uuid4()
+            setattr(state, key, value)
+        state.updated_at = datetime.utcnow()
+
+        changes = state.dump_changes()
+        state_data = {**state_data, **changes}
+        yield state, changes
+
+
+def measure_bytes(registrations: int):
+    full = delta = 0
+    full_cpu = delta_cpu = 0.0
+
+    for _ in range(registrations):
+        for state, _ in replay():
+            started = time.perf_counter()
+            payload = json.dumps(legacy_serialize(state.model_dump()))
+            full_cpu += time.perf_counter() - started
+            full += len(payload)
+
+            started = time.perf_counter()
+            payload = json.dumps(state.dump_changes())
+            delta_cpu += time.perf_counter() - started
+            delta += len(payload)
+
+    print(f"registrations:          {registrations}  messages each: {len(MESSAGES)}")
+    print(f"full rewrite:           {full / registrations:8.0f} bytes/registration  "
+          f"{full_cpu / (registrations * len(MESSAGES)) * 1e6:6.1f} us/message")
+    print(f"delta update:           {delta / registrations:8.0f} bytes/registration  "
+          f"{delta_cpu / (registrations * len(MESSAGES)) * 1e6:6.1f} us/message")
+    print(f"reduction:              {1 - delta / full:.1%}")
+
+
+async def measure_wal(registrations: int):
+    from sqlalchemy import delete, text, update
+    from sqlalchemy.sql import func
+
+    from db.session import AsyncSessionLocal
+    from services.agent_session_service import AgentSessionService, agent_sessions
+
+    async def wal_lsn(db):
+        return (await db.execute(text("SELECT pg_current_wal_lsn()"))).scalar()
+
+    async def wal_bytes(db, start):
+        return (await db.execute(
+            text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), :start)"),
+            {"start": start},
+        )).scalar()
+
+    async with AsyncSessionLocal() as db:
+        results = {}
+        for strategy in ("full", "delta"):
+            session_ids = []
+            for _ in range(registrations):
+                session_ids.append(await AgentSessionService.create(
+                    db, "registration_agent",
+                    RegistrationAgentState().model_dump(mode="json"),
+                ))
+
+            start = await wal_lsn(db)
+            for session_id in session_ids:
+                for state, changes in replay():
+                    if strategy == "full":
+                        await db.execute(
+                            update(agent_sessions)
+                            .where(agent_sessions.c.session_id == session_id)
+                            .values(
+                                state=legacy_serialize(state.model_dump()),
+                                updated_at=func.now(),
+                            )
+                        )
+                        await db.commit()
+                    else:
+                        await AgentSessionService.update(db, session_id, changes)
+            results[strategy] = await wal_bytes(db, start)
+
+            await db.execute(
+                delete(agent_sessions).where(agent_sessions.c.session_id.in_(session_ids))
+            )
+            await db.commit()
+
+    print()
+    for strategy, written in results.items():
+        print(f"WAL {strategy + ':':<19} {written / registrations:8.0f} bytes/registration")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registrations", type=int, default=1000)
+    parser.add_argument("--db", action="store_true", help="also measure WAL on Postgres")
+    args = parser.parse_args()
+
+    measure_bytes(args.registrations)
+    if args.db:
+        asyncio.run(measure_wal(args.registrations))
@@ -0,0 +1,89 @@
+"""
+p50/p95 of the LLM part of a registration (symptoms -> department
+suggestion) in two-stage and fused triage modes, against the local fake
+LLM server. The response cache is bypassed so every registration pays its
+round trips.
+
+Usage:
+    python scripts/bench_triage_modes.py --registrations 200 --concurrency 20 \
+        --latency-ms 400 --distribution lognormal
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+DEPARTMENTS = ["General Medicine", "Cardiology", "Orthopedics", "Pediatrics"]
+SYMPTOMS = "Fever and cough for three days with mild chest discomfort"
+
+
+async def two_stage():
+    from services.llm.symptom_summarizer import SymptomSummarizerService
+    from services.llm.department_resolver import DepartmentResolverService
+
+    summary = await SymptomSummarizerService.summarize(SYMPTOMS, use_cache=False)
+    return await DepartmentResolverService.resolve(
+        summary, 40, DEPARTMENTS, use_cache=False
+    )
+
+
+async def fused():
+    from services.llm.triage import TriageService
+
+    return await TriageService.triage(SYMPTOMS, 40, DEPARTMENTS, use_cache=False)
+
+
+async def run(name, flow, registrations, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            result = await flow()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not result:
+                failures += 1
+
+    await asyncio.gather(*(one() for _ in range(registrations)))
+
+    latencies.sort()
+    print(f"\n--- {name} ---")
+    print(f"registrations: {registrations}  invalid results: {failures}")
+    print(f"p50:           {statistics.median(latencies):.2f} ms")
+    print(f"p95:           {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+
+
+async def main(args):
+    from services.llm.client import llm_clients
+
+    await run("two_stage", two_stage, args.registrations, args.concurrency)
+    await run("fused", fused, args.registrations, args.concurrency)
+    await llm_clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registrations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        asyncio.run(main(args))
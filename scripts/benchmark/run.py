@@ -0,0 +1,177 @@
+"""
+Reproducible benchmark of the queue and registration APIs.
+
+Seeds M departments / N doctors / K pre-booked patients, then runs:
+  morning_rush   intake + check-in of every pre-booked visit
+  clinic_hours   call-next -> start -> end loops per doctor while
+                 dashboards poll GET /status
+  registrations  walk-in chat registrations (fake LLM with configurable
+                 latency behind the API)
+and writes throughput and p50/p95/p99 per endpoint to JSON. With
+--baseline, p95 or throughput regressions beyond --tolerance fail the run.
+
+Usage:
+    # spawn the API against the local fake LLM server
+    python scripts/benchmark/run.py --spawn-api --doctors 20 --patients-per-day 400 \
+        --latency-ms 300 --distribution lognormal --output bench.json
+    # compare with a previous run
+    python scripts/benchmark/run.py --spawn-api --baseline bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+benchmark_dir = Path(__file__).resolve().parent
+repo_root = benchmark_dir.parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+sys.path.insert(0, str(benchmark_dir))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+from scenarios import clinic_hours, morning_rush, registrations
+from seed import cleanup, seed
+
+
+def spawn_api(port: int, llm_url: str) -> subprocess.Popen:
+    env = {**os.environ, "GROQ_BASE_URL": llm_url}
+    env.setdefault("GROQ_API_KEY", "fake")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=api_path,
+        env=env,
+    )
+
+
+async def wait_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).is_success:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not become healthy")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Endpoints whose p95 grew, or throughput dropped, by more than tolerance.
+    """
+    regressions = []
+    for scenario, result in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {}).get("endpoints", {})
+        for label, now in result["endpoints"].items():
+            before = previous.get(label)
+            if not before:
+                continue
+            if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{scenario} / {label}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+            if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{scenario} / {label}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s"
+                )
+    return regressions
+
+
+async def main(args, llm_url: str):
+    data = await seed(
+        departments=args.departments,
+        doctors=args.doctors,
+        patients_per_day=args.patients_per_day,
+        seed=args.data_seed,
+    )
+    print(f"seeded run {data.run_id}: {len(data.doctor_ids)} doctors, {len(data.visits)} visits")
+
+    api = None
+    if args.spawn_api:
+        api = spawn_api(args.api_port, llm_url)
+        args.base_url = f"http://127.0.0.1:{args.api_port}"
+
+    report = {
+        "started_at": datetime.utcnow().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("baseline", "output")},
+        "scenarios": {},
+    }
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    try:
+        await wait_healthy(args.base_url)
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            print("morning_rush ...")
+            report["scenarios"]["morning_rush"] = await morning_rush(client, data, args.concurrency)
+
+            print("clinic_hours ...")
+            report["scenarios"]["clinic_hours"] = await clinic_hours(
+                client, data, args.rounds, args.dashboards, args.poll_interval
+            )
+
+            if args.registrations:
+                print("registrations ...")
+                report["scenarios"]["registrations"] = await registrations(
+                    client, args.registrations, args.concurrency
+                )
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait()
+        if not args.keep_data:
+            await cleanup()
+
+    for scenario, result in report["scenarios"].items():
+        print(f"\n--- {scenario} ({result['duration_s']} s) ---")
+        for label, stats in result["endpoints"].items():
+            print(
+                f"{label:<52} {stats['count']:>6} {stats['throughput_rps']:>8.1f}/s "
+                f"p50 {stats['p50_ms']:>8.1f}  p95 {stats['p95_ms']:>8.1f}  p99 {stats['p99_ms']:>8.1f}  "
+                f"err {stats['errors']}"
+            )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nreport written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nno regressions against baseline")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn-api", action="store_true", help="start uvicorn wired to the fake LLM")
+    parser.add_argument("--api-port", type=int, default=8801)
+    parser.add_argument("--llm-port", type=int, default=8900)
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--doctors", type=int, default=20)
+    parser.add_argument("--patients-per-day", type=int, default=400)
+    parser.add_argument("--data-seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=10, help="call-next cycles per doctor")
+    parser.add_argument("--dashboards", type=int, default=50)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--registrations", type=int, default=50)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--keep-data", action="store_true")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.llm_port) as llm:
+        asyncio.run(main(args, llm.url))
@@ -0,0 +1,253 @@
+"""
+Scenario drivers for the benchmark suite. Each talks HTTP to a running
+API and records latency per endpoint label into a Recorder.
+"""
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+from seed import BENCH_PREFIX, SeedData
+
+
+class Recorder:
+    """
+    Latency samples per endpoint. 4xx responses are business rejections
+    (e.g. "No patients waiting"), 5xx and transport failures are errors.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished = None
+
+    async def call(self, label: str, request) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 500:
+            self.errors[label] += 1
+        elif response.status_code >= 400:
+            self.rejected[label] += 1
+        return response
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        duration = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            endpoints[label] = {
+                "count": len(ordered),
+                "errors": self.errors[label],
+                "rejected": self.rejected[label],
+                "throughput_rps": round(len(ordered) / duration, 2) if duration else 0.0,
+                "p50_ms": round(statistics.median(ordered), 3),
+                "p95_ms": round(_percentile(ordered, 0.95), 3),
+                "p99_ms": round(_percentile(ordered, 0.99), 3),
+            }
+        return {"duration_s": round(duration, 3), "endpoints": endpoints}
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def _bounded(concurrency: int, jobs):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            await job
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+
+# ------------------------------------------------------------------
+# Morning rush: every pre-booked visit is queued, most patients check in
+# ------------------------------------------------------------------
+
+async def morning_rush(
+    client: httpx.AsyncClient,
+    data: SeedData,
+    concurrency: int,
+    check_in_ratio: float = 0.7,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+
+    async def arrive(visit):
+        response = await recorder.call("POST /agents/queue/intake", client.post(
+            "/agents/queue/intake",
+            json={
+                "visit_id": visit.visit_id,
+                "patient_id": visit.patient_id,
+                "doctor_id": visit.doctor_id,
+                "queue_date": visit.queue_date,
+            },
+        ))
+        if response is None or not response.is_success or not response.json().get("accepted"):
+            return
+        if random.random() < check_in_ratio:
+            await recorder.call("POST /agents/queue/check-in", client.post(
+                "/agents/queue/check-in",
+                json={"visit_id": visit.visit_id, "queue_date": visit.queue_date},
+            ))
+
+    await _bounded(concurrency, [arrive(visit) for visit in data.visits])
+    recorder.stop()
+    return recorder.report()
+
+
+# ------------------------------------------------------------------
+# Clinic hours: doctors call patients while dashboards poll status
+# ------------------------------------------------------------------
+
+async def call_next_loop(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    doctor_id: str,
+    queue_date: str,
+    rounds: int,
+) -> None:
+    for _ in range(rounds):
+        response = await recorder.call("POST /agents/queue/call-next", client.post(
+            "/agents/queue/call-next",
+            json={"doctor_id": doctor_id, "queue_date": queue_date},
+        ))
+        if response is None or not response.is_success:
+            return
+
+        body = {
+            "doctor_id": doctor_id,
+            "visit_id": response.json()["visit_id"],
+            "queue_date": queue_date,
+        }
+        await recorder.call("POST /agents/queue/start-consultation", client.post(
+            "/agents/queue/start-consultation", json=body,
+        ))
+        await recorder.call("POST /agents/queue/end-consultation", client.post(
+            "/agents/queue/end-consultation", json=body,
+        ))
+
+
+async def polling_dashboard(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    data: SeedData,
+    interval: float,
+    stop: asyncio.Event,
+) -> None:
+    visit = random.choice(data.visits)
+    role = random.choice(["receptionist", "doctor", "patient"])
+    params = {"doctor_id": visit.doctor_id, "queue_date": visit.queue_date, "role": role}
+    if role == "patient":
+        params["visit_id"] = visit.visit_id
+
+    while not stop.is_set():
+        await recorder.call(
+            f"GET /agents/queue/status ({role})",
+            client.get("/agents/queue/status", params=params),
+        )
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def clinic_hours(
+    client: httpx.AsyncClient,
+    data: SeedData,
+    rounds: int,
+    dashboards: int,
+    poll_interval: float,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    stop = asyncio.Event()
+    queue_date = data.visits[0].queue_date if data.visits else None
+
+    pollers = [
+        asyncio.create_task(polling_dashboard(client, recorder, data, poll_interval, stop))
+        for _ in range(dashboards)
+    ]
+    await asyncio.gather(*(
+        call_next_loop(client, recorder, doctor_id, queue_date, rounds)
+        for doctor_id in data.doctor_ids
+    ))
+    stop.set()
+    await asyncio.gather(*pollers)
+
+    recorder.stop()
+    return recorder.report()
+
+
+# ------------------------------------------------------------------
+# Walk-in registrations through the chat agent (fake LLM behind it)
+# ------------------------------------------------------------------
+
+async def registration_flow(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    phone: str,
+) -> bool:
+    session_id = None
+
+    async def send(label, data):
+        nonlocal session_id
+        response = await recorder.call(
+            f"POST /agents/registration/message ({label})",
+            client.post(
+                "/agents/registration/message",
+                json={"session_id": session_id, "input": data},
+            ),
+        )
+        if response is None or not response.is_success:
+            return None
+        body = response.json()
+        session_id = body["session_id"]
+        return body["response"]
+
+    if await send("phone", {"phone_number": phone}) is None:
+        return False
+    await send("details", {"full_name": f"{BENCH_PREFIX} Walk-in {phone}", "age": 40})
+    await send("symptoms", {"symptoms": "Fever and cough for three days"})
+    response = await send("confirm", {"confirm": True})
+
+    doctors = (response or {}).get("doctors") or []
+    if not doctors:
+        return False
+    response = await send("doctor", {"doctor_id": doctors[0]["id"]})
+    return bool(response and "queue_status" in response)
+
+
+async def registrations(
+    client: httpx.AsyncClient,
+    count: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    completed = 0
+    prefix = f"4{random.randrange(10_000):04d}"
+
+    async def one(i):
+        nonlocal completed
+        completed += await registration_flow(client, recorder, f"{prefix}{i:05d}")
+
+    await _bounded(concurrency, [one(i) for i in range(count)])
+    recorder.stop()
+
+    report = recorder.report()
+    report["completed"] = completed
+    return report
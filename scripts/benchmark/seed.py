@@ -0,0 +1,203 @@
+"""
+Seed generator for the benchmark suite: M departments, N doctors and, per
+day, K patients with a scheduled visit each (spread over the doctors).
+
+Rows are tagged with a run id in names so cleanup only removes benchmark
+data:
+    python scripts/benchmark/seed.py --departments 5 --doctors 20 --patients-per-day 400
+    python scripts/benchmark/seed.py --cleanup
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[2]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import delete, insert, or_, select
+
+from db.session import AsyncSessionLocal
+from models.department import Department
+from models.doctor import Doctor
+from models.doctor_queue import DoctorQueue
+from models.patient import Patient
+from models.queue_entry import QueueEntry
+from models.visit import Visit
+
+BENCH_PREFIX = "Bench"
+
+SYMPTOM_TEMPLATES = [
+    "Fever and cough for {n} days",
+    "Chest pain on exertion since {n} days",
+    "Knee pain and swelling after a fall {n} days ago",
+    "Itchy skin rash on both arms for {n} days",
+    "Headache and dizziness for {n} days",
+    "Stomach ache and vomiting since {n} days",
+]
+
+
+@dataclass
+class SeededVisit:
+    visit_id: str
+    patient_id: str
+    doctor_id: str
+    queue_date: str
+
+
+@dataclass
+class SeedData:
+    run_id: str
+    department_ids: List[str] = field(default_factory=list)
+    department_names: List[str] = field(default_factory=list)
+    doctor_ids: List[str] = field(default_factory=list)
+    visits: List[SeededVisit] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SeedData":
+        data = json.loads(raw)
+        data["visits"] = [SeededVisit(**v) for v in data["visits"]]
+        return cls(**data)
+
+
+def _chunks(rows, size=1000):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+async def seed(
+    *,
+    departments: int,
+    doctors: int,
+    patients_per_day: int,
+    days: int = 1,
+    start_date: date | None = None,
+    seed: int | None = None,
+) -> SeedData:
+    rng = random.Random(seed)
+    start_date = start_date or datetime.utcnow().date()
+    # Names/phones must not collide with a kept earlier run, so these are
+    # not drawn from the seeded generator
+    run_id = uuid.uuid4().hex[:6]
+    # Phone numbers are unique: 5 + 4-digit run number + 5-digit sequence
+    phone_prefix = f"5{random.randrange(10_000):04d}"
+    data = SeedData(run_id=run_id)
+
+    department_rows = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"{BENCH_PREFIX} {run_id} Dept {i}",
+            "description": f"Benchmark department {i}",
+        }
+        for i in range(departments)
+    ]
+    doctor_rows = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"{BENCH_PREFIX} {run_id} Doctor {i}",
+            "specialization": "General",
+            "is_available": True,
+            "department_id": department_rows[i % departments]["id"],
+        }
+        for i in range(doctors)
+    ]
+
+    patient_rows, visit_rows = [], []
+    sequence = 0
+    for day in range(days):
+        queue_date = start_date + timedelta(days=day)
+        for _ in range(patients_per_day):
+            patient_id, visit_id = uuid.uuid4(), uuid.uuid4()
+            doctor = doctor_rows[rng.randrange(doctors)]
+            patient_rows.append({
+                "id": patient_id,
+                "full_name": f"{BENCH_PREFIX} {run_id} Patient {sequence}",
+                "age": rng.randint(18, 80),
+                "contact_number": f"{phone_prefix}{sequence:05d}",
+            })
+            visit_rows.append({
+                "id": visit_id,
+                "patient_id": patient_id,
+                "doctor_id": doctor["id"],
+                "symptoms_summary": rng.choice(SYMPTOM_TEMPLATES).format(n=rng.randint(1, 7)),
+                "status": "scheduled",
+            })
+            data.visits.append(SeededVisit(
+                str(visit_id), str(patient_id), str(doctor["id"]), queue_date.isoformat()
+            ))
+            sequence += 1
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Department), department_rows)
+        await db.execute(insert(Doctor), doctor_rows)
+        for chunk in _chunks(patient_rows):
+            await db.execute(insert(Patient), chunk)
+        for chunk in _chunks(visit_rows):
+            await db.execute(insert(Visit), chunk)
+        await db.commit()
+
+    data.department_ids = [str(d["id"]) for d in department_rows]
+    data.department_names = [d["name"] for d in department_rows]
+    data.doctor_ids = [str(d["id"]) for d in doctor_rows]
+    return data
+
+
+async def cleanup() -> None:
+    """
+    Removes every benchmark run (rows whose names carry BENCH_PREFIX).
+    """
+    async with AsyncSessionLocal() as db:
+        doctor_ids = select(Doctor.id).join(Department).where(
+            Department.name.like(f"{BENCH_PREFIX} %")
+        )
+        patient_ids = select(Patient.id).where(Patient.full_name.like(f"{BENCH_PREFIX} %"))
+        # Registration scenarios may book bench patients with other doctors
+        visit_ids = select(Visit.id).where(
+            or_(Visit.doctor_id.in_(doctor_ids), Visit.patient_id.in_(patient_ids))
+        )
+
+        await db.execute(delete(QueueEntry).where(QueueEntry.visit_id.in_(visit_ids)))
+        await db.execute(delete(DoctorQueue).where(DoctorQueue.doctor_id.in_(doctor_ids)))
+        await db.execute(delete(Visit).where(Visit.id.in_(visit_ids)))
+        await db.execute(delete(Patient).where(Patient.id.in_(patient_ids)))
+        await db.execute(delete(Doctor).where(Doctor.id.in_(doctor_ids)))
+        await db.execute(delete(Department).where(Department.name.like(f"{BENCH_PREFIX} %")))
+        await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--doctors", type=int, default=20)
+    parser.add_argument("--patients-per-day", type=int, default=400)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="write the seeded ids as JSON")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        asyncio.run(cleanup())
+        print("benchmark data removed")
+    else:
+        data = asyncio.run(seed(
+            departments=args.departments,
+            doctors=args.doctors,
+            patients_per_day=args.patients_per_day,
+            days=args.days,
+            seed=args.seed,
+        ))
+        print(f"run {data.run_id}: {len(data.doctor_ids)} doctors, {len(data.visits)} visits")
+        if args.output:
+            Path(args.output).write_text(data.to_json())
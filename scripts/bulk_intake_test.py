@@ -0,0 +1,160 @@
+"""
+Imports a batch of visits for several doctors through
+QueueService.bulk_intake and checks per-item results, contiguous tokens
+per queue and the shift-capacity cut-off, then compares the import time
+with the same number of single intakes.
+
+Usage:
+    python scripts/bulk_intake_test.py --doctors 5 --per-doctor 40
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import delete, select
+
+from db.session import AsyncSessionLocal
+from models.department import Department
+from models.doctor import Doctor
+from models.doctor_queue import DoctorQueue
+from models.queue_entry import QueueEntry
+from agents.queue.schemas import QueueIntakeRequest
+from services.queue_service import QueueService
+
+
+async def create_doctors(count):
+    async with AsyncSessionLocal() as db:
+        department_id = (await db.execute(select(Department.id).limit(1))).scalar_one()
+        doctors = [
+            Doctor(name=f"Bulk Test {i}", department_id=department_id) for i in range(count)
+        ]
+        db.add_all(doctors)
+        await db.commit()
+        return [doctor.id for doctor in doctors]
+
+
+async def create_queue(doctor_id, queue_date, end=dtime(23, 59)):
+    async with AsyncSessionLocal() as db:
+        queue = DoctorQueue(
+            doctor_id=doctor_id,
+            queue_date=queue_date,
+            shift_start_time=dtime(0, 0),
+            shift_end_time=end,
+            avg_consult_time_minutes=1,
+            queue_open=True,
+        )
+        db.add(queue)
+        await db.commit()
+        return queue.id
+
+
+def make_items(doctor_ids, queue_date, per_doctor):
+    # Interleaved across doctors, like a real import file
+    return [
+        QueueIntakeRequest(
+            visit_id=uuid4(),
+            patient_id=uuid4(),
+            doctor_id=doctor_id,
+            queue_date=queue_date,
+        )
+        for _ in range(per_doctor)
+        for doctor_id in doctor_ids
+    ]
+
+
+async def run_test(doctors: int, per_doctor: int):
+    queue_date = date.today() + timedelta(days=3650)
+    doctor_ids = await create_doctors(2 * doctors + 1)
+    bulk_doctors = doctor_ids[:doctors]
+    single_doctors = doctor_ids[doctors:2 * doctors]
+    small_doctor = doctor_ids[-1]
+
+    queue_ids = [await create_queue(d, queue_date) for d in bulk_doctors + single_doctors]
+    # 10 one-minute slots
+    queue_ids.append(await create_queue(small_doctor, queue_date, end=dtime(0, 10)))
+
+    try:
+        # 1️⃣ Bulk import
+        items = make_items(bulk_doctors, queue_date, per_doctor)
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            response = await QueueService.bulk_intake(db, items)
+            bulk_ms = (time.perf_counter() - started) * 1000
+
+        assert response.accepted == len(items) and response.rejected == 0
+        assert [r.visit_id for r in response.results] == [i.visit_id for i in items], \
+            "results not in request order"
+
+        async with AsyncSessionLocal() as db:
+            for doctor_id in bulk_doctors:
+                tokens = [r.token_number for r in response.results if r.doctor_id == doctor_id]
+                assert tokens == list(range(1, per_doctor + 1)), f"tokens not contiguous: {tokens}"
+
+                stored = (
+                    await db.execute(
+                        select(QueueEntry.token_number)
+                        .join(DoctorQueue)
+                        .where(DoctorQueue.doctor_id == doctor_id)
+                    )
+                ).scalars().all()
+                assert sorted(stored) == tokens, "stored tokens differ from results"
+
+        # 2️⃣ Re-importing the same visits rejects each one
+        async with AsyncSessionLocal() as db:
+            again = await QueueService.bulk_intake(db, items[:doctors])
+        assert again.accepted == 0
+        assert all(r.reason == "Visit already in queue" for r in again.results)
+
+        # 3️⃣ Capacity cut-off: 15 visits, 10 slots
+        async with AsyncSessionLocal() as db:
+            capped = await QueueService.bulk_intake(db, make_items([small_doctor], queue_date, 15))
+        assert capped.accepted == 10 and capped.rejected == 5
+        assert all(r.accepted for r in capped.results[:10])
+        assert all(
+            r.reason == "Doctor shift will end before consultation" for r in capped.results[10:]
+        )
+
+        # 4️⃣ Unknown doctor: rejected per item, no queue created
+        async with AsyncSessionLocal() as db:
+            mixed = await QueueService.bulk_intake(
+                db, make_items([uuid4(), small_doctor], queue_date, 1)
+            )
+        assert [r.reason for r in mixed.results] == [
+            "Doctor not found", "Doctor queue is closed for today"
+        ], mixed.results
+
+        # 5️⃣ Same volume through single intakes
+        single_items = make_items(single_doctors, queue_date, per_doctor)
+        started = time.perf_counter()
+        for item in single_items:
+            async with AsyncSessionLocal() as db:
+                result = await QueueService.intake(db, item)
+                assert result.accepted
+        single_ms = (time.perf_counter() - started) * 1000
+
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(DoctorQueue).where(DoctorQueue.id.in_(queue_ids)))
+            await db.execute(delete(Doctor).where(Doctor.id.in_(doctor_ids)))
+            await db.commit()
+
+    print(f"bulk:   {len(items)} visits in {bulk_ms:.1f} ms")
+    print(f"single: {len(single_items)} visits in {single_ms:.1f} ms ({single_ms / bulk_ms:.1f}x)")
+    print(f"✅ bulk intake for {doctors} doctors, contiguous tokens, capacity enforced")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=5)
+    parser.add_argument("--per-doctor", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(run_test(args.doctors, args.per_doctor))
@@ -0,0 +1,53 @@
+"""
+Consistency check for the per-status counters on doctor_queues: recounts
+queue_entries and reports every queue whose counters drifted.
+
+Usage:
+    python scripts/check_queue_counters.py                   # all queues
+    python scripts/check_queue_counters.py --date 2025-01-31
+    python scripts/check_queue_counters.py --date 2025-01-31 --repair
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from db.session import AsyncSessionLocal
+from services.queue_service import QueueService
+
+
+async def run_check(queue_date: date | None, repair: bool) -> int:
+    async with AsyncSessionLocal() as db:
+        drift = await QueueService.check_counters(db, queue_date, repair=repair)
+
+    for report in drift:
+        diff = ", ".join(
+            f"{status} {report.stored[status]} -> {report.actual[status]}"
+            for status in report.actual
+            if report.stored[status] != report.actual[status]
+        )
+        print(f"queue {report.queue_id} (doctor {report.doctor_id}, {report.queue_date}): {diff}")
+
+    if not drift:
+        print("✅ Queue counters match queue entries")
+    elif repair:
+        print(f"🔧 Repaired counters on {len(drift)} queue(s)")
+    else:
+        print(f"❌ {len(drift)} queue(s) drifted, rerun with --repair to fix")
+    return len(drift)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", type=date.fromisoformat, help="only queues of this day")
+    parser.add_argument("--repair", action="store_true", help="overwrite drifted counters")
+    args = parser.parse_args()
+
+    drifted = asyncio.run(run_check(args.date, args.repair))
+    sys.exit(1 if drifted and not args.repair else 0)
@@ -0,0 +1,116 @@
+"""
+Offline evaluation of the local department pre-classifier.
+
+Labels come from historical visits (department of the visited doctor) or
+from a CSV with `text,department` columns. A holdout split is classified
+and, per confidence threshold, we report how many registrations skip the
+LLM and how accurate those local answers are.
+
+Usage:
+    python scripts/eval_department_classifier.py
+    python scripts/eval_department_classifier.py --csv labelled_symptoms.csv --test-fraction 0.3
+"""
+import argparse
+import asyncio
+import csv
+import random
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import select
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.75, 0.8, 0.9]
+
+
+async def load_from_db(limit: int):
+    from db.session import AsyncSessionLocal
+    from models.department import Department
+    from models.doctor import Doctor
+    from models.visit import Visit
+
+    async with AsyncSessionLocal() as db:
+        departments = (
+            await db.execute(select(Department.name, Department.description))
+        ).all()
+        labelled = (
+            await db.execute(
+                select(Visit.symptoms_summary, Department.name)
+                .join(Doctor, Visit.doctor_id == Doctor.id)
+                .join(Department, Doctor.department_id == Department.id)
+                .where(Visit.symptoms_summary.is_not(None))
+                .order_by(Visit.created_at.desc())
+                .limit(limit)
+            )
+        ).all()
+
+    seed_documents = {
+        name: [f"{name} {description or ''}"] for name, description in departments
+    }
+    return seed_documents, [(text, name) for text, name in labelled]
+
+
+def load_from_csv(path: str):
+    with open(path, newline="") as f:
+        rows = [(row["text"], row["department"]) for row in csv.DictReader(f)]
+    seed_documents = {name: [name] for _, name in rows}
+    return seed_documents, rows
+
+
+def evaluate(seed_documents, labelled, test_fraction: float, seed: int):
+    from services.department_classifier import DepartmentClassifier
+
+    random.Random(seed).shuffle(labelled)
+    split = int(len(labelled) * (1 - test_fraction))
+    train, test = labelled[:split], labelled[split:]
+
+    documents = {name: list(texts) for name, texts in seed_documents.items()}
+    for text, name in train:
+        documents.setdefault(name, []).append(text)
+
+    classifier = DepartmentClassifier.build(documents)
+    allowed = list(documents)
+
+    predictions = []
+    for text, expected in test:
+        result = classifier.classify(text, allowed)
+        predictions.append((result, expected))
+
+    answered = [(r, e) for r, e in predictions if r]
+    top1 = sum(1 for r, e in answered if r["department"] == e)
+
+    print(f"train: {len(train)}  test: {len(test)}  departments: {len(allowed)}")
+    print(f"top-1 accuracy (any confidence): {top1 / len(test):.3f}" if test else "no test data")
+    print()
+    print(f"{'threshold':>9}  {'llm avoided':>11}  {'local accuracy':>14}")
+
+    for threshold in THRESHOLDS:
+        confident = [(r, e) for r, e in answered if r["confidence"] >= threshold]
+        correct = sum(1 for r, e in confident if r["department"] == e)
+        avoided = len(confident) / len(test) if test else 0.0
+        accuracy = correct / len(confident) if confident else 0.0
+        print(f"{threshold:>9.2f}  {avoided:>11.1%}  {accuracy:>14.1%}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", help="labelled CSV with text,department columns")
+    parser.add_argument("--limit", type=int, default=10000)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.csv:
+        seed_documents, labelled = load_from_csv(args.csv)
+    else:
+        seed_documents, labelled = await load_from_db(args.limit)
+
+    evaluate(seed_documents, labelled, args.test_fraction, args.seed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+Usage:
+    python scripts/fake_llm_server.py --port 8900 --latency-ms 300 --distribution lognormal
+    GROQ_BASE_URL=http://127.0.0.1:8900 GROQ_API_KEY=fake uvicorn main:app
+
+Summarizer prompts get plain text back; every other prompt gets triage JSON
+(summary, department, confidence, reasoning) with a department taken from
+the prompt's allowed list. GET /stats returns request counts, POST /reset
+clears them.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 200.0
+    # fixed | uniform | lognormal | pareto (heavy tail)
+    distribution: str = "fixed"
+    # uniform: +/- jitter; lognormal: sigma; pareto: shape (alpha)
+    spread: float = 0.5
+    department: Optional[str] = None
+    confidence: float = 0.9
+    # Per-model confidence overrides, e.g. {"llama-3.1-8b-instant": 0.6}
+    model_confidence: Dict[str, float] = field(default_factory=dict)
+    seed: Optional[int] = None
+
+
+_DEPARTMENT_LIST = re.compile(r"list ONLY:\s*\n\s*(.+)")
+
+
+class FakeLLM:
+
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.requests = 0
+        self.by_model: Dict[str, int] = {}
+
+    def delay_seconds(self) -> float:
+        base = self.config.latency_ms / 1000
+        spread = self.config.spread
+
+        if self.config.distribution == "uniform":
+            return max(0.0, base * (1 + self.random.uniform(-spread, spread)))
+        if self.config.distribution == "lognormal":
+            return base * self.random.lognormvariate(0, spread)
+        if self.config.distribution == "pareto":
+            # base is the minimum; alpha <= 2 gives multi-second stragglers
+            return base * self.random.paretovariate(max(spread, 1.01))
+        return base
+
+    def content(self, model: str, messages) -> str:
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        prompt = next((m["content"] for m in messages if m["role"] == "user"), "")
+        symptoms = prompt.rsplit("Symptoms:", 1)[-1].strip()
+
+        if "summarizer" in system:
+            return f"Patient reports {symptoms[:200]}"
+
+        departments = []
+        match = _DEPARTMENT_LIST.search(prompt)
+        if match:
+            departments = [d.strip() for d in match.group(1).split(",") if d.strip()]
+
+        department = self.config.department
+        if department not in departments:
+            department = departments[0] if departments else (department or "General Medicine")
+
+        return json.dumps(
+            {
+                "summary": f"Patient reports {symptoms[:200]}",
+                "department": department,
+                "confidence": self.config.model_confidence.get(model, self.config.confidence),
+                "reasoning": ["Synthetic response from fake LLM server"],
+            }
+        )
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    fake = FakeLLM(config)
+    app.state.fake = fake
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fake.requests += 1
+        fake.by_model[body["model"]] = fake.by_model.get(body["model"], 0) + 1
+
+        await asyncio.sleep(fake.delay_seconds())
+
+        content = fake.content(body["model"], body["messages"])
+        return {
+            "id": f"chatcmpl-fake-{fake.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": fake.requests, "by_model": fake.by_model}
+
+    @app.post("/reset")
+    async def reset():
+        fake.requests = 0
+        fake.by_model = {}
+        return {"ok": True}
+
+    return app
+
+
+class FakeLLMServer:
+    """
+    Runs the fake server on a background thread (for benchmark scripts).
+    """
+
+    def __init__(self, config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 8900):
+        self.app = create_app(config)
+        self.url = f"http://{host}:{port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host=host, port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def fake(self) -> FakeLLM:
+        return self.app.state.fake
+
+    def __enter__(self) -> "FakeLLMServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "lognormal", "pareto"],
+        default="fixed",
+    )
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--department", default=None)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeLLMConfig:
+    return FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        distribution=args.distribution,
+        spread=args.spread,
+        department=args.department,
+        confidence=args.confidence,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port)
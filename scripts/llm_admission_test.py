@@ -0,0 +1,110 @@
+"""
+LLM admission control against a slow local fake LLM server:
+- a call past LLM_DEADLINE_SECONDS fails fast with LLMUnavailableError
+- LLM_BREAKER_FAILURE_THRESHOLD failures open the breaker; calls are then
+  refused without touching upstream
+- after LLM_BREAKER_RESET_SECONDS one probe goes through and closes it
+- callers beyond LLM_MAX_CONCURRENCY wait at most LLM_ADMISSION_TIMEOUT_SECONDS,
+  and those refusals do not count against the model's breaker
+
+Usage:
+    python scripts/llm_admission_test.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMConfig, FakeLLMServer
+
+DEADLINE = 0.3
+RESET = 0.5
+MESSAGES = [{"role": "user", "content": "Symptoms:\nfever"}]
+
+
+async def main(server):
+    from services.llm.circuit_breaker import LLMUnavailableError
+    from services.llm.client import LLMClientRegistry
+
+    clients = LLMClientRegistry(max_concurrency=2)
+    model = "llama-3.1-8b-instant"
+
+    async def call():
+        started = time.perf_counter()
+        try:
+            await clients.chat(model=model, messages=MESSAGES, temperature=0)
+            return None, time.perf_counter() - started
+        except LLMUnavailableError as e:
+            return e.reason, time.perf_counter() - started
+
+    try:
+        # 1️⃣ Deadline: upstream takes 2 s, calls give up after DEADLINE
+        server.fake.config.latency_ms = 2000
+        for _ in range(3):
+            reason, elapsed = await call()
+            assert reason == "deadline" and elapsed < DEADLINE + 0.2, (reason, elapsed)
+        assert clients.breaker(model).state == "open"
+
+        # 2️⃣ Open breaker: refused immediately, nothing sent upstream
+        before = server.fake.requests
+        reason, elapsed = await call()
+        assert reason == "circuit_open" and elapsed < 0.01
+        assert server.fake.requests == before
+        print("✅ deadline enforced, breaker opened after 3 failures and refuses calls")
+
+        # 3️⃣ Upstream recovers: the half-open probe closes the breaker
+        server.fake.config.latency_ms = 10
+        await asyncio.sleep(RESET)
+        reason, _ = await call()
+        assert reason is None and clients.breaker(model).state == "closed"
+        print("✅ half-open probe closed the breaker")
+
+        # 4️⃣ Admission: 2 slots held by slow calls, the 3rd is refused quickly
+        server.fake.config.latency_ms = 250
+        results = await asyncio.gather(call(), call(), call())
+        refused = [r for r in results if r[0] == "admission_timeout"]
+        assert len(refused) == 1 and refused[0][1] < 0.2, results
+        print("✅ admission wait bounded by LLM_ADMISSION_TIMEOUT_SECONDS")
+
+        # 5️⃣ A full pool is not the model's fault: other models' calls hold
+        # every slot and this model's breaker stays closed however often it waits
+        server.fake.config.latency_ms = 250
+        other = "llama-3.3-70b-versatile"
+        for _ in range(3):
+            results = await asyncio.gather(
+                clients.chat(model=other, messages=MESSAGES, temperature=0),
+                clients.chat(model=other, messages=MESSAGES, temperature=0),
+                call(),
+            )
+            assert results[2][0] == "admission_timeout", results
+        breaker = clients.breaker(model)
+        assert breaker.state == "closed" and breaker.failures == 0, breaker.stats()
+        print("✅ admission refusals leave the per-model breaker alone")
+    finally:
+        await clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    with FakeLLMServer(FakeLLMConfig(latency_ms=10), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        os.environ.update({
+            "LLM_DEADLINE_SECONDS": str(DEADLINE),
+            "LLM_ADMISSION_TIMEOUT_SECONDS": "0.1",
+            "LLM_BREAKER_FAILURE_THRESHOLD": "3",
+            "LLM_BREAKER_RESET_SECONDS": str(RESET),
+            "LLM_MAX_RETRIES": "0",
+        })
+        asyncio.run(main(server))
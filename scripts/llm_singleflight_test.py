@@ -0,0 +1,134 @@
+"""
+Single-flight coalescing of LLM calls:
+- 100 concurrent identical summaries (differing only in case/punctuation)
+  against the local fake LLM server make exactly one upstream request
+- a cancelled caller does not cancel the shared call for the others
+- every waiter times out at the flight deadline and the next call is fresh
+- an upstream error reaches every waiter
+
+Usage:
+    python scripts/llm_singleflight_test.py --latency-ms 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMServer, add_config_arguments, config_from_args
+
+
+async def test_identical_requests(server, concurrency: int):
+    from services.llm.cache import llm_cache
+    from services.llm.singleflight import llm_singleflight
+    from services.llm.symptom_summarizer import SymptomSummarizerService
+
+    variants = ["Fever and cough since 2 days", "fever and cough since 2 days.", "FEVER, and cough since 2 days!"]
+    summaries = await asyncio.gather(*(
+        SymptomSummarizerService.summarize(variants[i % len(variants)])
+        for i in range(concurrency)
+    ))
+
+    assert server.fake.requests == 1, f"{server.fake.requests} upstream calls"
+    assert len(set(summaries)) == 1
+    stats = llm_singleflight.stats()
+    assert stats["leaders"] == 1 and stats["coalesced"] == concurrency - 1, stats
+    assert stats["in_flight"] == 0
+    print(f"✅ {concurrency} concurrent identical requests -> 1 upstream call "
+          f"(coalescing ratio {stats['coalescing_ratio']:.2f}, cache {llm_cache.stats()['misses']} misses)")
+
+
+async def test_cancellation():
+    from services.llm.singleflight import SingleFlight
+
+    flight = SingleFlight(timeout_seconds=0)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", slow))
+    second = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "done" and len(calls) == 1
+
+    # Last waiter leaving cancels the shared call
+    only = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0.01)
+    only.cancel()
+    await asyncio.sleep(0)
+    assert flight.in_flight() == 0
+    print("✅ cancelled callers leave the shared call to the others")
+
+
+async def test_timeout():
+    from services.llm.singleflight import SingleFlight
+
+    flight = SingleFlight(timeout_seconds=0.05)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    results = await asyncio.gather(
+        *(flight.do("k", hang) for _ in range(5)), return_exceptions=True
+    )
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results), results
+    assert flight.in_flight() == 0
+
+    async def fast():
+        return "fresh"
+
+    assert await flight.do("k", fast) == "fresh"
+    print("✅ waiters time out at the flight deadline, next call starts fresh")
+
+
+async def test_errors():
+    from services.llm.singleflight import SingleFlight
+
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(10)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.leaders == 1
+    print("✅ upstream errors reach every waiter")
+
+
+async def main(server, concurrency: int):
+    from services.llm.client import llm_clients
+
+    try:
+        await test_identical_requests(server, concurrency)
+        await test_cancellation()
+        await test_timeout()
+        await test_errors()
+    finally:
+        await llm_clients.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with FakeLLMServer(config_from_args(args), port=args.port) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        os.environ["LLM_SINGLEFLIGHT_ENABLED"] = "true"
+        asyncio.run(main(server, args.concurrency))
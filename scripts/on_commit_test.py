@@ -0,0 +1,82 @@
+"""
+Checks db.session.on_commit with savepoints inside a unit of work:
+callbacks registered in a released savepoint wait for the outer commit,
+those in a rolled back savepoint are dropped while the outer ones are
+kept, and an outer rollback drops everything.
+
+Usage:
+    python scripts/on_commit_test.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import text
+
+from db.session import AsyncSessionLocal, engine, on_commit
+
+
+class Rollback(Exception):
+    pass
+
+
+async def test():
+    ran = []
+
+    def record(name):
+        return lambda: ran.append(name)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            # 1️⃣ No transaction open: runs right away
+            on_commit(db, record("immediate"))
+            assert ran == ["immediate"], ran
+            ran.clear()
+
+            # 2️⃣ Released savepoints: nothing runs before the outer commit
+            await db.execute(text("SELECT 1"))
+            on_commit(db, record("outer"))
+            async with db.begin_nested():
+                on_commit(db, record("savepoint"))
+                async with db.begin_nested():
+                    on_commit(db, record("inner savepoint"))
+            assert ran == [], f"ran on SAVEPOINT release: {ran}"
+
+            # 3️⃣ Rolled back savepoint: its callbacks (and released inner
+            # ones) are dropped, the outer ones are kept
+            try:
+                async with db.begin_nested():
+                    on_commit(db, record("rolled back"))
+                    async with db.begin_nested():
+                        on_commit(db, record("inside rolled back"))
+                    raise Rollback()
+            except Rollback:
+                pass
+            assert ran == [], f"ran on SAVEPOINT rollback: {ran}"
+
+            await db.commit()
+            assert ran == ["outer", "savepoint", "inner savepoint"], ran
+            print("✅ savepoints defer to the outer commit; rolled back ones are dropped")
+            ran.clear()
+
+            # 4️⃣ Outer rollback with a released savepoint: nothing runs
+            await db.execute(text("SELECT 1"))
+            on_commit(db, record("outer"))
+            async with db.begin_nested():
+                on_commit(db, record("savepoint"))
+            await db.rollback()
+            await db.commit()
+            assert ran == [], ran
+            assert "on_commit" not in db.info
+            print("✅ outer rollback drops every callback")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
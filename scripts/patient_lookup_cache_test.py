@@ -0,0 +1,102 @@
+"""
+Checks the phone lookup cache against the DB: negative entries, install
+on commit (not before, not after rollback), TTL expiry, the LRU bound and
+preloading. Statements are counted with an engine event, so "no SQL"
+assertions are exact.
+
+Usage:
+    python scripts/patient_lookup_cache_test.py
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import delete, event
+
+from db.session import AsyncSessionLocal, engine
+from models.patient import Patient
+from services.patient_lookup_cache import PatientLookupCache, patient_lookup_cache
+from services.patient_service import PatientService
+
+statements = [0]
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    statements[0] += 1
+
+
+def new_phone() -> str:
+    return f"6{random.randrange(10**9):09d}"
+
+
+async def test():
+    cache = patient_lookup_cache
+    phones = [new_phone() for _ in range(3)]
+
+    try:
+        async with AsyncSessionLocal() as db:
+            # 1️⃣ Unknown number: one query, then a negative hit with no SQL
+            assert await PatientService.lookup_by_phone(db, phones[0]) is None
+            before = statements[0]
+            assert await PatientService.lookup_by_phone(db, phones[0]) is None
+            assert statements[0] == before, "negative entry not used"
+            await db.commit()
+
+            # 2️⃣ Create under a unit of work: installed only on commit
+            patient = await PatientService.create(
+                db, full_name="Cache Test", age=30, contact_number=phones[0], commit=False
+            )
+            assert await cache.lookup(db, phones[0]) is None, "installed before commit"
+            await db.commit()
+
+            before = statements[0]
+            found = await PatientService.lookup_by_phone(db, phones[0])
+            assert found is not None and found.id == patient.id
+            assert statements[0] == before, "new patient not installed on commit"
+
+            # 3️⃣ Rolled back create leaves the negative entry alone
+            assert await cache.lookup(db, phones[1]) is None
+            await PatientService.create(
+                db, full_name="Cache Test", age=31, contact_number=phones[1], commit=False
+            )
+            await db.rollback()
+            before = statements[0]
+            assert await cache.lookup(db, phones[1]) is None
+            assert statements[0] == before
+
+            # 4️⃣ TTL expiry and LRU bound on a private cache
+            small = PatientLookupCache(max_entries=2, ttl_seconds=60, negative_ttl_seconds=0.05)
+            assert await small.lookup(db, phones[2]) is None
+            time.sleep(0.1)
+            before = statements[0]
+            await small.lookup(db, phones[2])
+            assert statements[0] == before + 1, "expired negative entry served"
+
+            for phone in phones:
+                await small.lookup(db, phone)
+            assert len(small._data) == 2 and phones[0] not in small._data
+
+            # 5️⃣ Preload by patient id: the first lookup is a hit
+            warm = PatientLookupCache()
+            assert await warm.preload(db, patient_ids=[patient.id]) == 1
+            before = statements[0]
+            assert (await warm.lookup(db, phones[0])).id == patient.id
+            assert statements[0] == before
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Patient).where(Patient.contact_number.in_(phones)))
+            await db.commit()
+
+    print(f"✅ patient lookup cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(test())
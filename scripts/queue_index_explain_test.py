@@ -0,0 +1,163 @@
+"""
+Seeds a large synthetic queue dataset and fails if any hot QueueService
+query plans a sequential scan on doctor_queues or queue_entries.
+
+Usage:
+    python scripts/queue_index_explain_test.py --doctors 200 --days 30 --per-queue 50
+
+Seed rows live on dates from 2100-01-01 and are deleted afterwards.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import select, text
+
+from db.session import AsyncSessionLocal
+from models.doctor_queue import DoctorQueue
+from models.queue_entry import QueueEntry
+from services.queue_engine import QueueEngine
+from services.queue_service import QueueService
+
+SEED_DATE = date(2100, 1, 1)
+WATCHED_TABLES = {"doctor_queues", "queue_entries"}
+
+
+async def seed(db, doctors: int, days: int, per_queue: int):
+    await db.execute(
+        text(
+            """
+            INSERT INTO doctor_queues (id, doctor_id, queue_date, shift_start_time, shift_end_time)
+            SELECT gen_random_uuid(), md5('bench-doctor-' || doc)::uuid, CAST(:seed_date AS date) + d,
+                   TIME '09:00', TIME '17:00'
+            FROM generate_series(1, :doctors) doc, generate_series(0, :days - 1) d
+            """
+        ),
+        {"seed_date": SEED_DATE, "doctors": doctors, "days": days},
+    )
+    await db.execute(
+        text(
+            """
+            INSERT INTO queue_entries (queue_id, visit_id, token_number, position, status)
+            SELECT q.id, gen_random_uuid(), t, t,
+                   (ARRAY['waiting', 'present', 'called', 'in_consultation',
+                          'skipped', 'completed'])[1 + t % 6]
+            FROM doctor_queues q, generate_series(1, :per_queue) t
+            WHERE q.queue_date >= :seed_date
+            """
+        ),
+        {"seed_date": SEED_DATE, "per_queue": per_queue},
+    )
+    await db.commit()
+    await db.execute(text("ANALYZE doctor_queues"))
+    await db.execute(text("ANALYZE queue_entries"))
+
+
+async def cleanup(db):
+    await db.execute(
+        text("DELETE FROM doctor_queues WHERE queue_date >= :seed_date"),
+        {"seed_date": SEED_DATE},
+    )
+    await db.commit()
+
+
+def hot_queries(queue: DoctorQueue, visit_id):
+    """
+    The statements QueueService and the queue engine issue on hot paths,
+    built by their own statement builders so the guard follows the code.
+    """
+    return {
+        "queue lookup": QueueService._queue_statement(queue.doctor_id, queue.queue_date),
+        "queue lock": QueueService._queue_statement(queue.doctor_id, queue.queue_date, lock=True),
+        "queues of a day": QueueEngine._day_statement(queue.queue_date),
+        "engine rebuild": QueueEngine._entries_statement(queue.id),
+        "call_next candidate": QueueService._call_next_statement(queue.id, visit_id),
+        "call_next ordered pick": QueueService._call_next_statement(queue.id),
+        "entry by visit": QueueService._entry_statement(queue.id, visit_id),
+        "entry by visit + status": QueueService._entry_statement(queue.id, visit_id, "in_consultation"),
+        "check_in lookup": QueueService._check_in_statement(visit_id, queue.queue_date),
+        "token allocation": QueueService._token_statement(queue.id),
+        "counter move": QueueService._counter_statement(queue.id, "waiting", "present"),
+        "bulk queue lock": QueueService._bulk_queues_statement([(queue.doctor_id, queue.queue_date)]),
+        "bulk queued visits": QueueService._queued_visits_statement([queue.id], [visit_id]),
+        "bulk token ranges": QueueService._token_ranges_statement([(queue.id, 3)]),
+        "counter check (one day)": QueueService._check_counters_statement(queue.queue_date),
+    }
+
+
+async def explain(db, stmt) -> dict:
+    """
+    EXPLAIN (FORMAT JSON) plan of a statement with its real binds;
+    DML is planned, not executed.
+    """
+    conn = await db.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    result = await conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + compiled.string,
+        tuple(params[name] for name in compiled.positiontup),
+    )
+    raw = result.scalar_one()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+def seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def run_test(doctors: int, days: int, per_queue: int):
+    async with AsyncSessionLocal() as db:
+        await cleanup(db)
+        await seed(db, doctors, days, per_queue)
+
+        try:
+            queue = (
+                await db.execute(
+                    select(DoctorQueue)
+                    .where(DoctorQueue.queue_date >= SEED_DATE)
+                    .limit(1)
+                )
+            ).scalar_one()
+            visit_id = (
+                await db.execute(
+                    select(QueueEntry.visit_id)
+                    .where(QueueEntry.queue_id == queue.id)
+                    .limit(1)
+                )
+            ).scalar_one()
+
+            failures = []
+            for name, stmt in hot_queries(queue, visit_id).items():
+                plan = await explain(db, stmt)
+
+                scanned = sorted(set(seq_scans(plan)))
+                status = "SEQ SCAN " + ", ".join(scanned) if scanned else "index"
+                print(f"{name:<26} {status}")
+                if scanned:
+                    failures.append(name)
+        finally:
+            await db.rollback()
+            await cleanup(db)
+
+    assert not failures, f"Sequential scans in: {', '.join(failures)}"
+    print("✅ All hot queue queries use indexes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--per-queue", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_test(args.doctors, args.days, args.per_queue))
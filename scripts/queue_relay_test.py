@@ -0,0 +1,90 @@
+"""
+Checks the cross-worker queue event relay against Postgres: two relays
+stand in for two API workers on the same LISTEN channel. An event sent by
+one reaches the other and not its sender, the receiver resyncs after
+(re)connecting, and a relay that was never started sends nothing.
+
+Usage:
+    python scripts/queue_relay_test.py
+"""
+import asyncio
+import sys
+import uuid
+from datetime import date
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from services.queue_relay import QueueEventRelay
+
+CHANNEL = f"queue_events_test_{uuid.uuid4().hex[:8]}"
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def worker(name, received, resyncs):
+    async def on_event(event):
+        received.append((name, event))
+
+    async def on_resync():
+        resyncs.append(name)
+
+    relay = QueueEventRelay(channel=CHANNEL, enabled=True)
+    relay.start(on_event, on_resync)
+    return relay
+
+
+async def main():
+    received, resyncs = [], []
+
+    # 1️⃣ A relay that was never started is a no-op
+    idle = QueueEventRelay(channel=CHANNEL, enabled=True)
+    idle.notify({"doctor_id": uuid.uuid4()})
+    assert idle.stats()["sent"] == idle.stats()["failed"] == 0
+
+    a = worker("a", received, resyncs)
+    b = worker("b", received, resyncs)
+    try:
+        await wait_for(lambda: a.connected and b.connected)
+        await wait_for(lambda: sorted(resyncs) == ["a", "b"])
+        print("✅ both workers listening, resynced on connect")
+
+        # 2️⃣ An event from a reaches b only
+        doctor_id = uuid.uuid4()
+        a.notify({
+            "doctor_id": doctor_id,
+            "queue_date": date.today(),
+            "event_type": "CALL_NEXT",
+            "visit_id": None,
+            "token_number": 7,
+            "reason": "Doctor called next patient",
+        })
+        await wait_for(lambda: received)
+        await asyncio.sleep(0.2)
+        assert [name for name, _ in received] == ["b"], received
+        event = received[0][1]
+        assert event["doctor_id"] == str(doctor_id) and event["token_number"] == 7, event
+        assert "origin" not in event
+        assert a.stats()["sent"] == 1 and b.stats()["received"] == 1
+        print("✅ event relayed to the other worker, not echoed to the sender")
+
+        # 3️⃣ Lost connection: b reconnects and resyncs
+        resyncs.clear()
+        b._conn.terminate()
+        await wait_for(lambda: resyncs == ["b"] and b.connected, timeout=10)
+        print("✅ reconnected and resynced after losing the connection")
+    finally:
+        await a.stop()
+        await b.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Checks read-replica routing. Works with a real streaming replica or with
+the primary under a second URL:
+
+    POSTGRES_REPLICA_URI=$POSTGRES_URI python scripts/read_replica_test.py
+
+1. A healthy replica serves read sessions.
+2. Lag above the staleness bound falls back to the primary.
+3. An unreachable replica falls back to the primary.
+4. get_status on a replica session does not install a resident queue.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import select
+
+import db.session as db_session
+from db.session import (
+    AsyncSessionLocal,
+    ReplicaHealth,
+    create_engine_from_settings,
+    is_replica_session,
+    read_session_factory,
+    replica_health,
+)
+from agents.queue.schemas import QueueStatusRequest
+from models.doctor_queue import DoctorQueue
+from services.queue_engine import queue_engine
+from services.queue_service import QueueService
+
+
+async def main():
+    if db_session.replica_engine is None:
+        print("POSTGRES_REPLICA_URI is not set")
+        sys.exit(1)
+
+    # 1️⃣ Healthy replica
+    lag = await replica_health.measure()
+    print(f"replica lag: {lag}")
+    factory = await read_session_factory()
+    async with factory() as db:
+        assert is_replica_session(db), "healthy replica should serve reads"
+
+    # 2️⃣ Staleness bound exceeded
+    bound = replica_health.max_lag_seconds
+    replica_health.max_lag_seconds = -1
+    replica_health.checked_at = 0
+    factory = await read_session_factory()
+    assert factory is AsyncSessionLocal, "stale replica must fall back to primary"
+    replica_health.max_lag_seconds = bound
+    replica_health.checked_at = 0
+
+    # 3️⃣ Unreachable replica
+    down = ReplicaHealth(
+        create_engine_from_settings("postgresql+asyncpg://nobody:x@127.0.0.1:1/none")
+    )
+    assert await down.usable() is False, "unreachable replica must not be used"
+
+    # 4️⃣ Replica snapshots stay out of the resident engine
+    async with AsyncSessionLocal() as db:
+        queue = (await db.execute(select(DoctorQueue).limit(1))).scalar_one_or_none()
+
+    if queue is None:
+        print("no doctor_queues rows; skipped resident-engine check")
+    else:
+        queue_engine.discard(queue.doctor_id, queue.queue_date)
+        async with db_session.ReplicaSessionLocal() as db:
+            await QueueService.get_status(db, QueueStatusRequest(
+                queue_date=queue.queue_date,
+                doctor_id=queue.doctor_id,
+                role="receptionist",
+            ))
+        assert queue_engine.get(queue.doctor_id, queue.queue_date) is None
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
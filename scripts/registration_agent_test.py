@@ -1,3 +1,5 @@
+import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -5,31 +7,45 @@ from pathlib import Path
 repo_root = Path(__file__).resolve().parents[1]
 api_path = repo_root / "apps" / "api"
 sys.path.insert(0, str(api_path))
+sys.path.insert(0, str(repo_root / "scripts"))
+
+from fake_llm_server import FakeLLMConfig, FakeLLMServer
 
 from agents.registration.agent import RegistrationAgent
 from agents.registration.state import RegistrationAgentState, RegistrationStep
+from db.session import AsyncSessionLocal
 
 
-def run_test():
+async def run_test():
     # Create fresh agent state
     state = RegistrationAgentState(
         step=RegistrationStep.COLLECT_PHONE
     )
 
-    agent = RegistrationAgent(state=state)
+    async with AsyncSessionLocal() as db:
+        agent = RegistrationAgent(state=state, db=db)
+
+        print(await agent.handle({"phone_number": "9999999999"}))
+        if state.step == RegistrationStep.COLLECT_PATIENT_DETAILS:
+            print(await agent.handle({"full_name": "Ajay", "age": 21}))
+        response = await agent.handle({"symptoms": "Chest pain since morning"})
+        print(response)
+
+        if state.step == RegistrationStep.RESOLVE_DEPARTMENT:
+            response = await agent.handle({"confirm": True})
+            print(response)
 
-    agent.handle({"phone_number": "9999999999"})
-    '''
-    agent.handle({"full_name": "Ajay", "age": 21})
-    agent.handle({"symptoms": "Chest pain since morning"})
+        doctors = response.get("doctors") or []
+        if doctors:
+            print(await agent.handle({"doctor_id": doctors[0]["id"]}))
 
-    agent.handle({})                      # resolve department
-    agent.handle({"doctor_id": "doc_1"})  # select doctor
-    agent.handle({})   
-    '''
     print("\n--- FINAL STATE ---")
     print(state)
 
 
 if __name__ == "__main__":
-    run_test()
+    # Local fake LLM so the flow runs without a Groq key
+    with FakeLLMServer(FakeLLMConfig(latency_ms=50), port=8900) as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        asyncio.run(run_test())
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from db.session import engine
+
+MIGRATIONS_DIR = api_path / "db" / "migrations"
+
+
+async def run_migrations():
+    """
+    Applies apps/api/db/migrations/*.sql in filename order, once each.
+    """
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+
+        await driver.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TIMESTAMPTZ DEFAULT now()
+            )
+            """
+        )
+        applied = {
+            row["name"]
+            for row in await driver.fetch("SELECT name FROM schema_migrations")
+        }
+
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            if path.name in applied:
+                continue
+
+            async with driver.transaction():
+                await driver.execute(path.read_text())
+                await driver.execute(
+                    "INSERT INTO schema_migrations (name) VALUES ($1)",
+                    path.name,
+                )
+            print(f"✅ Applied {path.name}")
+
+    print("✅ Migrations up to date")
+
+
+asyncio.run(run_migrations())
@@ -0,0 +1,100 @@
+"""
+Checks the registration session store. Write-behind (shared tier):
+steady-state messages issue no SQL, the background flush persists the
+latest state in one batch, and a cold read (hot tier expired) falls back
+to agent_sessions. Write-through (per-process tier): every save is
+persisted before it returns, so another process sees it without a flush.
+
+Usage:
+    python scripts/session_store_test.py --sessions 50 --messages 6
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add apps/api to Python path so we can import services
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import delete, event
+
+from db.session import AsyncSessionLocal, engine
+from services.agent_session_service import agent_sessions
+from services.session_store import InMemorySessionTier, SessionStore
+
+
+async def main(args):
+    statements = []
+
+    def count(conn, cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    # 1️⃣ Write-behind; the in-memory tier stands in for a shared one
+    store = SessionStore(InMemorySessionTier(), ttl_seconds=60, write_through=False)
+    session_ids = []
+
+    async with AsyncSessionLocal() as db:
+        for _ in range(args.sessions):
+            session_ids.append(
+                await store.create("registration", {"step": "COLLECT_PHONE", "turn": 0})
+            )
+
+        for turn in range(1, args.messages + 1):
+            for session_id in session_ids:
+                state = await store.get(db, session_id)
+                assert state is not None
+                await store.save(session_id, "registration", {**state, "turn": turn})
+
+    print(f"SQL statements during {args.sessions * args.messages} messages: {len(statements)}")
+    assert not statements, "steady-state messages must not touch Postgres"
+
+    written = await store.flush()
+    print(f"flushed rows: {written}  statements: {len(statements)}")
+    assert written == args.sessions
+
+    # Cold read: a fresh hot tier forces the Postgres fallback
+    cold = SessionStore(InMemorySessionTier())
+    async with AsyncSessionLocal() as db:
+        for session_id in session_ids:
+            state = await cold.get(db, session_id)
+            assert state and state["turn"] == args.messages, state
+
+    # 2️⃣ Write-through: one upsert per save, nothing left to flush
+    local = SessionStore(InMemorySessionTier(), ttl_seconds=60)
+    assert local.write_through
+    other = SessionStore(InMemorySessionTier(), ttl_seconds=60)
+    async with AsyncSessionLocal() as db:
+        for session_id in session_ids:
+            state = await local.get(db, session_id)
+            before = len(statements)
+            await local.save(
+                session_id, "registration", {**state, "turn": -1}, changes={"turn": -1}, db=db
+            )
+            assert len(statements) == before + 1, statements[before:]
+        assert local.pending_count() == 0
+
+        # Another worker's store reads the new state straight away
+        for session_id in session_ids:
+            state = await other.get(db, session_id)
+            assert state and state["turn"] == -1, state
+    print("write-through: every save persisted, visible to another store without a flush")
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(agent_sessions).where(agent_sessions.c.session_id.in_(session_ids))
+        )
+        await db.commit()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+    print("OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=6)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""
+Fires waves of concurrent intakes at ONE doctor queue and checks that
+tokens are unique and contiguous and that intake latency stays flat as
+the queue grows.
+
+Usage:
+    python scripts/token_allocation_test.py --waves 5 --wave-size 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+# Add apps/api to Python path so we can import db module
+repo_root = Path(__file__).resolve().parents[1]
+api_path = repo_root / "apps" / "api"
+sys.path.insert(0, str(api_path))
+
+from sqlalchemy import delete, select
+
+from db.session import AsyncSessionLocal
+from models.doctor_queue import DoctorQueue
+from models.queue_entry import QueueEntry
+from agents.queue.schemas import QueueIntakeRequest
+from services.queue_service import QueueService
+
+
+async def create_queue(doctor_id, queue_date):
+    # Wide shift so capacity never rejects during the test
+    async with AsyncSessionLocal() as db:
+        queue = DoctorQueue(
+            doctor_id=doctor_id,
+            queue_date=queue_date,
+            shift_start_time=dtime(0, 0),
+            shift_end_time=dtime(23, 59),
+            avg_consult_time_minutes=1,
+            queue_open=True,
+        )
+        db.add(queue)
+        await db.commit()
+        return queue.id
+
+
+async def intake(doctor_id, queue_date):
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        result = await QueueService.intake(
+            db,
+            QueueIntakeRequest(
+                visit_id=uuid4(),
+                patient_id=uuid4(),
+                doctor_id=doctor_id,
+                queue_date=queue_date,
+            ),
+        )
+        return result, (time.perf_counter() - started) * 1000
+
+
+async def run_test(waves: int, wave_size: int):
+    doctor_id = uuid4()
+    queue_date = date.today() + timedelta(days=3650)
+    queue_id = await create_queue(doctor_id, queue_date)
+
+    tokens = []
+    wave_p50 = []
+
+    try:
+        for wave in range(waves):
+            results = await asyncio.gather(
+                *(intake(doctor_id, queue_date) for _ in range(wave_size))
+            )
+            latencies = [ms for _, ms in results]
+            tokens.extend(r.token_number for r, _ in results if r.accepted)
+            rejected = sum(1 for r, _ in results if not r.accepted)
+            assert rejected == 0, f"{rejected} intakes rejected in wave {wave}"
+
+            wave_p50.append(statistics.median(latencies))
+            print(f"wave {wave + 1}: p50 {wave_p50[-1]:.2f} ms, max {max(latencies):.2f} ms")
+
+        async with AsyncSessionLocal() as db:
+            stored = (
+                await db.execute(
+                    select(QueueEntry.token_number).where(QueueEntry.queue_id == queue_id)
+                )
+            ).scalars().all()
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(DoctorQueue).where(DoctorQueue.id == queue_id))
+            await db.commit()
+
+    total = waves * wave_size
+    assert len(set(tokens)) == len(tokens) == total, "duplicate tokens returned"
+    assert sorted(stored) == list(range(1, total + 1)), "stored tokens not contiguous"
+
+    # Allocation cost must not grow with queue length
+    assert wave_p50[-1] <= wave_p50[0] * 3, f"latency grew: {wave_p50}"
+
+    print(f"✅ {total} concurrent intakes, no duplicate tokens")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--waves", type=int, default=5)
+    parser.add_argument("--wave-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run_test(args.waves, args.wave_size))